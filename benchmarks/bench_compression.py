@@ -0,0 +1,86 @@
+"""
+Бенчмарк сжатия ответов (src/app/compression.py): степень сжатия и CPU на ответ по кодекам и уровням.
+
+Тела ответов — такие же, как отдаёт API с FAST_RESPONSES (dump_user / dump_user_list),
+из строк BulkUserGenerator:
+- user       — GET /users/{id} (обычно меньше COMPRESSION_MINIMUM_SIZE и не сжимается);
+- page[N]    — GET /users?limit=N для каждого из --page-sizes;
+- ndjson[N]  — выгрузка ?format=ndjson кусками по --chunk-size строк с flush после каждого
+               куска, как при потоковом ответе.
+Для каждого кодека (gzip, zstd, br — если доступны) и уровня: размер после сжатия
+в процентах от исходного и CPU-время сжатия в микросекундах. БД и API не нужны.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_compression --repeat 200 --page-sizes 100,1000
+"""
+
+import argparse
+import time
+from datetime import date, datetime
+
+from data.user_factory import BulkUserGenerator
+from src.app.compression import ENCODERS
+from src.app.serialization import dump_user, dump_user_list
+
+LEVELS = {"gzip": (1, 5, 9), "zstd": (1, 3, 9), "br": (1, 4, 9)}
+
+
+def _rows(count: int) -> list[dict]:
+    created_at = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    rows = []
+    for i, user in enumerate(BulkUserGenerator().iter_users(count), start=1):
+        birth_date = user["birth_date"] and date.fromisoformat(user["birth_date"])  # Как из БД
+        rows.append({**user, "id": i, "birth_date": birth_date, "created_at": created_at, "version": 1})
+    return rows
+
+
+def _compress(factory, level: int, chunks: list[bytes]) -> int:
+    """Сжать тело (один кусок — целиком, несколько — потоком с flush); вернуть размер."""
+    encoder = factory(level)
+    if len(chunks) == 1:
+        return len(encoder.compress(chunks[0]) + encoder.finish())
+    size = sum(len(encoder.compress(chunk) + encoder.flush()) for chunk in chunks)
+    return size + len(encoder.finish())
+
+
+def _measure(factory, level: int, chunks: list[bytes], repeat: int) -> tuple[int, float]:
+    started = time.process_time()
+    for _ in range(repeat):
+        size = _compress(factory, level, chunks)
+    return size, (time.process_time() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--page-sizes", default="100,1000")
+    parser.add_argument("--export-rows", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=500, help="Строк в куске NDJSON (users_export_fetch_size)")
+    args = parser.parse_args()
+
+    page_sizes = [int(n) for n in args.page_sizes.split(",")]
+    rows = _rows(max(page_sizes + [args.export_rows]))
+    bodies = {"user": [dump_user(rows[0])]}
+    for n in page_sizes:
+        bodies[f"page[{n}]"] = [dump_user_list(rows[:n])]
+    export = rows[:args.export_rows]
+    bodies[f"ndjson[{args.export_rows}]"] = [
+        b"".join(dump_user(row) + b"\n" for row in export[i:i + args.chunk_size])
+        for i in range(0, len(export), args.chunk_size)
+    ]
+
+    print(f"codecs: {', '.join(ENCODERS)}; size % of original / CPU us per response")
+    for title, chunks in bodies.items():
+        original = sum(map(len, chunks))
+        repeat = max(args.repeat * 10_000 // max(original, 10_000), 3)  # Большие тела — реже
+        print(f"{title} ({original} bytes, {len(chunks)} chunk(s)):")
+        for name, factory in ENCODERS.items():
+            results = []
+            for level in LEVELS[name]:
+                size, cpu_us = _measure(factory, level, chunks, repeat)
+                results.append(f"L{level} {size / original * 100:5.1f}% {cpu_us:9.1f}us")
+            print(f"  {name:<5} " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    main()
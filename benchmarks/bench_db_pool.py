@@ -0,0 +1,91 @@
+"""
+Бенчмарк: connect-per-request против пула подключений (src/app/pool.py).
+
+Каждый «запрос» — то, что делает GET /users/{id}: взять соединение, выполнить SELECT по id,
+отдать соединение. Нагрузку создают N потоков, как threadpool uvicorn.
+Пул — с health-check, как в приложении (DB_POOL_CHECK_ON_CHECKOUT, DB_POOL_CHECK_IDLE_AFTER);
+--check-idle-after 0 — проверка SELECT 1 на каждой выдаче, для сравнения.
+Нужен запущенный PostgreSQL (параметры из .env).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_db_pool --threads 16 --requests 2000
+"""
+
+import argparse
+import threading
+import time
+from dataclasses import asdict
+
+import psycopg2
+
+from src.app.deps import get_db_config
+from src.app.pool import ConnectionPool
+from src.config.settings import get_settings
+
+QUERY = "SELECT id, email, name, created_at, phone, address, birth_date FROM users WHERE id = %s;"
+
+
+def _run(threads: int, total: int, do_request) -> float:
+    """Выполнить total запросов в threads потоках, вернуть requests/sec."""
+    per_thread = total // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(per_thread):
+            do_request(i)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--check-idle-after", type=float,
+                        default=get_settings().db_pool_check_idle_after,
+                        help="Health-check connections idle longer than this, sec (0 = every checkout)")
+    args = parser.parse_args()
+
+    config = get_db_config()
+
+    def connect_per_request(i: int) -> None:
+        conn = psycopg2.connect(**config)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(QUERY, (i,))
+                cur.fetchone()
+        finally:
+            conn.close()
+
+    db_pool = ConnectionPool(config, min_size=args.pool_size, max_size=args.pool_size,
+                             timeout=30.0, check_on_checkout=get_settings().db_pool_check_on_checkout,
+                             check_idle_after=args.check_idle_after)
+    db_pool.open()
+
+    def pooled(i: int) -> None:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(QUERY, (i,))
+                cur.fetchone()
+
+    print(f"threads={args.threads} requests={args.requests} pool_size={args.pool_size} "
+          f"check_idle_after={args.check_idle_after}")
+    baseline = _run(args.threads, args.requests, connect_per_request)
+    print(f"connect-per-request: {baseline:10.1f} req/s")
+    pooled_rps = _run(args.threads, args.requests, pooled)
+    print(f"pooled:              {pooled_rps:10.1f} req/s  (x{pooled_rps / baseline:.1f})")
+    print(f"pool stats: {asdict(db_pool.stats())}")
+    db_pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Бенчмарк group commit (GROUP_COMMIT_ENABLED): POST /users под конкурентной нагрузкой с пачками и без.
+
+Для каждого режима (off — транзакция на запрос, on — пачки до --max-batch запросов / --max-wait сек)
+поднимается python -m src.app.server (один воркер, --driver) на отдельном порту, затем --threads
+потоков отправляют --requests POST /users с уникальными email. Выводятся вставки в секунду,
+p50/p99 латентности и число ошибок. Созданные пользователи удаляются по префиксу email.
+Выигрыш тем больше, чем дороже fsync в PostgreSQL (synchronous_commit=on, медленный диск).
+Нужен запущенный PostgreSQL (параметры из .env).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_group_commit --threads 64 --requests 5000 --driver asyncpg
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+
+from benchmarks.bench_server_scaling import _wait_ready
+from src.clients.users_client import UsersClient
+from src.config.settings import get_settings
+from src.db.queries import UsersQueries
+
+
+def _run_load(base_url: str, prefix: str, threads: int, requests: int) -> dict:
+    local = threading.local()
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        nonlocal errors
+        if not hasattr(local, "client"):
+            local.client = UsersClient(base_url)
+        started = time.perf_counter()
+        response = local.client.create_user({"email": f"{prefix}{n}@example.com", "name": "Group Commit"})
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors += response.status_code != 201
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(requests)))
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+def _cleanup(prefix: str) -> None:
+    s = get_settings()
+    with psycopg2.connect(host=s.db_host, port=s.db_port, dbname=s.db_name,
+                          user=s.db_user, password=s.db_password) as connection:
+        UsersQueries(connection).delete_users_by_email_prefix(prefix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--driver", choices=["psycopg2", "asyncpg"], default="psycopg2")
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--max-wait", type=float, default=0.002)
+    parser.add_argument("--port", type=int, default=3200, help="First port (one per mode)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<6}{'inserts/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for i, enabled in enumerate((False, True)):
+        port = args.port + i
+        env = {
+            **os.environ, "DB_DRIVER": args.driver, "GROUP_COMMIT_ENABLED": str(enabled).lower(),
+            "GROUP_COMMIT_MAX_BATCH": str(args.max_batch), "GROUP_COMMIT_MAX_WAIT": str(args.max_wait),
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.app.server", "--workers", "1", "--port", str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+        )
+        prefix = f"gc_{uuid.uuid4().hex[:8]}_"
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(base_url)
+            result = _run_load(base_url, prefix, args.threads, args.requests)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+            _cleanup(prefix)
+        mode = "on" if enabled else "off"
+        print(f"{mode:<6}{result['rps']:>12,.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Бенчмарк времени импорта: сколько стоит старт процесса pytest-воркера, приложения и генераторов данных.
+
+Каждая цель импортируется в новом интерпретаторе с `python -X importtime` (--runs раз, берётся
+медиана): суммарное время импорта цели и самые дорогие модули по собственному времени (self).
+Для conftest это и есть вклад в старт каждого воркера pytest-xdist (и управляющего процесса).
+С --check процесс завершается с кодом 1, если медиана цели больше бюджета IMPORT_BUDGET_MS —
+так регресс (тяжёлый импорт на уровне модуля) виден в CI. БД и API не нужны.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_import_time --runs 5 --top 8
+    python -m benchmarks.bench_import_time --check
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Цель → бюджет медианы, мс (с запасом: машины CI медленнее и шумнее)
+IMPORT_BUDGET_MS = {
+    "tests.conftest": 300,
+    "src.config.settings": 400,
+    "data.user_factory": 50,
+    "src.app.main": 1500,
+}
+
+
+def _import_times(module: str) -> tuple[float, dict[str, float]]:
+    """Импорт в новом интерпретаторе: (суммарно мс, модуль → self мс)."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "src")])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    total, self_times = 0.0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        self_times[name.strip()] = int(self_us) / 1000
+        if name.strip() == module:
+            total = int(cumulative_us) / 1000
+    return total, self_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=list(IMPORT_BUDGET_MS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Сколько самых дорогих модулей показать")
+    parser.add_argument("--check", action="store_true", help="Код 1, если цель дольше бюджета")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.targets:
+        totals, self_times = [], defaultdict(list)
+        for _ in range(args.runs):
+            total, modules = _import_times(module)
+            totals.append(total)
+            for name, ms in modules.items():
+                self_times[name].append(ms)
+        median = statistics.median(totals)
+        budget = IMPORT_BUDGET_MS.get(module)
+        mark = "" if budget is None else f" (budget {budget} ms)"
+        print(f"{module}: {median:.1f} ms, min {min(totals):.1f} ms{mark}")
+        top = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+        for name, times in top[:args.top]:
+            print(f"  {statistics.median(times):8.1f} ms  {name}")
+        if budget is not None and median > budget:
+            over_budget.append(module)
+
+    if args.check and over_budget:
+        print(f"over budget: {', '.join(over_budget)}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк конкурентных read-modify-write одного пользователя: слепой PATCH против If-Match.
+
+--threads потоков по --increments раз читают пользователя (GET), увеличивают счётчик в name
+("c<n>") и записывают (PATCH). Режимы:
+- blind — PATCH без условий: параллельные записи затирают друг друга (lost updates);
+- optimistic — PATCH с If-Match: ETag из GET; при 412 поток перечитывает и повторяет.
+Итоговый счётчик сравнивается с числом инкрементов: разница — потерянные обновления
+(для optimistic должно быть 0). Нужен запущенный API.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_optimistic_concurrency --threads 16 --increments 50
+"""
+
+import argparse
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.clients.users_client import UsersClient
+
+
+def _counter(user: dict) -> int:
+    return int(user["name"][1:])
+
+
+def _increment(client: UsersClient, user_id: int, optimistic: bool) -> int:
+    """Один инкремент. Возвращает число повторов (412)."""
+    retries = 0
+    while True:
+        response = client.get_user(user_id)
+        response.raise_for_status()
+        payload = {"name": f"c{_counter(response.json()) + 1}"}
+        etag = response.headers["ETag"] if optimistic else None
+        response = client.partial_update_user(user_id, payload, if_match=etag)
+        if response.status_code != 412:
+            response.raise_for_status()
+            return retries
+        retries += 1
+
+
+def run(base_url: str, mode: str, threads: int, increments: int) -> dict:
+    setup = UsersClient(base_url)
+    response = setup.create_user({"email": f"occ_{uuid.uuid4().hex[:12]}@example.com", "name": "c0"})
+    response.raise_for_status()
+    user_id = response.json()["id"]
+
+    local = threading.local()
+    retries = 0
+    lock = threading.Lock()
+
+    def worker(_: int) -> None:
+        nonlocal retries
+        if not hasattr(local, "client"):
+            local.client = UsersClient(base_url)
+        n = _increment(local.client, user_id, optimistic=mode == "optimistic")
+        with lock:
+            retries += n
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads * increments)))
+    elapsed = time.perf_counter() - started
+
+    final = setup.get_user(user_id).json()
+    setup.delete_user(user_id)
+    total = threads * increments
+    return {
+        "mode": mode,
+        "increments": total,
+        "elapsed_s": elapsed,
+        "throughput": total / elapsed,
+        "retries": retries,
+        "lost_updates": total - _counter(final),
+        "version": final["version"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--increments", type=int, default=50, help="Increments per thread")
+    parser.add_argument("--mode", choices=["blind", "optimistic", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["blind", "optimistic"] if args.mode == "both" else [args.mode]
+    print(f"{'mode':<12}{'increments':>12}{'ops/s':>10}{'retries':>10}{'lost':>8}{'version':>10}")
+    for mode in modes:
+        r = run(args.base_url, mode, args.threads, args.increments)
+        print(f"{r['mode']:<12}{r['increments']:>12}{r['throughput']:>10.0f}"
+              f"{r['retries']:>10}{r['lost_updates']:>8}{r['version']:>10}")
+
+
+if __name__ == "__main__":
+    main()
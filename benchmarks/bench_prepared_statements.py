@@ -0,0 +1,83 @@
+"""
+Микро-бенчмарк: обычный execute против PREPARE/EXECUTE (src/db/statements.py) для GET и PATCH.
+
+1. Время на операцию с клиента (одно соединение, без сети между потоками):
+   текст запроса каждый раз заново парсится и планируется vs EXECUTE подготовленного.
+2. Planning Time из EXPLAIN (ANALYZE, SUMMARY) — сколько из этого приходится на планирование
+   (у подготовленного запроса после нескольких выполнений используется generic plan).
+
+PATCH выполняется в транзакции, которая откатывается, — данные в БД не меняются.
+Нужен запущенный PostgreSQL (параметры из .env) и хотя бы один пользователь в users.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_prepared_statements --iterations 5000
+"""
+
+import argparse
+import re
+import time
+
+import psycopg2
+
+from src.app.deps import get_db_config
+from src.db.statements import GET_USER_BY_ID, execute, patch_statement
+
+
+def _per_op_us(iterations: int, op) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        op()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _planning_ms(cur, sql: str, params) -> float:
+    cur.execute(f"EXPLAIN (ANALYZE, SUMMARY) {sql}", params)
+    plan = "\n".join(row[0] for row in cur.fetchall())
+    return float(re.search(r"Planning Time: ([\d.]+) ms", plan).group(1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**get_db_config())
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM users ORDER BY id LIMIT 1")
+    row = cur.fetchone()
+    if row is None:
+        raise SystemExit("users table is empty — create at least one user first")
+    user_id = row[0]
+
+    patch, patch_values = patch_statement({"name": "Bench", "phone": "+70000000000"})
+    patch_params = (*patch_values, user_id)
+    get_params = (user_id,)
+
+    cases = {
+        "GET  /users/{id}": (GET_USER_BY_ID, get_params),
+        "PATCH /users/{id}": (patch, patch_params),
+    }
+    n = args.iterations
+    print(f"iterations={n}")
+    for title, (statement, params) in cases.items():
+        # Каждая операция — в своей транзакции (с откатом), чтобы UPDATE не копил версии строки
+        def run(sql):
+            return lambda: (cur.execute(sql, params), conn.rollback())
+
+        plain = _per_op_us(n, run(statement.pyformat_sql))
+        execute(cur, statement, params)  # PREPARE один раз, как на соединении из пула
+        prepared = _per_op_us(n, run(statement.execute_sql))
+
+        plain_plan = _planning_ms(cur, statement.pyformat_sql, params)
+        prepared_plan = _planning_ms(cur, statement.execute_sql, params)
+        conn.rollback()
+        print(
+            f"{title}: plain {plain:8.1f} us/op, prepared {prepared:8.1f} us/op "
+            f"({(prepared / plain - 1) * 100:+.0f}%); "
+            f"planning {plain_plan:.3f} ms -> {prepared_plan:.3f} ms"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Бенчмарк хранилищ пользователей (USER_REPOSITORY): postgres против memory под одной нагрузкой.
+
+Для каждого хранилища сервер (python -m src.app.server, один воркер: у memory данные
+свои в каждом процессе) поднимается на отдельном порту и нагружается тем же
+python -m src.loadtest, что и в bench_server_scaling. Разница rps/латентности — цена
+PostgreSQL; memory показывает потолок фреймворка, сериализации и HTTP без БД.
+Для postgres нужен запущенный PostgreSQL (параметры из .env).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_repository --clients 2 --duration 15 --mix get=80,patch=15,create_delete=5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_server_scaling import _run_load, _wait_ready
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--repositories", nargs="+", choices=["postgres", "memory"],
+                        default=["postgres", "memory"])
+    parser.add_argument("--port", type=int, default=3300, help="First port (one per repository)")
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--client-threads", type=int, default=16, help="Threads per load process")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--mix", default="get=80,patch=15,create_delete=5")
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--fast-responses", action="store_true", help="FAST_RESPONSES=true")
+    args = parser.parse_args()
+
+    print(f"{'repository':<12}{'rps':>12}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for i, repository in enumerate(args.repositories):
+        port = args.port + i
+        env = {**os.environ, "USER_REPOSITORY": repository,
+               "FAST_RESPONSES": str(args.fast_responses).lower()}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.app.server", "--workers", "1", "--port", str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(base_url)
+            result = _run_load(base_url, args)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        print(f"{repository:<12}{result['rps']:>12,.0f}{result['p50_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
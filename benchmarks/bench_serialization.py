@@ -0,0 +1,86 @@
+"""
+Бенчмарк: CPU на запрос с обычной сериализацией (валидация по response_model) и с FAST_RESPONSES.
+
+1. Только сериализация (без БД и HTTP): строка users → JSON-байты.
+2. Полный запрос внутри процесса (TestClient, без сети): GET /users/{id} и GET /users?limit=N,
+   CPU-время процесса (time.process_time) на запрос в каждом режиме.
+Нужен запущенный PostgreSQL (параметры из .env) с пользователями в users
+(например, python -m src.db.seed --count 10000).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_serialization --requests 2000 --page-size 100
+"""
+
+import argparse
+import os
+import time
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+
+from src.app.schemas import UserList, UserResponse
+from src.app.serialization import dump_user, dump_user_list
+from src.config.settings import get_settings
+
+ROW = {
+    "id": 1, "email": "bench@example.com", "name": "Иван Петров",
+    "created_at": datetime(2026, 1, 1, 12, 0, 0, 123456), "phone": "+7 (900) 000-00-00",
+    "address": "г. Москва, ул. Ленина, д. 1", "birth_date": date(1990, 1, 1), "version": 1,
+}
+
+
+def _us_per_op(n: int, op) -> float:
+    started = time.process_time()
+    for _ in range(n):
+        op()
+    return (time.process_time() - started) / n * 1e6
+
+
+def _set_fast(enabled: bool) -> None:
+    os.environ["FAST_RESPONSES"] = "true" if enabled else "false"
+    get_settings.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    n, page = args.requests, args.page_size
+
+    rows = [ROW] * page
+    print("serialization only, us/op:")
+    print(f"  user      validate {_us_per_op(n, lambda: UserResponse.model_validate(ROW).model_dump_json()):8.1f}"
+          f"  fast {_us_per_op(n, lambda: dump_user(ROW)):8.1f}")
+    slow_list = _us_per_op(n // 10, lambda: UserList.model_validate({"items": rows}).model_dump_json())
+    fast_list = _us_per_op(n // 10, lambda: dump_user_list(rows))
+    print(f"  list[{page}] validate {slow_list:8.1f}  fast {fast_list:8.1f}")
+
+    _set_fast(False)
+    from src.app.main import app
+
+    with TestClient(app) as client:
+        page_response = client.get("/users", params={"limit": page})
+        page_response.raise_for_status()
+        items = page_response.json()["items"]
+        if not items:
+            raise SystemExit("users table is empty — seed it first (python -m src.db.seed)")
+        user_id = items[0]["id"]
+
+        cases = {
+            "GET /users/{id}": lambda: client.get(f"/users/{user_id}"),
+            f"GET /users?limit={page}": lambda: client.get("/users", params={"limit": page}),
+        }
+        print(f"in-process requests (CPU us/request, n={n}):")
+        for title, request in cases.items():
+            results = {}
+            for fast in (False, True):
+                _set_fast(fast)
+                request()  # прогрев
+                results[fast] = _us_per_op(n, request)
+            print(f"  {title:<22} validate {results[False]:8.1f}  fast {results[True]:8.1f}"
+                  f"  ({(results[True] / results[False] - 1) * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Бенчмарк масштабирования по воркерам: python -m src.app.server с 1, 2, 4, ... N воркерами.
+
+Для каждого числа воркеров сервер поднимается на отдельном порту, затем несколько процессов
+python -m src.loadtest (closed loop, по умолчанию только GET /users/{id}) нагружают его
+одновременно; throughput процессов суммируется. Один клиентский процесс упирается в свой GIL
+раньше сервера, поэтому клиентов несколько (--clients). Клиенты и сервер делят одну машину —
+для честных цифр оставьте клиентам свободные ядра.
+Нужен запущенный PostgreSQL (параметры из .env).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_server_scaling --workers 1 2 4 8 --clients 4 --duration 15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/admin/pool", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout} s")
+
+
+def _run_load(base_url: str, args) -> dict:
+    """Запустить --clients процессов нагрузки одновременно и собрать их JSON-отчёты."""
+    command = [
+        sys.executable, "-m", "src.loadtest", "--base-url", base_url, "--json", "-",
+        "--duration", str(args.duration), "--workers", str(args.client_threads),
+        "--mix", args.mix, "--seed-users", str(args.seed_users),
+    ]
+    clients = [subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+               for _ in range(args.clients)]
+    reports = [json.loads(client.communicate()[0]) for client in clients]
+    totals = [report["total"] for report in reports]
+    return {
+        "rps": sum(t["throughput_rps"] for t in totals),
+        "p50_ms": max(t["p50_ms"] for t in totals),
+        "p99_ms": max(t["p99_ms"] for t in totals),
+        "errors": sum(t["errors"] for t in totals),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=3100, help="First port (one per run)")
+    parser.add_argument("--clients", type=int, default=4, help="Load generator processes")
+    parser.add_argument("--client-threads", type=int, default=16, help="Threads per load process")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--mix", default="get=100")
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--db-connection-budget", type=int, default=None,
+                        help="DB_CONNECTION_BUDGET for the server (default: from settings)")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'rps':>12}{'speedup':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    baseline = None
+    for i, workers in enumerate(args.workers):
+        port = args.port + i
+        command = [sys.executable, "-m", "src.app.server", "--workers", str(workers), "--port", str(port)]
+        if args.db_connection_budget is not None:
+            command += ["--db-connection-budget", str(args.db_connection_budget)]
+        server = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=os.environ.copy(),
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(base_url)
+            result = _run_load(base_url, args)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        baseline = baseline or result["rps"]
+        print(f"{workers:>8}{result['rps']:>12,.0f}{result['rps'] / baseline:>10.2f}"
+              f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
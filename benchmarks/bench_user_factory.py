@@ -0,0 +1,57 @@
+"""
+Бенчмарк генерации пользователей: UserFactory (Faker на каждую строку) против BulkUserGenerator.
+
+Замеряется rows/sec для:
+- faker    — UserFactory.iter_users_data (пять вызовов Faker на пользователя);
+- bulk     — BulkUserGenerator.iter_rows (выборка из заранее сгенерированных словарей);
+- csv      — BulkUserGenerator.iter_csv_chunks (готовый поток для COPY);
+- ndjson   — BulkUserGenerator.write_ndjson в память.
+Время построения словарей BulkUserGenerator выводится отдельно. БД и API не нужны.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_user_factory --faker-rows 20000 --bulk-rows 1000000
+"""
+
+import argparse
+import io
+import time
+from collections import deque
+
+from data.user_factory import BulkUserGenerator, UserFactory
+
+
+def _rate(rows: int, consume) -> float:
+    started = time.perf_counter()
+    consume()
+    return rows / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--faker-rows", type=int, default=20000)
+    parser.add_argument("--bulk-rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    factory = UserFactory()
+    faker_rate = _rate(args.faker_rows,
+                       lambda: deque(factory.iter_users_data(args.faker_rows), maxlen=0))
+
+    started = time.perf_counter()
+    generator = BulkUserGenerator(seed=args.seed)
+    setup = time.perf_counter() - started
+
+    n = args.bulk_rows
+    results = {
+        "faker": faker_rate,
+        "bulk": _rate(n, lambda: deque(generator.iter_rows(n), maxlen=0)),
+        "csv": _rate(n, lambda: deque(generator.iter_csv_chunks(n), maxlen=0)),
+        "ndjson": _rate(n, lambda: generator.write_ndjson(io.StringIO(), n)),
+    }
+    print(f"faker rows={args.faker_rows}, bulk rows={n}, bulk vocabulary setup {setup:.2f} s")
+    for name, rate in results.items():
+        print(f"{name:<7} {rate:>12,.0f} rows/s  (x{rate / faker_rate:,.0f} vs faker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Жизненный цикл тестовых пользователей при параллельном прогоне (pytest-xdist).
+
+Каждый процесс pytest получает своё пространство имён email: t<run>_<worker>_,
+где run — общий id прогона (PYTEST_XDIST_TESTRUNUID), worker — gw0, gw1, ... (или main).
+Email внутри пространства уникальны (счётчик), поэтому воркеры не пересекаются и не ловят 409,
+а все созданные за сессию пользователи удаляются одним DELETE по префиксу.
+"""
+
+import itertools
+import os
+import uuid
+
+from data.user_factory import UserFactory
+
+# Домен тестовых email (RFC 2606: example.com зарезервирован для примеров)
+TEST_EMAIL_DOMAIN = "example.com"
+
+
+def make_namespace(run_id: str | None = None, worker_id: str | None = None) -> str:
+    """
+    Префикс email для текущего процесса pytest.
+    По умолчанию run_id и worker_id — из переменных окружения pytest-xdist;
+    без xdist — случайный run_id и worker 'main'.
+    """
+    run_id = run_id or os.environ.get("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
+    worker_id = worker_id or os.environ.get("PYTEST_XDIST_WORKER") or "main"
+    return f"t{run_id[:10]}_{worker_id}_"
+
+
+class UserDataManager:
+    """
+    Выдаёт payload-ы пользователей с уникальными email в пространстве имён воркера
+    и удаляет всех пользователей пространства одним запросом (cleanup в конце сессии).
+    """
+
+    def __init__(self, namespace: str | None = None, factory: UserFactory | None = None):
+        self.namespace = namespace or make_namespace()
+        self.factory = factory or UserFactory()
+        self._counter = itertools.count(1)
+
+    def email(self, label: str = "user") -> str:
+        """Новый уникальный email: <namespace><n>_<label>@example.com."""
+        return f"{self.namespace}{next(self._counter)}_{label}@{TEST_EMAIL_DOMAIN}"
+
+    def owns(self, email: str) -> bool:
+        """Email создан этим менеджером (попадёт под cleanup)."""
+        return email.startswith(self.namespace)
+
+    def user_payload(self, include_optional_fields: bool = True, **overrides) -> dict:
+        """Данные пользователя из UserFactory с email из пространства имён воркера."""
+        overrides.setdefault("email", self.email())
+        return self.factory.generate_single_user_data(
+            include_optional_fields=include_optional_fields, **overrides)
+
+    def user_payloads(self, count: int, include_optional_fields: bool = True) -> list[dict]:
+        """count payload-ов с разными email (например, для POST /users/batch)."""
+        return [self.user_payload(include_optional_fields) for _ in range(count)]
+
+    def cleanup(self, users_queries) -> int:
+        """Удалить всех пользователей пространства имён одним DELETE. Возвращает число удалённых."""
+        return users_queries.delete_users_by_email_prefix(self.namespace)
@@ -1,18 +1,43 @@
 """
 Фабрика тестовых данных для пользователей.
 Позволяет генерировать случайные данные для тестирования API пользователей.
+
+UserFactory — по одному пользователю через Faker (разнообразные данные для API-тестов).
+BulkUserGenerator — потоковая генерация миллионов строк для нагрузочных данных:
+словари значений готовятся Faker-ом один раз, дальше строки собираются выборкой из них.
+
+Faker импортируется и создаётся при первом использовании, а не при импорте модуля:
+сбор тестов и процессы, которым данные не нужны, не платят за загрузку провайдеров.
 """
 
-from typing import Dict, List
+import csv
+import io
+import json
+import random
+from collections.abc import Iterator
+from datetime import date, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, TextIO
+
+if TYPE_CHECKING:
+    from faker import Faker
 
-from faker import Faker
+# Колонки users, которые заполняют генераторы, — в этом порядке идут значения строк
+USER_DATA_COLUMNS = ("email", "name", "phone", "address", "birth_date")
 
 
 class UserFactory:
     """Фабрика для генерации тестовых данных пользователей."""
 
     def __init__(self, locale: str = 'ru_RU'):
-        self.fake = Faker(locale)
+        self.locale = locale
+
+    @cached_property
+    def fake(self) -> "Faker":
+        """Экземпляр Faker — создаётся при первой генерации."""
+        from faker import Faker
+
+        return Faker(self.locale)
 
     def generate_single_user_data(
             self,
@@ -63,13 +88,23 @@ class UserFactory:
         Returns:
             Список словарей с данными пользователей
         """
-        return [
-            self.generate_single_user_data(
+        return list(self.iter_users_data(count, include_optional_fields, **overrides))
+
+    def iter_users_data(
+            self,
+            count: int,
+            include_optional_fields: bool = True,
+            **overrides
+    ) -> Iterator[Dict[str, any]]:
+        """
+        То же, что generate_multiple_users_data, но лениво: пользователи генерируются
+        по одному при итерации, список в памяти не собирается.
+        """
+        for _ in range(count):
+            yield self.generate_single_user_data(
                 include_optional_fields=include_optional_fields,
                 **overrides
             )
-            for _ in range(count)
-        ]
 
     def generate_user_with_required_only(self) -> Dict[str, any]:
         """
@@ -93,6 +128,146 @@ class UserFactory:
         return self.generate_single_user_data(email=email)
 
 
+class BulkUserGenerator:
+    """
+    Быстрая воспроизводимая генерация большого числа пользователей.
+
+    Faker вызывается только при создании генератора — для словарей имён, телефонов и адресов
+    (vocabulary_size значений каждого). Строки собираются пачками по batch_size:
+    random.choices(..., k=batch_size) по словарям и email из счётчика, поэтому email
+    гарантированно уникальны: <email_prefix><n>@<email_domain>, n = start, start + 1, ...
+    Один и тот же seed (при тех же count, start и batch_size) даёт одни и те же данные.
+    """
+
+    def __init__(
+            self,
+            seed: int = 0,
+            locale: str = 'ru_RU',
+            vocabulary_size: int = 1000,
+            email_prefix: str = "bulk_",
+            email_domain: str = "example.com",
+            include_optional_fields: bool = True,
+            batch_size: int = 10000,
+    ):
+        from faker import Faker
+
+        fake = Faker(locale)
+        fake.seed_instance(seed)
+        self.seed = seed
+        self.email_prefix = email_prefix
+        self.email_domain = email_domain
+        self.include_optional_fields = include_optional_fields
+        self.batch_size = batch_size
+        self.names = [fake.name() for _ in range(vocabulary_size)]
+        self.phones = [fake.phone_number() for _ in range(vocabulary_size)]
+        # Адреса в одну строку: переводы строк ни к чему в CSV/COPY
+        self.addresses = [fake.address().replace("\n", ", ") for _ in range(vocabulary_size)]
+        # Все даты рождения в диапазоне 1950–2005 (ISO-строки, как в API)
+        first = date(1950, 1, 1)
+        self.birth_dates = [
+            (first + timedelta(days=d)).isoformat() for d in range((date(2005, 12, 31) - first).days)
+        ]
+
+    def iter_batches(self, count: int, start: int = 1) -> Iterator[list[tuple]]:
+        """
+        Строки пачками по batch_size: списки кортежей в порядке USER_DATA_COLUMNS.
+        Без опциональных полей phone/address/birth_date — None (NULL в БД).
+
+        Args:
+            count: Сколько строк сгенерировать
+            start: Номер первого email (чтобы дописать данные к уже сгенерированным)
+        """
+        rng = random.Random(self.seed)
+        end = start + count
+        for batch_start in range(start, end, self.batch_size):
+            n = min(self.batch_size, end - batch_start)
+            emails = [f"{self.email_prefix}{i}@{self.email_domain}"
+                      for i in range(batch_start, batch_start + n)]
+            names = rng.choices(self.names, k=n)
+            if self.include_optional_fields:
+                phones = rng.choices(self.phones, k=n)
+                addresses = rng.choices(self.addresses, k=n)
+                birth_dates = rng.choices(self.birth_dates, k=n)
+            else:
+                phones = addresses = birth_dates = [None] * n
+            yield list(zip(emails, names, phones, addresses, birth_dates))
+
+    def iter_rows(self, count: int, start: int = 1) -> Iterator[tuple]:
+        """Строки по одной (кортежи в порядке USER_DATA_COLUMNS)."""
+        for batch in self.iter_batches(count, start):
+            yield from batch
+
+    def iter_users(self, count: int, start: int = 1) -> Iterator[Dict[str, any]]:
+        """Пользователи как dict — в том же виде, что generate_single_user_data (payload для API)."""
+        for row in self.iter_rows(count, start):
+            user = dict(zip(USER_DATA_COLUMNS, row))
+            if not self.include_optional_fields:
+                user = {"email": user["email"], "name": user["name"]}
+            yield user
+
+    def iter_csv_chunks(self, count: int, start: int = 1) -> Iterator[str]:
+        """CSV без заголовка, по куску текста на пачку. Пустое поле — NULL для COPY ... FORMAT csv."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for batch in self.iter_batches(count, start):
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def write_csv(self, file: TextIO, count: int, start: int = 1, header: bool = True) -> None:
+        """Записать count строк в CSV-файл (file открыт с newline='')."""
+        if header:
+            file.write(",".join(USER_DATA_COLUMNS) + "\n")
+        for chunk in self.iter_csv_chunks(count, start):
+            file.write(chunk)
+
+    def write_ndjson(self, file: TextIO, count: int, start: int = 1) -> None:
+        """Записать count пользователей в NDJSON: по JSON-объекту на строку."""
+        dumps = json.dumps
+        for batch in self.iter_batches(count, start):
+            file.write("".join(
+                dumps(dict(zip(USER_DATA_COLUMNS, row)), ensure_ascii=False) + "\n"
+                for row in batch))
+
+    def copy_to(self, cursor, count: int, start: int = 1, table: str = "users") -> None:
+        """
+        Загрузить count строк в PostgreSQL через COPY FROM STDIN (psycopg2-курсор).
+        Данные идут потоком по пачкам, весь CSV в памяти не собирается. Commit — за вызывающим.
+        """
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(USER_DATA_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            ChunkReader(self.iter_csv_chunks(count, start)),
+        )
+
+
+class ChunkReader(io.TextIOBase):
+    """Файлоподобный объект поверх итератора текстовых кусков — для copy_expert и т.п."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._chunk = ""
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        """Не больше size символов (кусок за раз, без склейки); "" — данные закончились."""
+        if size is None or size < 0:
+            data = self._chunk[self._pos:] + "".join(self._chunks)
+            self._chunk, self._pos = "", 0
+            return data
+        while self._pos >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return ""
+            self._chunk, self._pos = chunk, 0
+        data = self._chunk[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+
 # Создаем экземпляр фабрики по умолчанию для удобства
 user_factory = UserFactory()
 
@@ -0,0 +1,9 @@
+-- Индексы для списка GET /users (keyset-пагинация по id + фильтры).
+-- Скрипты docker/init выполняются только на пустом volume; на существующей БД выполните вручную.
+
+-- Фильтр по диапазону created_at (created_from / created_to); id — для порядка внутри диапазона.
+CREATE INDEX IF NOT EXISTS users_created_at_id_idx ON users (created_at, id);
+
+-- Фильтр email_prefix: LIKE 'prefix%' использует индекс только с pattern_ops
+-- (UNIQUE-индекс по email построен с collation БД и для LIKE не подходит).
+CREATE INDEX IF NOT EXISTS users_email_pattern_idx ON users (email varchar_pattern_ops);
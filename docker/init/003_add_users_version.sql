@@ -0,0 +1,6 @@
+-- Версия строки для оптимистичной блокировки (ETag / If-Match в PUT, PATCH, DELETE /users/{id}).
+-- Каждый UPDATE из src/db/statements.py делает version = version + 1; при записи в users
+-- в обход API увеличивайте version так же, иначе клиенты не увидят изменения по ETag.
+-- Скрипты docker/init выполняются только на пустом volume; на существующей БД выполните вручную.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
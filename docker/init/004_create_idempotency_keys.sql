@@ -0,0 +1,18 @@
+-- Ключи идемпотентности POST /users (заголовок Idempotency-Key, src/app/idempotency.py).
+-- Ключ занимается первым запросом транзакции, ответ 201 дописывается в той же транзакции,
+-- что и INSERT пользователя: закоммиченная запись всегда с ответом. Параллельный запрос
+-- с тем же ключом ждёт на PRIMARY KEY, пока первая транзакция не завершится.
+-- Истёкшие ключи переиспользуются и удаляются понемногу при каждом запросе с ключом.
+-- Скрипты docker/init выполняются только на пустом volume; на существующей БД выполните вручную.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key VARCHAR(255) PRIMARY KEY,
+    fingerprint BYTEA NOT NULL,  -- Хэш тела запроса: тот же ключ с другим телом — 422
+    status_code SMALLINT,
+    response_body BYTEA,
+    etag VARCHAR(64),
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idempotency_keys_expires_at_idx ON idempotency_keys (expires_at);
@@ -0,0 +1,7 @@
+-- Поиск пользователя по email без учёта регистра: GET /users/by-email/{email} и GET /users/by-email.
+-- Запросы ищут по lower(email) = lower($1) — обычный UNIQUE-индекс по email для этого не подходит.
+-- Индекс не UNIQUE: уникальность email по-прежнему с учётом регистра (ограничение users_email_key),
+-- и создание индекса не упадёт на существующих данных с адресами, различающимися только регистром.
+-- Скрипты docker/init выполняются только на пустом volume; на существующей БД выполните вручную.
+
+CREATE INDEX IF NOT EXISTS users_email_lower_idx ON users (lower(email));
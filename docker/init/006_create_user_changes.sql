@@ -0,0 +1,46 @@
+-- Лента изменений users (GET /users/changes, src/app/changes.py).
+-- Каждый INSERT/UPDATE/DELETE строки users пишет запись в user_changes (id — номер события
+-- для возобновления по Last-Event-ID) и отправляет её JSON в канал NOTIFY user_changes.
+-- NOTIFY доставляется при COMMIT: откаченные изменения в ленту не попадают.
+-- Записи старше USER_CHANGES_RETENTION удаляет приложение.
+-- Массовые операции (сидинг src/db/seed.py, cleanup по префиксу email) ставят
+-- app.skip_user_changes = on: условие WHEN отсекает строки до вызова функции,
+-- ни записей в user_changes, ни NOTIFY, ни очереди AFTER-триггеров на миллионы строк.
+-- Скрипты docker/init выполняются только на пустом volume; на существующей БД выполните вручную.
+
+CREATE TABLE IF NOT EXISTS user_changes (
+    id BIGSERIAL PRIMARY KEY,
+    op VARCHAR(6) NOT NULL,  -- insert / update / delete
+    user_id INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS user_changes_changed_at_idx ON user_changes (changed_at);
+
+CREATE OR REPLACE FUNCTION notify_user_change() RETURNS trigger AS $$
+DECLARE
+    change user_changes;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO user_changes (op, user_id, version) VALUES ('delete', OLD.id, OLD.version)
+        RETURNING * INTO change;
+    ELSE
+        INSERT INTO user_changes (op, user_id, version) VALUES (lower(TG_OP), NEW.id, NEW.version)
+        RETURNING * INTO change;
+    END IF;
+    -- Тот же JSON, что отдаёт догоняющий запрос (row_to_json строки user_changes)
+    PERFORM pg_notify('user_changes', row_to_json(change)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_notify_change ON users;
+CREATE TRIGGER users_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON users
+    FOR EACH ROW
+    WHEN (current_setting('app.skip_user_changes', true) IS DISTINCT FROM 'on')
+    EXECUTE FUNCTION notify_user_change();
+
+GRANT SELECT, INSERT, DELETE ON user_changes TO api_user;
+GRANT USAGE, SELECT ON SEQUENCE user_changes_id_seq TO api_user;
@@ -0,0 +1,29 @@
+"""
+Доступ к служебным эндпоинтам /admin и /metrics.
+
+Оба по умолчанию не подключены (ADMIN_ENABLED=false, METRICS_ENABLED=false). При заданном
+ADMIN_TOKEN они отвечают только на запросы с заголовком Authorization: Bearer <ADMIN_TOKEN>,
+остальным — 401 (Prometheus передаёт токен через authorization в scrape_config).
+"""
+
+import secrets
+from typing import Annotated
+
+from fastapi import Header, HTTPException, status
+
+from src.config.settings import get_settings
+
+
+def require_admin_token(authorization: Annotated[str | None, Header()] = None) -> None:
+    """Зависимость роутеров /admin и /metrics: проверить Bearer-токен, если ADMIN_TOKEN задан."""
+    token = get_settings().admin_token
+    if not token:
+        return
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+            credentials.strip().encode(), token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
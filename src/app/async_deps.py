@@ -0,0 +1,93 @@
+"""
+Асинхронные зависимости приложения: пул подключений asyncpg.
+Используется роутером users_async при DB_DRIVER=asyncpg; конфиг — из config.settings.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from src.config.settings import get_settings
+
+from .metrics import log_asyncpg_query
+from .pool import PoolTimeout
+from .slow_queries import get_slow_query_log
+
+_pool: asyncpg.Pool | None = None
+_pool_lock = asyncio.Lock()
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Настройка нового соединения пула: query logger для метрик (время запросов к БД)
+    и для журнала медленных запросов.
+    """
+    if get_settings().metrics_enabled:
+        conn.add_query_logger(log_asyncpg_query)
+    slow_query_log = get_slow_query_log()
+    if slow_query_log is not None:
+        conn.add_query_logger(slow_query_log.observe_asyncpg)
+
+
+def _server_settings() -> dict[str, str]:
+    """Параметры сессии соединений: statement_timeout (DB_STATEMENT_TIMEOUT)."""
+    timeout = get_settings().db_statement_timeout
+    return {"statement_timeout": str(int(timeout * 1000))} if timeout else {}
+
+
+async def open_async_pool() -> asyncpg.Pool:
+    """Создать пул asyncpg (на старте приложения). Повторный вызов возвращает уже созданный."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            s = get_settings()
+            _pool = await asyncpg.create_pool(
+                host=s.db_host,
+                port=s.db_port,
+                database=s.db_name,
+                user=s.db_user,
+                password=s.db_password,
+                min_size=s.db_pool_min_size,
+                max_size=s.db_pool_max_size,
+                # asyncpg не ограничивает возраст соединения — закрываем простаивающие
+                max_inactive_connection_lifetime=s.db_pool_max_lifetime,
+                init=_init_connection,
+                server_settings=_server_settings(),
+            )
+    return _pool
+
+
+async def close_async_pool() -> None:
+    """Закрыть пул asyncpg (на остановке приложения)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+def get_async_pool() -> asyncpg.Pool | None:
+    """Текущий пул asyncpg или None, если он ещё не создан."""
+    return _pool
+
+
+@asynccontextmanager
+async def get_async_db_connection():
+    """
+    Асинхронный контекстный менеджер: соединение из пула asyncpg.
+    Использование: async with get_async_db_connection() as conn: ...
+    """
+    pool = await open_async_pool()
+    timeout = get_settings().db_pool_timeout
+    try:
+        conn = await pool.acquire(timeout=timeout)
+    except TimeoutError:
+        # Тот же тип, что у пула psycopg2: обработчик в errors.py ответит 503
+        raise PoolTimeout(f"Could not get a connection from the pool within {timeout:.1f}s "
+                          f"(max_size={pool.get_max_size()})") from None
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
@@ -0,0 +1,30 @@
+"""
+Общая логика batch-операций над users (для sync и async роутеров).
+"""
+
+from .schemas import UserBatchCreateResponse, UserBatchItemResult, UserCreate
+
+DUPLICATE_EMAIL_DETAIL = "User with this email already exists"
+
+
+def build_batch_create_response(
+        payloads: list[UserCreate],
+        rows: list[dict],
+) -> UserBatchCreateResponse:
+    """
+    Сопоставить строки из INSERT ... ON CONFLICT DO NOTHING RETURNING с элементами запроса.
+
+    Вставленные строки ищутся по email: элемент, для которого строки нет (email уже был в БД
+    или повторяется выше в этом же запросе), получает 409.
+    """
+    inserted = {row["email"]: row for row in rows}
+    items = []
+    for index, payload in enumerate(payloads):
+        row = inserted.pop(payload.email, None)
+        if row is not None:
+            items.append(UserBatchItemResult(index=index, status=201, user=row))
+        else:
+            items.append(
+                UserBatchItemResult(index=index, status=409, detail=DUPLICATE_EMAIL_DETAIL))
+    created = sum(1 for item in items if item.status == 201)
+    return UserBatchCreateResponse(created=created, failed=len(items) - created, items=items)
@@ -0,0 +1,149 @@
+"""
+Read-through кэш для GET /users/{id}.
+
+CacheBackend — интерфейс бэкенда: по умолчанию InMemoryCache (LRU + TTL в памяти процесса),
+общий кэш (Redis и т.п.) подключается своим классом через USER_CACHE_BACKEND=module:Class.
+Записи инвалидируются хендлерами PUT/PATCH/DELETE того же процесса; в других процессах
+(несколько воркеров) запись живёт до истечения TTL.
+"""
+
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable
+
+from src.config.settings import get_settings
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Счётчики кэша."""
+
+    hits: int
+    misses: int
+    evictions: int  # Вытеснено по LRU при переполнении
+    expirations: int  # Удалено по истечении TTL
+    size: int
+    max_size: int
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Запись кэша: строка users (dict) и её ETag."""
+
+    row: dict
+    etag: str
+
+
+class CacheBackend(ABC):
+    """Интерфейс бэкенда кэша. Конструктор: cls(max_size=..., ttl=...)."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any | None:
+        """Значение по ключу или None (нет записи или истёк TTL)."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Положить значение; TTL — из настроек бэкенда."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Инвалидировать запись (нет записи — не ошибка)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удалить все записи."""
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Текущие счётчики."""
+
+
+class InMemoryCache(CacheBackend):
+    """LRU-кэш с TTL в памяти процесса, потокобезопасный (хендлеры идут из threadpool)."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value); конец — свежие
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._data),
+                max_size=self.max_size,
+            )
+
+
+def _load_backend(spec: str) -> type[CacheBackend]:
+    """'memory' → InMemoryCache, иначе 'package.module:ClassName'."""
+    if spec == "memory":
+        return InMemoryCache
+    module_name, _, class_name = spec.partition(":")
+    backend = getattr(importlib.import_module(module_name), class_name)
+    if not issubclass(backend, CacheBackend):
+        raise TypeError(f"{spec} is not a CacheBackend subclass")
+    return backend
+
+
+@lru_cache
+def get_user_cache() -> CacheBackend | None:
+    """Кэш пользователей процесса или None, если он выключен (USER_CACHE_ENABLED=false)."""
+    s = get_settings()
+    if not s.user_cache_enabled:
+        return None
+    backend = _load_backend(s.user_cache_backend)
+    return backend(max_size=s.user_cache_max_size, ttl=s.user_cache_ttl)
+
+
+def invalidate_users(*user_ids: int) -> None:
+    """Сбросить записи после изменения/удаления пользователей (no-op, если кэш выключен)."""
+    cache = get_user_cache()
+    if cache is not None:
+        for user_id in user_ids:
+            cache.delete(user_id)
@@ -0,0 +1,187 @@
+"""
+Лента изменений пользователей для GET /users/changes (Server-Sent Events).
+
+Триггер на users (docker/init/006_create_user_changes.sql) пишет каждое изменение
+в user_changes и отправляет его JSON в канал NOTIFY user_changes. Вместо опроса
+GET /users/{id} подписчики получают push:
+- на процесс одно соединение asyncpg с LISTEN; событие один раз превращается в кадр SSE
+  и раскладывается по очередям подписчиков — нагрузка на БД не зависит от их числа;
+- возобновление: подписчик передаёт id последнего события, пропущенные события
+  дочитываются из user_changes страницами, затем идёт живой поток;
+- очередь подписчика ограничена USER_CHANGES_QUEUE_SIZE: отстающий подписчик отключается
+  и догоняет по таблице при переподключении, память процесса не растёт;
+- обрыв соединения LISTEN закрывает все потоки, следующий подписчик откроет новое.
+Доставка «хотя бы один раз»: клиент отбрасывает повторы по id. События параллельных
+транзакций коммитятся не строго в порядке id, поэтому возобновление может пропустить
+событие, закоммиченное с меньшим id уже после разрыва.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+
+import asyncpg
+
+from src.config.settings import get_settings
+from src.db.statements import GET_USER_CHANGES_AFTER, PURGE_USER_CHANGES
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "user_changes"
+REPLAY_PAGE_SIZE = 500
+PURGE_INTERVAL = 3600.0  # Сек между удалениями событий старше USER_CHANGES_RETENTION
+
+_feed: "ChangeFeed | None" = None
+
+
+def _event(change_id: int, payload: str) -> bytes:
+    """Кадр SSE: id — для Last-Event-ID, data — JSON строки user_changes."""
+    return f"id: {change_id}\ndata: {payload}\n\n".encode()
+
+
+class ChangeFeed:
+    """Один LISTEN на процесс и раздача событий подписчикам (asyncio.Queue на подписчика)."""
+
+    def __init__(self, queue_size: int, retention: float):
+        self.queue_size = queue_size
+        self.retention = retention
+        self._conn: asyncpg.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._query_lock = asyncio.Lock()  # Запросы на соединении LISTEN — по одному
+        self._subscribers: set[asyncio.Queue] = set()
+        self._purge_task: asyncio.Task | None = None
+
+    async def _connection(self) -> asyncpg.Connection:
+        if self._conn is not None and not self._conn.is_closed():
+            return self._conn
+        async with self._connect_lock:
+            if self._conn is None or self._conn.is_closed():
+                s = get_settings()
+                conn = await asyncpg.connect(
+                    host=s.db_host, port=s.db_port, database=s.db_name,
+                    user=s.db_user, password=s.db_password,
+                )
+                conn.add_termination_listener(self._on_terminate)
+                await conn.add_listener(CHANNEL, self._on_notify)
+                self._conn = conn
+                if self.retention and self._purge_task is None:
+                    self._purge_task = asyncio.create_task(self._purge())
+        return self._conn
+
+    async def subscribe(self) -> asyncio.Queue:
+        """
+        Новый подписчик: очередь пар (id, кадр SSE); None в очереди — поток закрыть
+        (подписчик отстал или соединение LISTEN оборвалось). Ошибки подключения к БД — наружу.
+        """
+        await self._connection()
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def replay(self, after: int) -> AsyncIterator[tuple[int, bytes]]:
+        """События с id > after из user_changes, по порядку id."""
+        while True:
+            async with self._query_lock:
+                conn = await self._connection()
+                rows = await conn.fetch(GET_USER_CHANGES_AFTER.sql, after, REPLAY_PAGE_SIZE)
+            for row in rows:
+                yield row["id"], _event(row["id"], row["payload"])
+            if len(rows) < REPLAY_PAGE_SIZE:
+                return
+            after = rows[-1]["id"]
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        change_id = json.loads(payload)["id"]
+        item = (change_id, _event(change_id, payload))
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                logger.warning("User changes subscriber is too slow, closing its stream")
+                self._close(queue)
+
+    def _on_terminate(self, conn) -> None:
+        if conn is self._conn:
+            self._conn = None
+        for queue in list(self._subscribers):
+            self._close(queue)
+
+    def _close(self, queue: asyncio.Queue) -> None:
+        """Отключить подписчика: неотданные события не нужны, он продолжит по id."""
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _purge(self) -> None:
+        """Удалять события старше retention, пока открыта лента."""
+        while True:
+            try:
+                async with self._query_lock:
+                    conn = await self._connection()
+                    await conn.execute(PURGE_USER_CHANGES.sql, self.retention)
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Could not purge user changes: %s", exc)
+            await asyncio.sleep(PURGE_INTERVAL)
+
+    async def close(self) -> None:
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            self._purge_task = None
+        for queue in list(self._subscribers):
+            self._close(queue)
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+
+def get_change_feed() -> ChangeFeed:
+    """Лента изменений процесса. Соединение LISTEN открывается с первым подписчиком."""
+    global _feed
+    if _feed is None:
+        s = get_settings()
+        _feed = ChangeFeed(s.user_changes_queue_size, s.user_changes_retention)
+    return _feed
+
+
+async def close_change_feed() -> None:
+    """Закрыть ленту (на остановке приложения): потоки подписчиков завершаются."""
+    global _feed
+    feed, _feed = _feed, None
+    if feed is not None:
+        await feed.close()
+
+
+async def stream_changes(feed: ChangeFeed, queue: asyncio.Queue, after: int | None) -> AsyncIterator[bytes]:
+    """Тело ответа GET /users/changes: догоняющие события после after, затем живой поток."""
+    keepalive = get_settings().user_changes_keepalive
+    try:
+        yield b": connected\n\n"  # Заголовки и первый байт сразу: подписка уже активна
+        # Живые события, пришедшие во время догоняющего чтения, могут повторить прочитанные
+        replayed: set[int] = set()
+        last_replayed = after or 0
+        if after is not None:
+            async for change_id, event in feed.replay(after):
+                replayed.add(change_id)
+                last_replayed = change_id
+                yield event
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), keepalive)
+            except TimeoutError:
+                yield b": keepalive\n\n"  # Комментарий SSE: не даёт прокси закрыть соединение
+                continue
+            if item is None:
+                return
+            change_id, event = item
+            if change_id > last_replayed:
+                replayed.clear()
+            elif change_id in replayed:
+                continue
+            yield event
+    finally:
+        feed.unsubscribe(queue)
@@ -0,0 +1,248 @@
+"""
+Сжатие ответов по Accept-Encoding (COMPRESSION_ENABLED).
+
+Кодеки — в порядке предпочтения сервера (COMPRESSION_ENCODINGS): zstd (compression.zstd
+из stdlib Python 3.14 или пакет zstandard), br (пакет brotli, если установлен), gzip (zlib).
+Выбирается кодек с наибольшим q из Accept-Encoding клиента, при равных q — по порядку сервера.
+
+- Обычный ответ сжимается целиком, если тело не меньше COMPRESSION_MINIMUM_SIZE:
+  мелкие ответы (один пользователь) дешевле отдать как есть.
+- Потоковый ответ (NDJSON-выгрузка) сжимается по кускам: каждый кусок дописывается
+  в один поток сжатия и сбрасывается (flush) сразу — клиент получает и распаковывает
+  строки по мере выгрузки, память не растёт.
+- Ответы с уже заданным Content-Encoding, 204/304 и несжимаемые типы не трогаются.
+- У сжатого ответа свой ETag с суффиксом кодека ("3" → "3-gzip", см. etag.py), а Accept-Encoding
+  дописывается в уже заданный Vary, а не вторым заголовком.
+Чистый ASGI, как MetricsMiddleware, — без BaseHTTPMiddleware и копирования тела.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import partial
+
+from src.config.settings import get_settings
+
+from .etag import encoded_etag
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
+try:
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+try:
+    import brotli as _brotli
+except ImportError:
+    _brotli = None
+
+# Типы, которые имеет смысл сжимать (префиксы Content-Type)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class Encoder(ABC):
+    """Поток сжатия одного ответа."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Сжать очередной кусок (результат может быть пустым — данные в буфере кодека)."""
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Отдать всё накопленное так, чтобы клиент мог распаковать уже полученное."""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Завершить поток (после него compress() не вызывается)."""
+
+
+class GzipEncoder(Encoder):
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 — формат gzip
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class ZstdEncoder(Encoder):
+    def __init__(self, level: int):
+        if _zstd is not None:
+            self._obj = _zstd.ZstdCompressor(level=level)
+        else:
+            self._obj = _zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if _zstd is not None:
+            return self._obj.flush(_zstd.ZstdCompressor.FLUSH_BLOCK)
+        return self._obj.flush(_zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class BrotliEncoder(Encoder):
+    def __init__(self, level: int):
+        self._obj = _brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+# Кодеки, доступные в этом окружении: имя (как в Accept-Encoding) → класс
+ENCODERS: dict[str, type[Encoder]] = {"gzip": GzipEncoder}
+if _zstd is not None or _zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+if _brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+# Настройка уровня сжатия для каждого кодека
+LEVEL_SETTINGS = {"gzip": "compression_gzip_level", "zstd": "compression_zstd_level",
+                  "br": "compression_brotli_quality"}
+
+
+def available_encoders(settings=None) -> dict[str, Callable[[], Encoder]]:
+    """Кодеки из COMPRESSION_ENCODINGS, доступные в этом окружении: имя → фабрика Encoder."""
+    s = settings or get_settings()
+    preferred = [e.strip() for e in s.compression_encodings.split(",") if e.strip()]
+    return {name: partial(ENCODERS[name], getattr(s, LEVEL_SETTINGS[name]))
+            for name in preferred if name in ENCODERS}
+
+
+def negotiate(accept_encoding: str, supported: list[str]) -> str | None:
+    """
+    Кодек для ответа: наибольший q из Accept-Encoding среди supported (порядок — приоритет
+    сервера при равных q). '*' — любой кодек; q=0 — запрет. None — без сжатия.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if name:
+            weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for name in supported:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI-middleware сжатия ответов (см. docstring модуля)."""
+
+    def __init__(self, app, minimum_size: int | None = None):
+        s = get_settings()
+        self.app = app
+        self.minimum_size = s.compression_minimum_size if minimum_size is None else minimum_size
+        self.encoders = available_encoders(s)
+        self.supported = list(self.encoders)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept, self.supported) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder: Encoder | None = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                if _compressible(message):
+                    start_message = message  # Решение — по первому куску тела
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = self.encoders[encoding]()
+                headers = _encoded_headers(start_message["headers"], encoding)
+                if not more_body:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start_message, "headers": headers})
+
+            if more_body:
+                # Кусок потока: сжать и сразу сбросить, не дожидаясь конца ответа
+                chunk = encoder.compress(body) + encoder.flush() if body else b""
+            else:
+                chunk = encoder.compress(body) + encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _encoded_headers(headers, encoding: str) -> list[tuple[bytes, bytes]]:
+    """Заголовки сжатого ответа: без Content-Length, ETag с суффиксом кодека, один Vary."""
+    result, vary = [], []
+    for key, value in headers:
+        if key == b"content-length":
+            continue
+        if key == b"vary":
+            vary += [v.strip() for v in value.split(b",") if v.strip()]
+        elif key == b"etag":
+            result.append((key, encoded_etag(value.decode("latin-1"), encoding).encode("latin-1")))
+        else:
+            result.append((key, value))
+    if not any(v == b"*" or v.lower() == b"accept-encoding" for v in vary):
+        vary.append(b"Accept-Encoding")
+    result += [(b"content-encoding", encoding.encode()), (b"vary", b", ".join(vary))]
+    return result
+
+
+def _compressible(start_message) -> bool:
+    if start_message["status"] in (204, 304):
+        return False
+    content_type = b""
+    for key, value in start_message.get("headers", ()):
+        if key == b"content-encoding":
+            return False
+        if key == b"content-type":
+            content_type = value
+    return content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
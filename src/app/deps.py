@@ -1,14 +1,24 @@
 """
 Зависимости приложения: подключение к PostgreSQL.
 Конфиг берётся из config.settings (один источник правды).
+Соединения выдаются из пула (один на процесс), а не открываются на каждый запрос.
 """
 
-import psycopg2
+import threading
+import time
+
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 
 from src.config.settings import get_settings
 
+from .metrics import observe_db_query
+from .pool import ConnectionPool
+from .slow_queries import get_slow_query_log
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
 
 def get_db_config() -> dict:
     """Словарь параметров для psycopg2.connect (host, port, dbname, user, password)."""
@@ -22,19 +32,83 @@ def get_db_config() -> dict:
     }
 
 
+def _connection_options() -> dict:
+    """Параметры сессии соединений приложения: statement_timeout (DB_STATEMENT_TIMEOUT)."""
+    timeout = get_settings().db_statement_timeout
+    if not timeout:
+        return {}
+    return {"options": f"-c statement_timeout={int(timeout * 1000)}"}
+
+
+def get_pool() -> ConnectionPool:
+    """Пул подключений процесса. Создаётся лениво при первом обращении (размеры — из settings)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                s = get_settings()
+                _pool = ConnectionPool(
+                    {**get_db_config(), **_connection_options()},
+                    min_size=s.db_pool_min_size,
+                    max_size=s.db_pool_max_size,
+                    timeout=s.db_pool_timeout,
+                    max_lifetime=s.db_pool_max_lifetime,
+                    check_on_checkout=s.db_pool_check_on_checkout,
+                    check_idle_after=s.db_pool_check_idle_after,
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Закрыть пул (на остановке приложения). Следующий get_pool() создаст новый."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
 @contextmanager
 def get_db_connection():
     """
-    Контекстный менеджер: открывает соединение, по выходу закрывает.
+    Контекстный менеджер: берёт соединение из пула, по выходу возвращает его в пул.
+    Незакоммиченная транзакция при возврате откатывается.
     Использование: with get_db_connection() as conn: ...
     """
-    conn = psycopg2.connect(**get_db_config())
-    try:
+    with get_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
 
 
-def get_db_cursor(conn):
-    """Курсор с RealDictCursor — каждая строка как dict (ключи — имена колонок)."""
-    return conn.cursor(cursor_factory=RealDictCursor)
+class TimedDictCursor(RealDictCursor):
+    """
+    RealDictCursor, который замеряет каждый execute: время — в метрики
+    (db_query_duration_seconds), медленные запросы — в журнал (slow_queries.py).
+    """
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            self._observe(query, vars, time.perf_counter() - started, failed=True)
+            raise
+        self._observe(query, vars, time.perf_counter() - started)
+        return result
+
+    def _observe(self, query, vars, elapsed: float, failed: bool = False) -> None:
+        sql = query if isinstance(query, (str, bytes)) else "composed"
+        if get_settings().metrics_enabled:
+            observe_db_query(sql, elapsed)
+        slow_query_log = get_slow_query_log()
+        if slow_query_log is not None:
+            slow_query_log.observe_psycopg2(self, sql, vars, elapsed, failed)
+
+
+def get_db_cursor(conn, name: str | None = None):
+    """
+    Курсор с RealDictCursor — каждая строка как dict (ключи — имена колонок).
+    name — серверный (named) курсор. При METRICS_ENABLED или SLOW_QUERY_THRESHOLD
+    запросы курсора замеряются (TimedDictCursor).
+    """
+    timed = get_settings().metrics_enabled or get_slow_query_log() is not None
+    return conn.cursor(name=name, cursor_factory=TimedDictCursor if timed else RealDictCursor)
@@ -0,0 +1,84 @@
+"""
+Ответы на ошибки БД, общие для обоих роутеров /users (psycopg2 и asyncpg).
+
+- нарушение уникальности (UniqueViolation, DuplicateEmailError хранилища в памяти) → 409;
+- перегрузка: нет свободного соединения в пуле (PoolTimeout), запрос отменён по
+  statement_timeout (DB_STATEMENT_TIMEOUT) → 503 с Retry-After;
+- БД недоступна (обрыв, отказ в подключении, too many connections) → 503 с Retry-After.
+
+503 с Retry-After говорит клиенту «повтори позже» (см. повторы в src/clients),
+а не «запрос неверен», как 409, и не «баг сервера», как 500.
+"""
+
+import logging
+
+import asyncpg
+import psycopg2
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from psycopg2 import errors as pg_errors
+
+from src.config.settings import get_settings
+
+from .pool import PoolClosed, PoolTimeout
+from .repository import DuplicateEmailError
+
+logger = logging.getLogger(__name__)
+
+# Единственное UNIQUE-ограничение users кроме PK
+EMAIL_CONSTRAINT = "users_email_key"
+
+OVERLOAD_ERRORS = (PoolTimeout, pg_errors.QueryCanceled, asyncpg.QueryCanceledError)
+UNAVAILABLE_ERRORS = (
+    PoolClosed,
+    psycopg2.OperationalError,
+    psycopg2.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+    asyncpg.ConnectionDoesNotExistError,
+    ConnectionError,  # asyncpg: отказ в TCP-подключении
+)
+UNIQUE_ERRORS = (pg_errors.UniqueViolation, asyncpg.UniqueViolationError, DuplicateEmailError)
+
+
+def service_unavailable(detail: str) -> JSONResponse:
+    """503 с Retry-After (OVERLOAD_RETRY_AFTER)."""
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(get_settings().overload_retry_after)},
+    )
+
+
+def _constraint_name(exc: Exception) -> str | None:
+    diag = getattr(exc, "diag", None)  # psycopg2
+    return diag.constraint_name if diag is not None else getattr(exc, "constraint_name", None)
+
+
+async def _unique_violation(_request: Request, exc: Exception) -> JSONResponse:
+    if _constraint_name(exc) == EMAIL_CONSTRAINT:
+        detail = "User with this email already exists"
+    else:
+        detail = "Resource already exists"
+    return JSONResponse({"detail": detail}, status_code=status.HTTP_409_CONFLICT)
+
+
+async def _overloaded(request: Request, exc: Exception) -> JSONResponse:
+    logger.warning("%s %s: database overloaded: %s", request.method, request.url.path, exc)
+    return service_unavailable("Database is overloaded, retry later")
+
+
+async def _unavailable(request: Request, exc: Exception) -> JSONResponse:
+    logger.warning("%s %s: database unavailable: %r", request.method, request.url.path, exc)
+    return service_unavailable("Database is unavailable, retry later")
+
+
+def register_error_handlers(app: FastAPI) -> None:
+    """Подключить обработчики к приложению (более узкий класс исключения важнее общего)."""
+    for exc_class in UNIQUE_ERRORS:
+        app.add_exception_handler(exc_class, _unique_violation)
+    for exc_class in OVERLOAD_ERRORS:
+        app.add_exception_handler(exc_class, _overloaded)
+    for exc_class in UNAVAILABLE_ERRORS:
+        app.add_exception_handler(exc_class, _unavailable)
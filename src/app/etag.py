@@ -0,0 +1,79 @@
+"""
+ETag для ответов с пользователем и проверка условных заголовков (If-None-Match, If-Match).
+
+ETag — версия строки users (столбец version, +1 на каждый UPDATE): "<version>".
+Вычислять его не нужно, а If-Match проверяется прямо в UPDATE/DELETE (version = ANY(...)).
+Сжатый ответ (compression.py) — другое представление, и ETag у него свой: "<version>-gzip".
+В условных заголовках суффикс кодека отбрасывается — сравнивается версия.
+"""
+
+from fastapi import HTTPException, status
+
+# version — INTEGER: большие числа в If-Match заведомо не совпадут (и не сломают ::int[])
+MAX_VERSION = 2 ** 31 - 1
+# Кодеки, суффикс которых может быть в ETag сжатого ответа
+CONTENT_CODINGS = ("gzip", "br", "zstd")
+
+
+def user_etag(row: dict) -> str:
+    """Сильный ETag пользователя: его версия в кавычках."""
+    return f'"{row["version"]}"'
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """ETag сжатого представления: кодек внутри кавычек ("3" → "3-gzip"), сила ETag сохраняется."""
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+def _without_coding(tag: str) -> str:
+    """ETag без суффикса кодека: "3-gzip" → "3"."""
+    for coding in CONTENT_CODINGS:
+        suffix = f'-{coding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    Совпадает ли ETag с заголовком If-None-Match (список через запятую или *).
+    Сравнение слабое (RFC 9110): префикс W/ и суффикс кодека не учитываются.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tag = _without_coding(etag.removeprefix("W/"))
+    return any(_without_coding(candidate.strip().removeprefix("W/")) == tag
+               for candidate in header.split(","))
+
+
+def if_match_versions(header: str) -> list[int] | None:
+    """
+    Версии из If-Match для проверки в SQL. None — If-Match: * (подходит любая версия).
+    Сравнение сильное (RFC 9110): слабые W/"..." и чужие ETag не совпадают ни с чем;
+    ETag сжатого ответа ("3-gzip") — та же версия.
+    """
+    if header.strip() == "*":
+        return None
+    versions = []
+    for candidate in header.split(","):
+        candidate = _without_coding(candidate.strip())
+        value = candidate[1:-1]
+        if (len(candidate) > 2 and candidate[0] == candidate[-1] == '"'
+                and value.isdigit() and int(value) <= MAX_VERSION):
+            versions.append(int(value))
+    return versions
+
+
+def missing_user_error(if_match: str | None) -> HTTPException:
+    """
+    UPDATE/DELETE не затронул строку: без If-Match — 404; с If-Match — 412
+    (версия не совпала или пользователя нет — по RFC 9110 If-Match проверяется первым).
+    """
+    if if_match is not None:
+        return HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="User version does not match If-Match",
+        )
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -0,0 +1,146 @@
+"""
+Group commit для POST /users (GROUP_COMMIT_ENABLED).
+
+Каждый POST /users — своя транзакция и свой COMMIT, то есть свой fsync WAL: при большом
+потоке записей пропускная способность упирается в задержку fsync, а не в CPU или сеть.
+Здесь параллельные создания собираются в пачку:
+- первый запрос открывает пачку, она закрывается через GROUP_COMMIT_MAX_WAIT или когда
+  в ней набралось GROUP_COMMIT_MAX_BATCH запросов;
+- пачка вставляется одним INSERT ... ON CONFLICT (email) DO NOTHING RETURNING в одной
+  транзакции (как POST /users/batch), каждый запрос получает свою строку;
+- email уже занят (в БД или раньше в этой же пачке) — 409 только этому запросу;
+- ошибка всей вставки (перегрузка/недоступность БД) — то же исключение каждому запросу
+  пачки (errors.py → 503).
+Пачки не ждут друг друга: пока одна вставляется, набирается следующая.
+Запросы с Idempotency-Key в пачки не попадают: ключ и пользователь пишутся одной транзакцией.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+
+from fastapi import HTTPException, status
+
+from .batch import DUPLICATE_EMAIL_DETAIL
+from .metrics import GROUP_COMMIT_BATCH_SIZE
+from .schemas import UserCreate
+
+
+class _Batch:
+    """Пачка запросов: payloads, сигналы «набралась» и «вставлена», результат вставки."""
+
+    def __init__(self, event_class):
+        self.payloads: list[UserCreate] = []
+        self.full = event_class()
+        self.done = event_class()
+        self.rows: list[dict | None] = []
+        self.error: Exception | None = None
+
+    def add(self, payload: UserCreate) -> int:
+        self.payloads.append(payload)
+        return len(self.payloads) - 1
+
+    def complete(self, rows: list[dict] | None = None, error: Exception | None = None) -> None:
+        """Разложить строки RETURNING по запросам (по email) или запомнить общую ошибку."""
+        GROUP_COMMIT_BATCH_SIZE.observe((), len(self.payloads))
+        if error is not None:
+            self.error = error
+        else:
+            inserted = {row["email"]: row for row in rows}
+            self.rows = [inserted.pop(payload.email, None) for payload in self.payloads]
+        self.done.set()
+
+    def result(self, index: int) -> dict:
+        if self.error is not None:
+            raise self.error
+        row = self.rows[index]
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_EMAIL_DETAIL)
+        return row
+
+
+class GroupCommitter:
+    """
+    Group commit для sync-роутера (хендлеры в threadpool).
+    insert_users(payloads) — вставка пачки одной транзакцией, возвращает строки RETURNING.
+    Вставку выполняет поток первого запроса пачки, остальные ждут её результата.
+    """
+
+    def __init__(self, insert_users: Callable[[list[UserCreate]], list[dict]],
+                 max_batch: int, max_wait: float):
+        self._insert_users = insert_users
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._batch: _Batch | None = None
+
+    def submit(self, payload: UserCreate) -> dict:
+        """Создать пользователя в составе пачки: строка users или HTTPException 409."""
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch(threading.Event)
+            index = batch.add(payload)
+            if len(batch.payloads) >= self.max_batch:
+                self._batch = None  # Пачка полная: следующие запросы откроют новую
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            try:
+                rows = self._insert_users(batch.payloads)
+            except Exception as exc:
+                batch.complete(error=exc)
+            else:
+                batch.complete(rows)
+        else:
+            batch.done.wait()
+        return batch.result(index)
+
+
+class AsyncGroupCommitter:
+    """
+    Group commit для async-роутера (asyncpg). Вставку пачки выполняет отдельная задача,
+    а не корутина первого запроса: отмена одного запроса не оставляет пачку без вставки.
+    """
+
+    def __init__(self, insert_users: Callable[[list[UserCreate]], Awaitable[list[dict]]],
+                 max_batch: int, max_wait: float):
+        self._insert_users = insert_users
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._batch: _Batch | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, payload: UserCreate) -> dict:
+        """Создать пользователя в составе пачки: строка users или HTTPException 409."""
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = _Batch(asyncio.Event)
+            task = asyncio.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        index = batch.add(payload)
+        if len(batch.payloads) >= self.max_batch:
+            self._batch = None
+            batch.full.set()
+        await batch.done.wait()
+        return batch.result(index)
+
+    async def _flush(self, batch: _Batch) -> None:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.max_wait)
+        except TimeoutError:
+            pass
+        if self._batch is batch:
+            self._batch = None
+        try:
+            rows = await self._insert_users(batch.payloads)
+        except Exception as exc:
+            batch.complete(error=exc)
+        else:
+            batch.complete(rows)
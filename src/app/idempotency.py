@@ -0,0 +1,50 @@
+"""
+Idempotency-Key для POST /users.
+
+Клиент, не дождавшийся ответа (таймаут, обрыв, 502 балансировщика), повторяет POST с тем же
+ключом и получает исходный ответ 201 вместо 409 или второго пользователя. Ключи хранятся
+в таблице idempotency_keys (docker/init/004_create_idempotency_keys.sql) в течение
+IDEMPOTENCY_KEY_TTL — общей для всех воркеров.
+
+Порядок в одной транзакции: занять ключ (CLAIM_IDEMPOTENCY_KEY) → INSERT пользователя →
+сохранить ответ (SAVE_IDEMPOTENT_RESPONSE). Ключ занят — ответ берётся из таблицы
+(GET_IDEMPOTENT_RESPONSE) без записи в users. Ошибка вставки откатывает и ключ.
+"""
+
+import hashlib
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+
+from .serialization import JSON_MEDIA_TYPE
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# Заголовок ответа-повтора: тело и статус — из первого запроса
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Сколько истёкших ключей удалять за один запрос с ключом
+PURGE_BATCH_SIZE = 10
+
+
+def request_fingerprint(payload: BaseModel) -> bytes:
+    """Хэш тела запроса: повтор с тем же ключом, но другим телом — ошибка клиента."""
+    return hashlib.blake2b(payload.model_dump_json().encode(), digest_size=16).digest()
+
+
+def replay_response(record: dict | None, fingerprint: bytes) -> Response:
+    """Ответ на повтор по сохранённой записи idempotency_keys."""
+    if record is None or record["status_code"] is None:
+        # Ключ истёк и удалён между CLAIM и чтением — клиенту достаточно повторить запрос
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key record is no longer available, retry the request",
+        )
+    if bytes(record["fingerprint"]) != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+    headers = {REPLAYED_HEADER: "true"}
+    if record["etag"] is not None:
+        headers["ETag"] = record["etag"]
+    return Response(bytes(record["response_body"]), status_code=record["status_code"],
+                    headers=headers, media_type=JSON_MEDIA_TYPE)
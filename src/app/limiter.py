@@ -0,0 +1,70 @@
+"""
+Сброс нагрузки: ограничение числа запросов в обработке на процесс (CONCURRENCY_LIMIT).
+
+Без ограничения при насыщении PostgreSQL запросы копятся в threadpool и в очереди пула
+соединений, и латентность растёт вместе с очередью. Здесь очередь ограничена:
+- свободный слот — запрос обрабатывается сразу;
+- слотов нет — ждёт не дольше CONCURRENCY_QUEUE_TIMEOUT, если ждущих меньше
+  CONCURRENCY_QUEUE_SIZE;
+- иначе — сразу 503 с Retry-After: клиент повторит позже (с backoff), а не будет висеть.
+
+Лимит — на процесс (как пул соединений): ориентир — DB_POOL_MAX_SIZE × 2.
+/metrics и /admin не ограничиваются — мониторинг должен работать и под перегрузкой;
+GET /users/changes — тоже: поток SSE открыт часами и занимал бы слот, не нагружая БД.
+"""
+
+import asyncio
+
+from src.config.settings import get_settings
+
+from .errors import service_unavailable
+from .metrics import HTTP_QUEUED, HTTP_SHED
+
+EXEMPT_PATH_PREFIXES = ("/metrics", "/admin", "/users/changes")
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI-middleware: не больше limit запросов одновременно, ограниченная очередь ожидания."""
+
+    def __init__(self, app, limit: int | None = None, queue_size: int | None = None,
+                 queue_timeout: float | None = None):
+        s = get_settings()
+        self.app = app
+        self.limit = s.concurrency_limit if limit is None else limit
+        self.queue_size = s.concurrency_queue_size if queue_size is None else queue_size
+        self.queue_timeout = s.concurrency_queue_timeout if queue_timeout is None else queue_timeout
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self._queued = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self._acquire()
+        if reason is not None:
+            HTTP_SHED.inc((reason,))
+            await service_unavailable("Server is overloaded, retry later")(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._semaphore.release()
+
+    async def _acquire(self) -> str | None:
+        """Занять слот. None — занят, иначе причина отказа (queue_full / queue_timeout)."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()  # Свободный слот: без ожидания
+            return None
+        if self._queued >= self.queue_size:
+            return "queue_full"
+        self._queued += 1
+        HTTP_QUEUED.inc()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            return None
+        except TimeoutError:
+            return "queue_timeout"
+        finally:
+            self._queued -= 1
+            HTTP_QUEUED.dec()
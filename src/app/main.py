@@ -1,11 +1,54 @@
 """
 Точка входа FastAPI: приложение и подключение роутеров.
-Запуск: uvicorn src.app.main:app --host 127.0.0.1 --port 8000
+Запуск (разработка): uvicorn src.app.main:app --host 127.0.0.1 --port 8000
+Продакшен, несколько воркеров: python -m src.app.server (см. src/app/server.py)
 """
 
+import logging
+from contextlib import asynccontextmanager
+
+import asyncpg
+import psycopg2
 from fastapi import FastAPI
 
-from .routers import users
+from src.config.settings import get_settings
+
+from .async_deps import close_async_pool, open_async_pool
+from .changes import close_change_feed
+from .compression import CompressionMiddleware
+from .deps import close_pool, get_pool
+from .errors import register_error_handlers
+from .limiter import ConcurrencyLimitMiddleware
+from .metrics import MetricsMiddleware
+from .routers import admin, metrics, user_changes, users, users_async
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Старт: прогрев пула подключений. Остановка: закрытие ленты изменений и пула."""
+    if get_settings().user_repository == "memory":
+        yield  # Пользователи в памяти процесса — PostgreSQL не нужен
+        return
+    if get_settings().db_driver == "asyncpg":
+        try:
+            await open_async_pool()
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning("Could not open asyncpg pool: %s", exc)
+        yield
+        await close_change_feed()
+        await close_async_pool()
+        return
+
+    try:
+        get_pool().open()
+    except psycopg2.OperationalError as exc:
+        # БД может подняться позже — соединения откроются лениво при первых запросах
+        logger.warning("Could not warm up DB pool: %s", exc)
+    yield
+    await close_change_feed()
+    close_pool()
 
 
 app = FastAPI(
@@ -20,11 +63,35 @@ REST API на **FastAPI** с полным CRUD по пользователям
 ### Возможности
 - CRUD `/users` с расширенными полями (phone, address, birth_date)
 - Валидация запросов и ответов через Pydantic
-- PostgreSQL + psycopg2
+- PostgreSQL + psycopg2 (или asyncpg при `DB_DRIVER=asyncpg`)
 - Готово для unit и e2e тестирования
 
 Проект используется для практики API-тестирования и CI.
 """,
+    lifespan=lifespan,
 )
-# Все эндпоинты /users — в роутере users
-app.include_router(users.router)
+# Все эндпоинты /users — в роутере users (sync, хранилище из USER_REPOSITORY) или users_async
+# (asyncpg); хранилище в памяти работает только через роутер users.
+# Лента изменений GET /users/changes (LISTEN/NOTIFY) — только с PostgreSQL, до роутера /users
+if get_settings().user_repository == "postgres":
+    app.include_router(user_changes.router)
+if get_settings().db_driver == "asyncpg" and get_settings().user_repository == "postgres":
+    app.include_router(users_async.router)
+else:
+    app.include_router(users.router)
+# Служебные /admin (пул, сброс кэша, журнал запросов) — только явно включённые
+if get_settings().admin_enabled:
+    app.include_router(admin.router)
+# Ошибки БД: занятый email → 409, перегрузка/недоступность → 503 с Retry-After
+register_error_handlers(app)
+# Сжатие ответов по Accept-Encoding (самый внутренний middleware: сжимает то, что отдал роутер)
+if get_settings().compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+# Сброс нагрузки: лимит запросов в обработке и ограниченная очередь (добавлен до метрик —
+# middleware метрик внешний и учитывает отказы 503)
+if get_settings().concurrency_limit:
+    app.add_middleware(ConcurrencyLimitMiddleware)
+# Метрики: middleware считает время/статусы по маршрутам, GET /metrics отдаёт их Prometheus
+if get_settings().metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
@@ -0,0 +1,238 @@
+"""
+Метрики приложения в формате Prometheus (text exposition 0.0.4) — без внешних зависимостей.
+
+- http_requests_total{method,route,status} — счётчик ответов;
+- http_request_duration_seconds{method,route} — гистограмма времени до начала ответа;
+- http_requests_in_flight — запросы в обработке;
+- http_requests_queued, http_requests_shed_total{reason} — очередь и отказы (503)
+  ограничителя конкурентности (src/app/limiter.py);
+- db_query_duration_seconds{statement} — гистограмма времени запросов к БД
+  (psycopg2 — курсор TimedDictCursor из deps, asyncpg — query logger на соединении);
+- db_pool_* — состояние пула psycopg2 на момент сбора.
+
+route — шаблон пути (/users/{user_id}), а не сам путь: число серий не растёт с числом id.
+Метрики — на процесс: при нескольких воркерах uvicorn каждый отдаёт свои.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from src.config.settings import get_settings
+from src.db.statements import statement_label
+
+# Границы бакетов гистограмм, сек (+Inf добавляется при выводе)
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+# Размер пачки group commit, запросов
+BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Метка route для запросов, не попавших ни в один маршрут (404 по произвольным путям)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    """Экранирование значения метки: \\, " и перевод строки."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    """Монотонный счётчик с метками."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.documentation, self.labelnames = name, documentation, labelnames
+        self._values: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: int = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """Значение, которое растёт и убывает (без меток)."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name, self.documentation = name, documentation
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        self.inc(-amount)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge",
+                f"{self.name} {self._value}"]
+
+
+class Histogram:
+    """Гистограмма с фиксированными бакетами: на observe — bisect и два сложения под lock."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...],
+                 buckets: tuple[float, ...]):
+        self.name, self.documentation, self.labelnames = name, documentation, labelnames
+        self.buckets = buckets
+        # labels → [счётчики по бакетам (последний — +Inf), сумма]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1])) for labels, s in self._series.items())
+        names = (*self.labelnames, "le")
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, (*labels, bound))} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP responses by method, route and status code.",
+    ("method", "route", "status"))
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "Time from request start to response start.",
+    ("method", "route"), HTTP_BUCKETS)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+HTTP_QUEUED = Gauge("http_requests_queued", "Requests waiting for a concurrency limiter slot.")
+HTTP_SHED = Counter(
+    "http_requests_shed_total", "Requests rejected with 503 by the concurrency limiter.",
+    ("reason",))
+DB_DURATION = Histogram(
+    "db_query_duration_seconds", "PostgreSQL query time by statement.",
+    ("statement",), DB_BUCKETS)
+GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "group_commit_batch_size", "POST /users requests inserted per group commit transaction.",
+    (), BATCH_BUCKETS)
+
+# Время в БД текущего запроса: [секунды, число запросов]. Список, а не число — чтобы
+# изменения из threadpool (sync-хендлеры) и колбэков asyncpg были видны middleware.
+_request_db_time: ContextVar[list | None] = ContextVar("request_db_time", default=None)
+
+
+def observe_db_query(sql: str, elapsed: float) -> None:
+    """Учесть запрос к БД: в гистограмме и во времени текущего HTTP-запроса (Server-Timing)."""
+    DB_DURATION.observe((statement_label(sql),), elapsed)
+    acc = _request_db_time.get()
+    if acc is not None:
+        acc[0] += elapsed
+        acc[1] += 1
+
+
+def log_asyncpg_query(record) -> None:
+    """Query logger для asyncpg (connection.add_query_logger)."""
+    observe_db_query(record.query, record.elapsed)
+
+
+def _pool_lines() -> list[str]:
+    """Состояние пула psycopg2 (для asyncpg — счётчики есть в GET /admin/pool)."""
+    if get_settings().db_driver != "psycopg2":
+        return []
+    from .deps import get_pool
+
+    stats = get_pool().stats()
+    lines = []
+    for field, kind in (("size", "gauge"), ("in_use", "gauge"), ("idle", "gauge"),
+                        ("waiting", "gauge"), ("waits", "counter"), ("timeouts", "counter")):
+        name = f"db_pool_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# TYPE {name} {kind}", f"{name} {getattr(stats, field)}"]
+    return lines
+
+
+def render_metrics() -> str:
+    """Все метрики процесса в текстовом формате Prometheus."""
+    lines = []
+    for metric in (HTTP_REQUESTS, HTTP_DURATION, HTTP_IN_FLIGHT, HTTP_QUEUED, HTTP_SHED,
+                   DB_DURATION, GROUP_COMMIT_BATCH_SIZE):
+        lines += metric.render()
+    lines += _pool_lines()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: время, статус и in-flight по маршрутам + заголовок Server-Timing
+    (SERVER_TIMING_ENABLED=true): app;dur=<мс до начала ответа>, db;dur=<мс в БД>.
+    Чистый ASGI, а не BaseHTTPMiddleware — без лишней задачи и копирования тела на запрос.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.server_timing = get_settings().server_timing_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        db_time = [0.0, 0]
+        token = _request_db_time.set(db_time)
+        status_code = 500
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code, started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - started
+                self._record(scope, status_code, elapsed)
+                started = None  # Ответ учтён
+                if self.server_timing:
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (
+                        b"server-timing",
+                        f"app;dur={elapsed * 1000:.2f}, "
+                        f'db;dur={db_time[0] * 1000:.2f};desc="{db_time[1]} queries"'.encode(),
+                    )]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_db_time.reset(token)
+            if started is not None:  # Ответ не начался (исключение) — учесть как 500
+                self._record(scope, status_code, time.perf_counter() - started)
+
+    @staticmethod
+    def _record(scope, status_code: int, elapsed: float) -> None:
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+        method = scope["method"]
+        HTTP_REQUESTS.inc((method, route_path, str(status_code)))
+        HTTP_DURATION.observe((method, route_path), elapsed)
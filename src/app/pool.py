@@ -0,0 +1,292 @@
+"""
+Пул подключений к PostgreSQL для приложения.
+
+Один пул на процесс: хендлеры берут соединение из пула и возвращают его обратно,
+вместо psycopg2.connect() + close() на каждый запрос.
+Поддерживает min/max размер, таймаут ожидания свободного соединения,
+максимальное время жизни соединения и health-check при выдаче.
+Health-check (SELECT 1 + ROLLBACK — два лишних round trip) выполняется только для соединений,
+простоявших в пуле дольше check_idle_after: недавно возвращённое соединение почти наверняка живо,
+а оборванное всё равно будет выброшено при возврате (putconn).
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeout(Exception):
+    """Не удалось получить соединение из пула за отведённое время (пул исчерпан)."""
+
+
+class PoolClosed(Exception):
+    """Пул закрыт — выдача соединений невозможна."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Снимок состояния пула — для подбора размера и мониторинга."""
+
+    min_size: int
+    max_size: int
+    size: int  # Всего открытых соединений (in_use + idle)
+    in_use: int
+    idle: int
+    waiting: int  # Потоков, ждущих соединение прямо сейчас
+    waits: int  # Сколько раз за всё время пришлось ждать свободное соединение
+    wait_time_total: float  # Суммарное время ожидания, сек
+    wait_time_max: float  # Максимальное время одного ожидания, сек
+    timeouts: int  # Сколько раз ожидание закончилось PoolTimeout
+    connections_created: int
+    connections_closed: int
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул psycopg2-соединений.
+
+    Использование:
+        pool = ConnectionPool(get_db_config(), min_size=1, max_size=10)
+        with pool.connection() as conn: ...
+    """
+
+    def __init__(
+            self,
+            conninfo: dict,
+            min_size: int = 1,
+            max_size: int = 10,
+            timeout: float = 5.0,
+            max_lifetime: float = 0.0,
+            check_on_checkout: bool = True,
+            check_idle_after: float = 30.0,
+            connection_factory=None,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self.conninfo = conninfo
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_on_checkout = check_on_checkout
+        self.check_idle_after = check_idle_after
+        self.connection_factory = connection_factory
+
+        self._cond = threading.Condition()
+        self._idle: deque = deque()  # (conn, created_at); берём с конца — «тёплые» соединения
+        self._created_at: dict[int, float] = {}  # id(conn) -> monotonic время создания
+        self._returned_at: dict[int, float] = {}  # id(conn) -> когда соединение вернули в пул
+        self._size = 0
+        self._closed = False
+
+        self._waiting = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._connections_created = 0
+        self._connections_closed = 0
+
+    # --- жизненный цикл пула ---
+
+    def open(self) -> None:
+        """Прогрев: открыть min_size соединений заранее (вызывается на старте приложения)."""
+        with self._cond:
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._returned_at[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+                self._cond.notify()
+
+    def close(self) -> None:
+        """Закрыть все свободные соединения; занятые закроются при возврате."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_conn(conn)
+
+    # --- выдача и возврат ---
+
+    def getconn(self, timeout: float | None = None):
+        """Взять соединение из пула. Ждёт не дольше timeout, иначе PoolTimeout."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosed("Connection pool is closed")
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    # Все соединения заняты — ждём возврата
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + timeout
+                        self._waits += 1
+                        wait_started = now
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._record_wait(time.monotonic() - wait_started)
+                        raise PoolTimeout(
+                            f"Could not get a connection from the pool within {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if deadline is not None:
+                    self._record_wait(time.monotonic() - wait_started)
+                    deadline = None
+
+            if conn is None:
+                # Слот зарезервирован — открываем новое соединение вне блокировки
+                try:
+                    return self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            if self._is_expired(conn) or (self._needs_check(conn) and not self._is_alive(conn)):
+                self._discard(conn)
+                continue
+            return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Вернуть соединение в пул. Незавершённая транзакция откатывается."""
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        if discard or conn.closed or self._is_expired(conn):
+            self._discard(conn)
+            return
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                closed = True
+            else:
+                self._returned_at[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+                closed = False
+            self._cond.notify()
+        if closed:
+            self._close_conn(conn)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None):
+        """Контекстный менеджер: with pool.connection() as conn: ..."""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            # putconn сам откатит незавершённую транзакцию и выбросит битое соединение
+            self.putconn(conn)
+
+    def stats(self) -> PoolStats:
+        """Текущие счётчики пула."""
+        with self._cond:
+            idle = len(self._idle)
+            return PoolStats(
+                min_size=self.min_size,
+                max_size=self.max_size,
+                size=self._size,
+                in_use=self._size - idle,
+                idle=idle,
+                waiting=self._waiting,
+                waits=self._waits,
+                wait_time_total=round(self._wait_time_total, 6),
+                wait_time_max=round(self._wait_time_max, 6),
+                timeouts=self._timeouts,
+                connections_created=self._connections_created,
+                connections_closed=self._connections_closed,
+            )
+
+    # --- внутреннее ---
+
+    def _connect(self):
+        kwargs = dict(self.conninfo)
+        if self.connection_factory is not None:
+            kwargs["connection_factory"] = self.connection_factory
+        conn = psycopg2.connect(**kwargs)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._connections_created += 1
+        return conn
+
+    def _record_wait(self, waited: float) -> None:
+        # Вызывается под self._cond
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+    def _is_expired(self, conn) -> bool:
+        if self.max_lifetime <= 0:
+            return False
+        created = self._created_at.get(id(conn))
+        return created is not None and time.monotonic() - created > self.max_lifetime
+
+    def _needs_check(self, conn) -> bool:
+        """Проверять при выдаче только соединения, простоявшие без дела дольше check_idle_after."""
+        if not self.check_on_checkout:
+            return False
+        returned = self._returned_at.get(id(conn))
+        return returned is None or time.monotonic() - returned >= self.check_idle_after
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        """Health-check: соединение не закрыто и сервер отвечает на SELECT 1."""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn) -> None:
+        self._close_conn(conn)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _close_conn(self, conn) -> None:
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._returned_at.pop(id(conn), None)
+            self._connections_closed += 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
@@ -0,0 +1,466 @@
+"""
+Хранилище пользователей для роутера /users (USER_REPOSITORY).
+
+UserRepository — операции с users, которые нужны эндпоинтам; роутер получает реализацию
+через Depends(get_user_repository):
+- postgres — PostgreSQL через пул psycopg2 (PREPARE-запросы из src/db/statements.py);
+- memory — в памяти процесса: индекс по id, уникальный индекс по email и индекс по lower(email),
+  строки хранятся кортежами. Без БД: замер накладных расходов фреймворка и сериализации,
+  быстрые тесты без PostgreSQL. Данные живут до перезапуска и у каждого воркера свои.
+Строки наружу — dict с колонками USER_COLUMNS, как из RealDictCursor: сериализация, ETag
+и кэш одинаковы для обоих вариантов. Асинхронный роутер (DB_DRIVER=asyncpg) работает
+с PostgreSQL напрямую.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+
+from psycopg2.extras import execute_values
+
+from src.config.settings import get_settings
+from src.db.statements import (
+    CLAIM_IDEMPOTENCY_KEY,
+    DELETE_USER,
+    DELETE_USER_IF_MATCH,
+    DELETE_USERS_BY_IDS,
+    GET_IDEMPOTENT_RESPONSE,
+    GET_USER_BY_EMAIL,
+    GET_USER_BY_ID,
+    GET_USERS_BY_EMAILS,
+    GET_USERS_BY_IDS,
+    INSERT_USER,
+    INSERT_USERS_VALUES_SQL,
+    PURGE_IDEMPOTENCY_KEYS,
+    SAVE_IDEMPOTENT_RESPONSE,
+    UPDATE_USER,
+    UPDATE_USER_IF_MATCH,
+    USER_COLUMNS,
+    USER_WRITABLE_FIELDS,
+    UserListFilters,
+    build_list_query,
+    execute,
+    patch_statement,
+    psycopg2_placeholder,
+)
+
+from .deps import get_db_connection, get_db_cursor
+from .etag import user_etag
+from .idempotency import PURGE_BATCH_SIZE
+from .schemas import UserCreate, UserUpdate
+from .serialization import dump_user
+
+# Ответ 201 для Idempotency-Key: сохраняется вместе с пользователем
+IDEMPOTENT_STATUS = 201
+
+
+class DuplicateEmailError(Exception):
+    """Email уже занят (memory). errors.py отвечает 409, как на UniqueViolation PostgreSQL."""
+
+    constraint_name = "users_email_key"
+
+
+class UserRepository(ABC):
+    """Операции с пользователями для роутера /users. versions — версии из If-Match (None — все)."""
+
+    @abstractmethod
+    def get(self, user_id: int) -> dict | None: ...
+
+    @abstractmethod
+    def get_many(self, ids: list[int]) -> list[dict]:
+        """Найденные пользователи по возрастанию id."""
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> dict | None:
+        """Без учёта регистра; при нескольких совпадениях — точное совпадение первым."""
+
+    @abstractmethod
+    def get_by_emails(self, emails: list[str]) -> list[dict]: ...
+
+    @abstractmethod
+    def list_page(self, filters: UserListFilters, limit: int | None) -> list[dict]:
+        """Страница по возрастанию id (keyset: filters.after)."""
+
+    @abstractmethod
+    def export(self, filters: UserListFilters, limit: int | None,
+               chunk_size: int) -> Iterator[list[dict]]:
+        """Все подходящие строки порциями по chunk_size (NDJSON-выгрузка)."""
+
+    @abstractmethod
+    def create(self, payload: UserCreate) -> dict:
+        """Новый пользователь; занятый email — исключение, которое errors.py превращает в 409."""
+
+    @abstractmethod
+    def create_many(self, payloads: list[UserCreate]) -> list[dict]:
+        """Вставить всех, кроме занятых email, одной транзакцией; вернуть вставленные строки."""
+
+    @abstractmethod
+    def create_idempotent(self, payload: UserCreate, key: str, fingerprint: bytes,
+                          ttl: float) -> tuple[dict | None, bool]:
+        """
+        Создание с Idempotency-Key: (запись idempotency_keys, повтор ли это).
+        Ключ занят — сохранённая запись (None, если она пропала) и True, пользователь не создаётся.
+        """
+
+    @abstractmethod
+    def replace(self, user_id: int, payload: UserUpdate, versions: list[int] | None) -> dict | None:
+        """PUT. None — пользователя нет или версия не совпала."""
+
+    @abstractmethod
+    def patch(self, user_id: int, data: dict, versions: list[int] | None) -> dict | None:
+        """PATCH изменённых полей data. None — пользователя нет или версия не совпала."""
+
+    @abstractmethod
+    def delete(self, user_id: int, versions: list[int] | None) -> bool: ...
+
+    @abstractmethod
+    def delete_many(self, ids: list[int]) -> set[int]:
+        """Удалённые id."""
+
+
+class PostgresUserRepository(UserRepository):
+    """PostgreSQL: соединение из пула psycopg2 на операцию, транзакция — на операцию."""
+
+    def _fetch(self, statement, params) -> list[dict]:
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                execute(cur, statement, params)
+                return cur.fetchall()
+
+    def _write(self, statement, params) -> dict | None:
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                execute(cur, statement, params)
+                row = cur.fetchone()
+
+            conn.commit()
+
+        return row
+
+    def get(self, user_id: int) -> dict | None:
+        rows = self._fetch(GET_USER_BY_ID, (user_id,))
+        return rows[0] if rows else None
+
+    def get_many(self, ids: list[int]) -> list[dict]:
+        return self._fetch(GET_USERS_BY_IDS, (ids,))
+
+    def get_by_email(self, email: str) -> dict | None:
+        rows = self._fetch(GET_USER_BY_EMAIL, (email,))
+        return rows[0] if rows else None
+
+    def get_by_emails(self, emails: list[str]) -> list[dict]:
+        return self._fetch(GET_USERS_BY_EMAILS, (emails,))
+
+    def list_page(self, filters: UserListFilters, limit: int | None) -> list[dict]:
+        sql, params = build_list_query(filters, limit, psycopg2_placeholder)
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                cur.execute(sql, params)
+                return cur.fetchall()
+
+    def export(self, filters: UserListFilters, limit: int | None,
+               chunk_size: int) -> Iterator[list[dict]]:
+        # Именованный (серверный) курсор: соединение из пула держится до конца выгрузки
+        sql, params = build_list_query(filters, limit, psycopg2_placeholder)
+        with get_db_connection() as conn:
+            with get_db_cursor(conn, name="users_export") as cur:
+                cur.itersize = chunk_size
+                cur.execute(sql, params)
+                while rows := cur.fetchmany(chunk_size):
+                    yield rows
+
+    def create(self, payload: UserCreate) -> dict:
+        # Занятый email — UniqueViolation, его и ошибки перегрузки БД переводит в 409/503 errors.py
+        return self._write(INSERT_USER, _insert_params(payload))
+
+    def create_many(self, payloads: list[UserCreate]) -> list[dict]:
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                rows = execute_values(
+                    cur,
+                    INSERT_USERS_VALUES_SQL,
+                    [_insert_params(p) for p in payloads],
+                    page_size=len(payloads),  # Один statement на весь batch
+                    fetch=True,
+                )
+
+            conn.commit()
+
+        return rows
+
+    def create_idempotent(self, payload: UserCreate, key: str, fingerprint: bytes,
+                          ttl: float) -> tuple[dict | None, bool]:
+        # Ключ, пользователь и сохранённый ответ — одна транзакция (src/app/idempotency.py)
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                execute(cur, PURGE_IDEMPOTENCY_KEYS, (PURGE_BATCH_SIZE,))
+                execute(cur, CLAIM_IDEMPOTENCY_KEY, (key, fingerprint, ttl))
+                if cur.fetchone() is None:
+                    # Ключ уже занят (если параллельно — CLAIM дождался коммита первого запроса)
+                    execute(cur, GET_IDEMPOTENT_RESPONSE, (key,))
+                    record = cur.fetchone()
+                    conn.commit()
+                    return record, True
+
+                execute(cur, INSERT_USER, _insert_params(payload))
+                record = _idempotent_record(cur.fetchone(), fingerprint)
+                execute(cur, SAVE_IDEMPOTENT_RESPONSE,
+                        (key, record["status_code"], record["response_body"], record["etag"]))
+
+            conn.commit()
+
+        return record, False
+
+    def replace(self, user_id: int, payload: UserUpdate, versions: list[int] | None) -> dict | None:
+        params = (*_insert_params(payload), user_id)
+        if versions is None:
+            return self._write(UPDATE_USER, params)
+        return self._write(UPDATE_USER_IF_MATCH, (*params, versions))
+
+    def patch(self, user_id: int, data: dict, versions: list[int] | None) -> dict | None:
+        # Готовый вариант UPDATE под набор изменённых полей (без сборки SQL на каждый запрос)
+        statement, values = patch_statement(data, if_match=versions is not None)
+        params = (*values, user_id) if versions is None else (*values, user_id, versions)
+        return self._write(statement, params)
+
+    def delete(self, user_id: int, versions: list[int] | None) -> bool:
+        if versions is None:
+            return self._write(DELETE_USER, (user_id,)) is not None
+        return self._write(DELETE_USER_IF_MATCH, (user_id, versions)) is not None
+
+    def delete_many(self, ids: list[int]) -> set[int]:
+        with get_db_connection() as conn:
+            with get_db_cursor(conn) as cur:
+                execute(cur, DELETE_USERS_BY_IDS, (ids,))
+                deleted = {row["id"] for row in cur.fetchall()}
+
+            conn.commit()
+
+        return deleted
+
+
+# Порядок полей в кортеже строки MemoryUserRepository — как в USER_COLUMNS
+_COLUMNS = tuple(USER_COLUMNS.split(", "))
+_ID, _EMAIL, _CREATED_AT, _VERSION = (
+    _COLUMNS.index(c) for c in ("id", "email", "created_at", "version"))
+
+
+class MemoryUserRepository(UserRepository):
+    """
+    В памяти процесса, под одним lock. Строка — кортеж в порядке USER_COLUMNS (dict создаётся
+    только на выдачу). id растут, поэтому отсортированный список id — индекс для keyset-пагинации.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: dict[int, tuple] = {}
+        self._ids: list[int] = []
+        self._by_email: dict[str, int] = {}  # Как UNIQUE users_email_key
+        self._by_email_lower: dict[str, set[int]] = {}  # Как users_email_lower_idx
+        self._next_id = 1
+        self._idempotency: dict[str, dict] = {}
+
+    def get(self, user_id: int) -> dict | None:
+        row = self._rows.get(user_id)
+        return _as_dict(row) if row is not None else None
+
+    def get_many(self, ids: list[int]) -> list[dict]:
+        with self._lock:
+            return [_as_dict(self._rows[i]) for i in sorted(set(ids)) if i in self._rows]
+
+    def get_by_email(self, email: str) -> dict | None:
+        with self._lock:
+            exact = self._by_email.get(email)
+            ids = self._by_email_lower.get(email.lower())
+            user_id = exact if exact is not None else (min(ids) if ids else None)
+            return _as_dict(self._rows[user_id]) if user_id is not None else None
+
+    def get_by_emails(self, emails: list[str]) -> list[dict]:
+        with self._lock:
+            ids = set().union(*(self._by_email_lower.get(e.lower(), ()) for e in emails))
+            return [_as_dict(self._rows[i]) for i in sorted(ids)]
+
+    def list_page(self, filters: UserListFilters, limit: int | None) -> list[dict]:
+        with self._lock:
+            return [_as_dict(row) for row in self._scan(filters.after, filters, limit)]
+
+    def export(self, filters: UserListFilters, limit: int | None,
+               chunk_size: int) -> Iterator[list[dict]]:
+        # Порциями, lock — только на время чтения порции (как fetchmany серверного курсора)
+        after, remaining = filters.after, limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            with self._lock:
+                rows = self._scan(after, filters, size)
+            if not rows:
+                return
+            yield [_as_dict(row) for row in rows]
+            after = rows[-1][_ID]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def _scan(self, after: int | None, filters: UserListFilters, limit: int | None) -> list[tuple]:
+        """Строки по возрастанию id после after, подходящие под фильтры (не больше limit)."""
+        start = bisect_right(self._ids, after) if after is not None else 0
+        prefix = filters.email_prefix
+        created_from = filters.created_from  # Уже naive UTC (UserListFilters)
+        created_to = filters.created_to
+        rows = []
+        for user_id in self._ids[start:]:
+            if limit is not None and len(rows) >= limit:
+                break
+            row = self._rows[user_id]
+            if prefix and not row[_EMAIL].startswith(prefix):
+                continue
+            if created_from is not None and row[_CREATED_AT] < created_from:
+                continue
+            if created_to is not None and row[_CREATED_AT] >= created_to:
+                continue
+            rows.append(row)
+        return rows
+
+    def create(self, payload: UserCreate) -> dict:
+        with self._lock:
+            return _as_dict(self._insert(payload))
+
+    def create_many(self, payloads: list[UserCreate]) -> list[dict]:
+        rows = []
+        with self._lock:
+            for payload in payloads:
+                if payload.email not in self._by_email:  # Как ON CONFLICT (email) DO NOTHING
+                    rows.append(_as_dict(self._insert(payload)))
+        return rows
+
+    def create_idempotent(self, payload: UserCreate, key: str, fingerprint: bytes,
+                          ttl: float) -> tuple[dict | None, bool]:
+        with self._lock:
+            now = datetime.now()
+            self._purge_idempotency(now)
+            record = self._idempotency.get(key)
+            if record is not None and record["expires_at"] > now:
+                return record, True
+            record = _idempotent_record(_as_dict(self._insert(payload)), fingerprint)
+            record["expires_at"] = now + timedelta(seconds=ttl)
+            self._idempotency.pop(key, None)  # Истёкший ключ — в конец, к новым
+            self._idempotency[key] = record
+            return record, False
+
+    def _purge_idempotency(self, now: datetime) -> None:
+        """
+        Как PURGE_IDEMPOTENCY_KEYS: до PURGE_BATCH_SIZE истёкших ключей за запрос с ключом.
+        TTL у всех ключей один, поэтому порядок dict (порядок создания) — порядок истечения.
+        """
+        for key in list(islice(self._idempotency, PURGE_BATCH_SIZE)):
+            if self._idempotency[key]["expires_at"] > now:
+                break
+            del self._idempotency[key]
+
+    def replace(self, user_id: int, payload: UserUpdate, versions: list[int] | None) -> dict | None:
+        data = {field: getattr(payload, field) for field in USER_WRITABLE_FIELDS}
+        return self.patch(user_id, data, versions)
+
+    def patch(self, user_id: int, data: dict, versions: list[int] | None) -> dict | None:
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None or (versions is not None and row[_VERSION] not in versions):
+                return None
+            values = list(row)
+            for field, value in data.items():
+                values[_COLUMNS.index(field)] = _stored(field, value)
+            values[_VERSION] += 1
+            email = values[_EMAIL]
+            if email != row[_EMAIL]:
+                if email in self._by_email:
+                    raise DuplicateEmailError(email)
+                self._unindex(row)
+                self._index(user_id, email)
+            new_row = self._rows[user_id] = tuple(values)
+            return _as_dict(new_row)
+
+    def delete(self, user_id: int, versions: list[int] | None) -> bool:
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None or (versions is not None and row[_VERSION] not in versions):
+                return False
+            self._remove(row)
+            return True
+
+    def delete_many(self, ids: list[int]) -> set[int]:
+        deleted = set()
+        with self._lock:
+            for user_id in ids:
+                row = self._rows.get(user_id)
+                if row is not None:
+                    self._remove(row)
+                    deleted.add(user_id)
+        return deleted
+
+    def _insert(self, payload: UserCreate) -> tuple:
+        if payload.email in self._by_email:
+            raise DuplicateEmailError(payload.email)
+        user_id, self._next_id = self._next_id, self._next_id + 1
+        values = dict(zip(USER_WRITABLE_FIELDS, _insert_params(payload)))
+        row = tuple(
+            user_id if c == "id" else _utcnow() if c == "created_at" else 1 if c == "version"
+            else _stored(c, values[c])
+            for c in _COLUMNS
+        )
+        self._rows[user_id] = row
+        self._ids.append(user_id)
+        self._index(user_id, payload.email)
+        return row
+
+    def _index(self, user_id: int, email: str) -> None:
+        self._by_email[email] = user_id
+        self._by_email_lower.setdefault(email.lower(), set()).add(user_id)
+
+    def _unindex(self, row: tuple) -> None:
+        email = row[_EMAIL]
+        del self._by_email[email]
+        ids = self._by_email_lower[email.lower()]
+        ids.discard(row[_ID])
+        if not ids:
+            del self._by_email_lower[email.lower()]
+
+    def _remove(self, row: tuple) -> None:
+        self._unindex(row)
+        del self._rows[row[_ID]]
+        del self._ids[bisect_left(self._ids, row[_ID])]
+
+
+def _insert_params(payload: UserCreate | UserUpdate) -> tuple:
+    return payload.email, payload.name, payload.phone, payload.address, payload.birth_date
+
+
+def _idempotent_record(row: dict, fingerprint: bytes) -> dict:
+    """Запись idempotency_keys для только что созданного пользователя."""
+    return {"fingerprint": fingerprint, "status_code": IDEMPOTENT_STATUS,
+            "response_body": dump_user(row), "etag": user_etag(row)}
+
+
+def _as_dict(row: tuple) -> dict:
+    return dict(zip(_COLUMNS, row))
+
+
+def _stored(field: str, value):
+    """Значение так, как его вернул бы PostgreSQL: birth_date — DATE."""
+    if field == "birth_date" and isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _utcnow() -> datetime:
+    """created_at новой строки — naive UTC, как now() в БД (timezone UTC) и фильтры UserListFilters."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache
+def get_user_repository() -> UserRepository:
+    """Хранилище процесса (USER_REPOSITORY) — зависимость FastAPI для роутера /users."""
+    if get_settings().user_repository == "memory":
+        return MemoryUserRepository()
+    return PostgresUserRepository()
@@ -0,0 +1,97 @@
+"""
+Роутер /admin — служебные эндпоинты для мониторинга и подбора настроек.
+Подключается при ADMIN_ENABLED=true; при ADMIN_TOKEN — только с Bearer-токеном (admin_auth.py).
+
+- GET /admin/pool — статистика пула подключений к PostgreSQL
+- GET /admin/cache — счётчики кэша пользователей (hits/misses/evictions)
+- DELETE /admin/cache — очистить кэш пользователей
+- GET /admin/slow-queries — журнал медленных запросов (с планами EXPLAIN)
+- DELETE /admin/slow-queries — очистить журнал
+"""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, status
+
+from src.config.settings import get_settings
+
+from ..admin_auth import require_admin_token
+from ..async_deps import get_async_pool
+from ..cache import get_user_cache
+from ..deps import get_pool
+from ..slow_queries import get_slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/pool")
+def pool_stats() -> dict:
+    """
+    GET /admin/pool
+
+    Счётчики пула: размер, занятые/свободные соединения, ожидания и время ожидания.
+    Для DB_DRIVER=asyncpg — только размеры пула asyncpg (он не ведёт счётчики ожиданий).
+    """
+    if get_settings().db_driver == "asyncpg":
+        pool = get_async_pool()
+        if pool is None:
+            return {"size": 0, "in_use": 0, "idle": 0}
+        size, idle = pool.get_size(), pool.get_idle_size()
+        return {
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+        }
+    return asdict(get_pool().stats())
+
+
+@router.get("/cache")
+def cache_stats() -> dict:
+    """
+    GET /admin/cache
+
+    Счётчики кэша GET /users/{id}: hits, misses, evictions, expirations, size.
+    Если кэш выключен — {"enabled": false}.
+    """
+    cache = get_user_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **asdict(cache.stats())}
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_cache() -> None:
+    """DELETE /admin/cache — сбросить все записи кэша пользователей."""
+    cache = get_user_cache()
+    if cache is not None:
+        cache.clear()
+
+
+@router.get("/slow-queries")
+def slow_queries() -> dict:
+    """
+    GET /admin/slow-queries
+
+    Последние запросы к БД дольше SLOW_QUERY_THRESHOLD, новые первыми: метка, длительность,
+    SQL, типы параметров (без значений) и план EXPLAIN для выборки запросов.
+    Если журнал выключен — {"enabled": false}.
+    """
+    slow_query_log = get_slow_query_log()
+    if slow_query_log is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "threshold": slow_query_log.threshold,
+        "explain_sample_rate": slow_query_log.explain_sample_rate,
+        "queries": slow_query_log.entries(),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries() -> None:
+    """DELETE /admin/slow-queries — очистить журнал медленных запросов."""
+    slow_query_log = get_slow_query_log()
+    if slow_query_log is not None:
+        slow_query_log.clear()
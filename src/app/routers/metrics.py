@@ -0,0 +1,17 @@
+"""
+Роутер /metrics — метрики процесса в текстовом формате Prometheus (см. src/app/metrics.py).
+Подключается при METRICS_ENABLED=true; при ADMIN_TOKEN — только с Bearer-токеном (admin_auth.py).
+"""
+
+from fastapi import APIRouter, Depends, Response
+
+from ..admin_auth import require_admin_token
+from ..metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """GET /metrics — счётчики и гистограммы HTTP и БД для Prometheus."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,38 @@
+"""
+Роутер GET /users/changes — лента изменений пользователей (Server-Sent Events).
+
+Один и тот же для DB_DRIVER=psycopg2 и asyncpg: LISTEN держит отдельное соединение asyncpg
+(src/app/changes.py). Подключается раньше роутера /users, иначе путь совпал бы с /users/{id}.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ..changes import get_change_feed, stream_changes
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def user_changes(
+    after: Annotated[int | None, Query(ge=0)] = None,
+    last_event_id: Annotated[int | None, Header(ge=0)] = None,
+) -> StreamingResponse:
+    """
+    GET /users/changes
+
+    Поток text/event-stream: на каждый INSERT/UPDATE/DELETE в users — событие
+    id: <номер события>, data: {"id", "op", "user_id", "version", "changed_at"}.
+    Продолжить с места разрыва — заголовок Last-Event-ID (EventSource передаёт его сам)
+    или ?after=<id>: сначала придут пропущенные события, затем живой поток.
+    Без них — только новые события. Раз в USER_CHANGES_KEEPALIVE сек — комментарий keepalive.
+    """
+    feed = get_change_feed()
+    queue = await feed.subscribe()  # До ответа: ошибка подключения к БД — 503, а не обрыв потока
+    return StreamingResponse(
+        stream_changes(feed, queue, last_event_id if last_event_id is not None else after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
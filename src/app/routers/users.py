@@ -2,52 +2,236 @@
 Роутер /users.
 
 CRUD для пользователей:
+- GET    /users           — список с keyset-пагинацией и фильтрами (JSON или NDJSON-поток)
 - GET    /users/{id}      — получить пользователя
-- POST   /users           — создать пользователя
+- GET    /users/by-email/{email} — получить пользователя по email (без учёта регистра)
+- POST   /users           — создать пользователя (Idempotency-Key — безопасные повторы)
 - PUT    /users/{id}      — полное обновление
 - PATCH  /users/{id}      — частичное обновление
 - DELETE /users/{id}      — удалить пользователя
 
-Реализация СИНХРОННАЯ, т.к. используется psycopg2.
+Batch-операции (один SQL-запрос и одна транзакция на весь список):
+- POST   /users/batch     — создать много пользователей (результат/409 по каждому элементу)
+- GET    /users?ids=...   — получить пользователей по списку id
+- GET    /users/by-email?emails=... — получить пользователей по списку email
+- DELETE /users/batch     — удалить пользователей по списку id
+
+Реализация СИНХРОННАЯ, т.к. используется psycopg2. SQL — в src/app/repository.py:
+хендлеры получают хранилище через Depends (USER_REPOSITORY=memory — без PostgreSQL).
+Асинхронная альтернатива на asyncpg — routers/users_async.py (включается DB_DRIVER=asyncpg).
 """
 
-from fastapi import APIRouter, HTTPException, status
+from collections.abc import Iterator
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from src.config.settings import get_settings
+from src.db.statements import UserListFilters
 
-from ..deps import get_db_connection, get_db_cursor
+from ..batch import build_batch_create_response
+from ..cache import CachedUser, get_user_cache, invalidate_users
+from ..etag import etag_matches, if_match_versions, missing_user_error, user_etag
+from ..group_commit import GroupCommitter
+from ..idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, replay_response, request_fingerprint
+from ..repository import UserRepository, get_user_repository
 from ..schemas import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_USER_ID,
+    NDJSON_MEDIA_TYPE,
+    UserBatchCreate,
+    UserBatchCreateResponse,
+    UserBatchDelete,
+    UserBatchDeleteResponse,
     UserCreate,
+    UserId,
+    UserList,
     UserUpdate,
     UserPatch,
     UserResponse,
 )
+from ..serialization import JSON_MEDIA_TYPE, dump_user, user_list_response, user_result
+
+# Хранилище пользователей (USER_REPOSITORY): PostgreSQL или память процесса
+Repository = Annotated[UserRepository, Depends(get_user_repository)]
+# id из пути: вне 1..MAX_USER_ID — 422 (см. schemas.MAX_USER_ID)
+UserIdPath = Annotated[int, Path(ge=1, le=MAX_USER_ID)]
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+# Batch-эндпоинты объявлены до /{user_id}, иначе DELETE /users/batch попадёт в delete_user
+
+
+@router.post("/batch", response_model=UserBatchCreateResponse)
+def create_users_batch(payload: UserBatchCreate, repo: Repository):
+    """
+    POST /users/batch
+
+    Создаёт пользователей одним multi-row INSERT в одной транзакции.
+    Занятые email не роняют весь batch: такие элементы получают status 409 в items.
+    """
+    return build_batch_create_response(payload.users, repo.create_many(payload.users))
+
+
+@lru_cache
+def _group_committer() -> GroupCommitter | None:
+    """Group commit для POST /users (src/app/group_commit.py) или None, если он выключен."""
+    s = get_settings()
+    if not s.group_commit_enabled:
+        return None
+    return GroupCommitter(get_user_repository().create_many, s.group_commit_max_batch,
+                          s.group_commit_max_wait)
+
+
+@router.get("", response_model=UserList)
+def list_users(
+        request: Request,
+        repo: Repository,
+        ids: Annotated[list[UserId] | None, Query(max_length=MAX_BATCH_SIZE)] = None,
+        limit: Annotated[int | None, Query(ge=1)] = None,
+        after: Annotated[int | None, Query(ge=0, le=MAX_USER_ID)] = None,
+        email_prefix: Annotated[str | None, Query(max_length=255)] = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        format: Literal["json", "ndjson"] = "json",
+):
+    """
+    GET /users
+
+    - ?ids=1&ids=2 — пользователи по списку id (отсутствующие пропускаются), по возрастанию id.
+    - Иначе — страница списка по возрастанию id с keyset-пагинацией: ?after=<next_cursor>,
+      limit (по умолчанию 100, максимум 1000) и фильтры email_prefix, created_from, created_to.
+    - ?format=ndjson (или Accept: application/x-ndjson) — потоковая выгрузка всех подходящих
+      строк через серверный курсор, по одной JSON-строке на пользователя; память не растёт
+      с размером выборки. limit в этом режиме применяется, только если передан явно.
+    """
+    if ids:
+        rows = repo.get_many(ids)
+        if get_settings().fast_responses:
+            return user_list_response(rows)
+        return {"items": rows}
+
+    filters = UserListFilters(after, email_prefix, created_from, created_to)
+
+    if format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(_export_users(repo, filters, limit), media_type=NDJSON_MEDIA_TYPE)
+
+    page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    # Берём на одну строку больше, чтобы узнать, есть ли следующая страница
+    rows = repo.list_page(filters, page_size + 1)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = rows[-1]["id"] if has_more else None
+    if get_settings().fast_responses:
+        return user_list_response(rows, next_cursor)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def _export_users(repo: UserRepository, filters: UserListFilters,
+                  limit: int | None) -> Iterator[bytes]:
+    """
+    Генератор NDJSON: строки читаются порциями users_export_fetch_size (в PostgreSQL —
+    именованным серверным курсором, соединение из пула держится до конца выгрузки).
+    """
+    s = get_settings()
+    dump = dump_user if s.fast_responses else _validate_and_dump
+    for rows in repo.export(filters, limit, s.users_export_fetch_size):
+        yield b"".join(dump(row) + b"\n" for row in rows)
+
+
+def _validate_and_dump(row: dict) -> bytes:
+    return UserResponse.model_validate(row).model_dump_json().encode()
+
+
+@router.delete("/batch", response_model=UserBatchDeleteResponse)
+def delete_users_batch(payload: UserBatchDelete, repo: Repository):
+    """
+    DELETE /users/batch
+
+    Удаляет пользователей по списку id одним DELETE.
+    Возвращает удалённые id и id, которых не было в БД.
+    """
+    deleted = repo.delete_many(payload.ids)
+    invalidate_users(*deleted)
+
+    requested = list(dict.fromkeys(payload.ids))
+    return {
+        "deleted": [i for i in requested if i in deleted],
+        "not_found": [i for i in requested if i not in deleted],
+    }
+
+
+@router.get("/by-email", response_model=UserList)
+def get_users_by_emails(
+        emails: Annotated[list[str], Query(min_length=1, max_length=MAX_BATCH_SIZE)],
+        repo: Repository,
+):
+    """
+    GET /users/by-email?emails=a@x.com&emails=b@x.com
+
+    Пользователи по списку email без учёта регистра, одним запросом по индексу lower(email).
+    Ненайденные пропускаются; порядок — по возрастанию id.
+    """
+    rows = repo.get_by_emails(emails)
+    if get_settings().fast_responses:
+        return user_list_response(rows)
+    return {"items": rows}
+
+
+@router.get("/by-email/{email}", response_model=UserResponse)
+def get_user_by_email(email: Annotated[str, Path(max_length=255)], response: Response,
+                      repo: Repository):
+    """
+    GET /users/by-email/{email}
+
+    Пользователь по email без учёта регистра (индекс lower(email)); если есть адреса,
+    различающиеся только регистром, — точное совпадение. Не найден — 404. Ответ содержит ETag.
+    """
+    row = repo.get_by_email(email)
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user_result(row, response)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int):
+def get_user(
+        user_id: UserIdPath,
+        response: Response,
+        repo: Repository,
+        if_none_match: Annotated[str | None, Header()] = None,
+):
     """
     GET /users/{user_id}
 
     Возвращает пользователя по id.
     Если не найден — 404.
+    Ответ содержит ETag; при совпадении с If-None-Match — 304 без тела.
+    Читает через кэш (если включён), промах — SELECT и запись в кэш.
     """
-    with get_db_connection() as conn:
-        with get_db_cursor(conn) as cur:
-            cur.execute(
-                """
-                SELECT id, email, name, created_at, phone, address, birth_date
-                FROM users
-                WHERE id = %s;
-                """,
-                (user_id,),
-            )
-            row = cur.fetchone()
-    
-    if not row:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return row
+    cache = get_user_cache()
+    entry = cache.get(user_id) if cache is not None else None
+
+    if entry is None:
+        row = repo.get(user_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        entry = CachedUser(row=row, etag=user_etag(row))
+        if cache is not None:
+            cache.set(user_id, entry)
+
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+
+    return user_result(entry.row, response)
 
 
 @router.post(
@@ -55,81 +239,87 @@ def get_user(user_id: int):
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_user(payload: UserCreate):
+def create_user(
+        payload: UserCreate,
+        response: Response,
+        repo: Repository,
+        idempotency_key: Annotated[
+            str | None, Header(min_length=1, max_length=IDEMPOTENCY_KEY_MAX_LENGTH)] = None,
+):
     """
     POST /users
 
     Создаёт нового пользователя.
     Email должен быть уникальным.
+    Ответ содержит ETag (версия 1).
+    Idempotency-Key — повтор с тем же ключом возвращает исходный ответ 201
+    (заголовок Idempotent-Replayed), а не 409; тот же ключ с другим телом — 422.
+    GROUP_COMMIT_ENABLED — вставка вместе с параллельными запросами одной транзакцией.
     """
-    with get_db_connection() as conn:
-        with get_db_cursor(conn) as cur:
-            try:
-                cur.execute(
-                    """
-                    INSERT INTO users (email, name, phone, address, birth_date)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id, email, name, created_at, phone, address, birth_date;
-                    """,
-                    (payload.email, payload.name, payload.phone, payload.address,
-                     payload.birth_date),
-                )
-                row = cur.fetchone()
-            except Exception:
-                # Обычно здесь ловят UniqueViolation,
-                # но тип исключения зависит от настроек psycopg2
-                raise HTTPException(
-                    status_code=409,
-                    detail="User with this email already exists",
-                )
-        
-        conn.commit()
-    
-    return row
+    if idempotency_key is not None:
+        return _create_user_idempotent(repo, payload, idempotency_key)
+
+    committer = _group_committer()
+    if committer is not None:
+        row = committer.submit(payload)
+    else:
+        # Занятый email и ошибки перегрузки БД переводит в 409/503 errors.py
+        row = repo.create(payload)
+
+    return user_result(row, response, status_code=status.HTTP_201_CREATED)
+
+
+def _create_user_idempotent(repo: UserRepository, payload: UserCreate, key: str) -> Response:
+    """POST /users с Idempotency-Key: ключ, пользователь и сохранённый ответ — одна транзакция."""
+    fingerprint = request_fingerprint(payload)
+    record, replayed = repo.create_idempotent(
+        payload, key, fingerprint, get_settings().idempotency_key_ttl)
+    if replayed:
+        return replay_response(record, fingerprint)
+    return Response(record["response_body"], status_code=record["status_code"],
+                    headers={"ETag": record["etag"]}, media_type=JSON_MEDIA_TYPE)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, payload: UserUpdate):
+def update_user(
+        user_id: UserIdPath,
+        payload: UserUpdate,
+        response: Response,
+        repo: Repository,
+        if_match: Annotated[str | None, Header()] = None,
+):
     """
     PUT /users/{user_id}
 
     Полное обновление пользователя.
     Все поля обязательны.
+    If-Match: "<version>" — обновить, только если версия не изменилась (иначе 412);
+    проверка — в том же UPDATE, без предварительного чтения.
     """
-    with get_db_connection() as conn:
-        with get_db_cursor(conn) as cur:
-            cur.execute(
-                """
-                UPDATE users
-                SET email = %s,
-                    name = %s,
-                    phone = %s,
-                    address = %s,
-                    birth_date = %s
-                WHERE id = %s
-                RETURNING id, email, name, created_at, phone, address, birth_date;
-                """,
-                (payload.email, payload.name, payload.phone, payload.address,
-                 payload.birth_date,
-                 user_id),
-            )
-            row = cur.fetchone()
-        
-        conn.commit()
-    
+    versions = if_match_versions(if_match) if if_match is not None else None
+    row = repo.replace(user_id, payload, versions)
+    invalidate_users(user_id)
+
     if not row:
-        raise HTTPException(status_code=404, detail="User not found")
+        raise missing_user_error(if_match)
     
-    return row
+    return user_result(row, response)
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
-def patch_user(user_id: int, payload: UserPatch):
+def patch_user(
+        user_id: UserIdPath,
+        payload: UserPatch,
+        response: Response,
+        repo: Repository,
+        if_match: Annotated[str | None, Header()] = None,
+):
     """
     PATCH / users/{user_id}
 
     Частичное обновление пользователя.
     Можно передать любое подмножество полей.
+    If-Match — как в PUT (412, если версия изменилась).
     """
     data = payload.model_dump(exclude_unset=True)
     
@@ -139,47 +329,29 @@ def patch_user(user_id: int, payload: UserPatch):
             detail="No fields to update",
         )
     
-    fields = ", ".join(f"{key} = %s" for key in data.keys())
-    values = list(data.values()) + [user_id]
-    
-    with get_db_connection() as conn:
-        with get_db_cursor(conn) as cur:
-            cur.execute(
-                f"""
-                UPDATE users
-                SET {fields}
-                WHERE id = %s
-                RETURNING id, email, name, created_at, phone, address, birth_date;
-                """,
-                values,
-            )
-            row = cur.fetchone()
-        
-        conn.commit()
-    
+    versions = if_match_versions(if_match) if if_match is not None else None
+    row = repo.patch(user_id, data, versions)
+    invalidate_users(user_id)
+
     if not row:
-        raise HTTPException(status_code=404, detail="User not found")
+        raise missing_user_error(if_match)
     
-    return row
+    return user_result(row, response)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int):
+def delete_user(user_id: UserIdPath, repo: Repository,
+                if_match: Annotated[str | None, Header()] = None):
     """
     DELETE / users/{user_id}
 
     Удаляет пользователя.
     Возвращает 204 при успехе.
+    If-Match — удалить, только если версия не изменилась (иначе 412).
     """
-    with get_db_connection() as conn:
-        with get_db_cursor(conn) as cur:
-            cur.execute(
-                "DELETE FROM users WHERE id = %s RETURNING id;",
-                (user_id,),
-            )
-            deleted = cur.fetchone()
-        
-        conn.commit()
-    
+    versions = if_match_versions(if_match) if if_match is not None else None
+    deleted = repo.delete(user_id, versions)
+    invalidate_users(user_id)
+
     if not deleted:
-        raise HTTPException(status_code=404, detail="User not found")
+        raise missing_user_error(if_match)
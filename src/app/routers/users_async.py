@@ -0,0 +1,438 @@
+"""
+Роутер /users — асинхронная реализация (DB_DRIVER=asyncpg).
+
+Те же эндпоинты и тот же контракт ответа, что и в routers/users.py:
+- GET    /users           — список с keyset-пагинацией и фильтрами (JSON или NDJSON-поток)
+- GET    /users/{id}      — получить пользователя
+- GET    /users/by-email/{email} — получить пользователя по email (без учёта регистра)
+- POST   /users           — создать пользователя
+- PUT    /users/{id}      — полное обновление
+- PATCH  /users/{id}      — частичное обновление
+- DELETE /users/{id}      — удалить пользователя
+- POST   /users/batch, GET /users?ids=..., GET /users/by-email?emails=...,
+  DELETE /users/batch — batch-операции
+
+Хендлеры выполняются в event loop и не занимают поток threadpool на время запроса к БД,
+поэтому один воркер держит сотни запросов одновременно (ограничение — размер пула asyncpg).
+"""
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated, Literal
+
+import asyncpg
+from fastapi import APIRouter, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from src.config.settings import get_settings
+from src.db.statements import (
+    CLAIM_IDEMPOTENCY_KEY,
+    DELETE_USER,
+    DELETE_USER_IF_MATCH,
+    DELETE_USERS_BY_IDS,
+    GET_IDEMPOTENT_RESPONSE,
+    GET_USER_BY_EMAIL,
+    GET_USER_BY_ID,
+    GET_USERS_BY_EMAILS,
+    GET_USERS_BY_IDS,
+    INSERT_USER,
+    INSERT_USERS_UNNEST_SQL,
+    PURGE_IDEMPOTENCY_KEYS,
+    SAVE_IDEMPOTENT_RESPONSE,
+    UPDATE_USER,
+    UPDATE_USER_IF_MATCH,
+    UserListFilters,
+    asyncpg_placeholder,
+    build_list_query,
+    patch_statement,
+)
+
+from ..async_deps import get_async_db_connection
+from ..batch import build_batch_create_response
+from ..cache import CachedUser, get_user_cache, invalidate_users
+from ..etag import etag_matches, if_match_versions, missing_user_error, user_etag
+from ..group_commit import AsyncGroupCommitter
+from ..idempotency import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    PURGE_BATCH_SIZE,
+    replay_response,
+    request_fingerprint,
+)
+from ..schemas import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_USER_ID,
+    NDJSON_MEDIA_TYPE,
+    UserBatchCreate,
+    UserBatchCreateResponse,
+    UserBatchDelete,
+    UserBatchDeleteResponse,
+    UserCreate,
+    UserId,
+    UserList,
+    UserUpdate,
+    UserPatch,
+    UserResponse,
+)
+from ..serialization import JSON_MEDIA_TYPE, dump_user, user_list_response, user_result
+
+router = APIRouter(prefix="/users", tags=["users"])
+# id из пути: вне 1..MAX_USER_ID — 422, как в routers/users.py (asyncpg передаёт $1 как int4)
+UserIdPath = Annotated[int, Path(ge=1, le=MAX_USER_ID)]
+
+
+# Batch-эндпоинты объявлены до /{user_id}, иначе DELETE /users/batch попадёт в delete_user
+
+
+@router.post("/batch", response_model=UserBatchCreateResponse)
+async def create_users_batch(payload: UserBatchCreate):
+    """
+    POST /users/batch
+
+    Создаёт пользователей одним INSERT ... SELECT FROM unnest(...) (массивы по колонкам).
+    Занятые email не роняют весь batch: такие элементы получают status 409 в items.
+    """
+    return build_batch_create_response(payload.users, await _insert_users(payload.users))
+
+
+async def _insert_users(users: list[UserCreate]) -> list[dict]:
+    """INSERT ... SELECT FROM unnest(...) ON CONFLICT DO NOTHING RETURNING (batch и group commit)."""
+    async with get_async_db_connection() as conn:
+        rows = await conn.fetch(
+            INSERT_USERS_UNNEST_SQL,
+            [u.email for u in users],
+            [u.name for u in users],
+            [u.phone for u in users],
+            [u.address for u in users],
+            [u.birth_date for u in users],
+        )
+
+    return [dict(row) for row in rows]
+
+
+@lru_cache
+def _group_committer() -> AsyncGroupCommitter | None:
+    """Group commit для POST /users (src/app/group_commit.py) или None, если он выключен."""
+    s = get_settings()
+    if not s.group_commit_enabled:
+        return None
+    return AsyncGroupCommitter(_insert_users, s.group_commit_max_batch, s.group_commit_max_wait)
+
+
+@router.get("", response_model=UserList)
+async def list_users(
+        request: Request,
+        ids: Annotated[list[UserId] | None, Query(max_length=MAX_BATCH_SIZE)] = None,
+        limit: Annotated[int | None, Query(ge=1)] = None,
+        after: Annotated[int | None, Query(ge=0, le=MAX_USER_ID)] = None,
+        email_prefix: Annotated[str | None, Query(max_length=255)] = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        format: Literal["json", "ndjson"] = "json",
+):
+    """
+    GET /users
+
+    Параметры и режимы — как в routers/users.py: ?ids=..., keyset-страницы (after/limit + фильтры)
+    или NDJSON-поток через серверный курсор asyncpg.
+    """
+    if ids:
+        async with get_async_db_connection() as conn:
+            rows = await conn.fetch(
+                GET_USERS_BY_IDS.sql,
+                ids,
+            )
+        rows = [dict(row) for row in rows]
+        if get_settings().fast_responses:
+            return user_list_response(rows)
+        return {"items": rows}
+
+    filters = UserListFilters(after, email_prefix, created_from, created_to)
+
+    if format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(_export_users(filters, limit), media_type=NDJSON_MEDIA_TYPE)
+
+    page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    sql, params = build_list_query(filters, page_size + 1, asyncpg_placeholder)
+    async with get_async_db_connection() as conn:
+        rows = await conn.fetch(sql, *params)
+
+    has_more = len(rows) > page_size
+    rows = [dict(row) for row in rows[:page_size]]
+    next_cursor = rows[-1]["id"] if has_more else None
+    if get_settings().fast_responses:
+        return user_list_response(rows, next_cursor)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def _export_users(filters: UserListFilters, limit: int | None) -> AsyncIterator[bytes]:
+    """Асинхронный генератор NDJSON: серверный курсор asyncpg (нужна транзакция)."""
+    s = get_settings()
+    fetch_size = s.users_export_fetch_size
+    dump = dump_user if s.fast_responses else _validate_and_dump
+    sql, params = build_list_query(filters, limit, asyncpg_placeholder)
+    async with get_async_db_connection() as conn:
+        async with conn.transaction():
+            cursor = await conn.cursor(sql, *params)
+            while rows := await cursor.fetch(fetch_size):
+                yield b"".join(dump(dict(row)) + b"\n" for row in rows)
+
+
+def _validate_and_dump(row: dict) -> bytes:
+    return UserResponse.model_validate(row).model_dump_json().encode()
+
+
+@router.delete("/batch", response_model=UserBatchDeleteResponse)
+async def delete_users_batch(payload: UserBatchDelete):
+    """
+    DELETE /users/batch
+
+    Удаляет пользователей по списку id одним DELETE.
+    Возвращает удалённые id и id, которых не было в БД.
+    """
+    async with get_async_db_connection() as conn:
+        rows = await conn.fetch(
+            DELETE_USERS_BY_IDS.sql,
+            payload.ids,
+        )
+    deleted = {row["id"] for row in rows}
+    invalidate_users(*deleted)
+
+    requested = list(dict.fromkeys(payload.ids))
+    return {
+        "deleted": [i for i in requested if i in deleted],
+        "not_found": [i for i in requested if i not in deleted],
+    }
+
+
+@router.get("/by-email", response_model=UserList)
+async def get_users_by_emails(
+        emails: Annotated[list[str], Query(min_length=1, max_length=MAX_BATCH_SIZE)],
+):
+    """
+    GET /users/by-email?emails=...
+
+    Как в routers/users.py: пользователи по списку email без учёта регистра, по возрастанию id.
+    """
+    async with get_async_db_connection() as conn:
+        rows = [dict(row) for row in await conn.fetch(GET_USERS_BY_EMAILS.sql, emails)]
+    if get_settings().fast_responses:
+        return user_list_response(rows)
+    return {"items": rows}
+
+
+@router.get("/by-email/{email}", response_model=UserResponse)
+async def get_user_by_email(email: Annotated[str, Path(max_length=255)], response: Response):
+    """
+    GET /users/by-email/{email}
+
+    Пользователь по email без учёта регистра; не найден — 404. Ответ содержит ETag.
+    """
+    async with get_async_db_connection() as conn:
+        row = await conn.fetchrow(GET_USER_BY_EMAIL.sql, email)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user_result(dict(row), response)
+
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(
+        user_id: UserIdPath,
+        response: Response,
+        if_none_match: Annotated[str | None, Header()] = None,
+):
+    """
+    GET /users/{user_id}
+
+    Возвращает пользователя по id.
+    Если не найден — 404.
+    Ответ содержит ETag; при совпадении с If-None-Match — 304 без тела.
+    Читает через кэш (если включён), промах — SELECT и запись в кэш.
+    """
+    cache = get_user_cache()
+    entry = cache.get(user_id) if cache is not None else None
+
+    if entry is None:
+        async with get_async_db_connection() as conn:
+            row = await conn.fetchrow(
+                GET_USER_BY_ID.sql,
+                user_id,
+            )
+
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        row = dict(row)
+        entry = CachedUser(row=row, etag=user_etag(row))
+        if cache is not None:
+            cache.set(user_id, entry)
+
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+
+    return user_result(entry.row, response)
+
+
+@router.post(
+    "",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_user(
+        payload: UserCreate,
+        response: Response,
+        idempotency_key: Annotated[
+            str | None, Header(min_length=1, max_length=IDEMPOTENCY_KEY_MAX_LENGTH)] = None,
+):
+    """
+    POST /users
+
+    Создаёт нового пользователя.
+    Email должен быть уникальным.
+    Ответ содержит ETag (версия 1).
+    Idempotency-Key — как в routers/users.py: повтор возвращает исходный ответ 201.
+    GROUP_COMMIT_ENABLED — вставка вместе с параллельными запросами одной транзакцией.
+    """
+    if idempotency_key is not None:
+        return await _create_user_idempotent(payload, idempotency_key)
+
+    committer = _group_committer()
+    if committer is not None:
+        row = await committer.submit(payload)
+        return user_result(row, response, status_code=status.HTTP_201_CREATED)
+
+    async with get_async_db_connection() as conn:
+        row = await _insert_user(conn, payload)
+
+    return user_result(row, response, status_code=status.HTTP_201_CREATED)
+
+
+async def _insert_user(conn: asyncpg.Connection, payload: UserCreate) -> dict:
+    # Как и в синхронной версии: UniqueViolationError → 409, перегрузка БД → 503 (errors.py)
+    row = await conn.fetchrow(
+        INSERT_USER.sql,
+        payload.email, payload.name, payload.phone, payload.address,
+        payload.birth_date,
+    )
+    return dict(row)
+
+
+async def _create_user_idempotent(payload: UserCreate, key: str) -> Response:
+    """POST /users с Idempotency-Key: ключ, пользователь и сохранённый ответ — одна транзакция."""
+    fingerprint = request_fingerprint(payload)
+    async with get_async_db_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(PURGE_IDEMPOTENCY_KEYS.sql, PURGE_BATCH_SIZE)
+            claimed = await conn.fetchval(
+                CLAIM_IDEMPOTENCY_KEY.sql, key, fingerprint, get_settings().idempotency_key_ttl)
+            if claimed is None:
+                # Ключ уже занят (если параллельно — CLAIM дождался коммита первого запроса)
+                record = await conn.fetchrow(GET_IDEMPOTENT_RESPONSE.sql, key)
+                return replay_response(dict(record) if record else None, fingerprint)
+
+            row = await _insert_user(conn, payload)
+            body, etag = dump_user(row), user_etag(row)
+            await conn.execute(SAVE_IDEMPOTENT_RESPONSE.sql,
+                               key, status.HTTP_201_CREATED, body, etag)
+
+    return Response(body, status_code=status.HTTP_201_CREATED, headers={"ETag": etag},
+                    media_type=JSON_MEDIA_TYPE)
+
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+        user_id: UserIdPath,
+        payload: UserUpdate,
+        response: Response,
+        if_match: Annotated[str | None, Header()] = None,
+):
+    """
+    PUT /users/{user_id}
+
+    Полное обновление пользователя.
+    Все поля обязательны.
+    If-Match: "<version>" — обновить, только если версия не изменилась (иначе 412);
+    проверка — в том же UPDATE, без предварительного чтения.
+    """
+    statement = UPDATE_USER
+    params = (payload.email, payload.name, payload.phone, payload.address, payload.birth_date,
+              user_id)
+    versions = if_match_versions(if_match) if if_match is not None else None
+    if versions is not None:
+        statement, params = UPDATE_USER_IF_MATCH, (*params, versions)
+
+    async with get_async_db_connection() as conn:
+        row = await conn.fetchrow(statement.sql, *params)
+
+    invalidate_users(user_id)
+
+    if not row:
+        raise missing_user_error(if_match)
+
+    return user_result(dict(row), response)
+
+
+@router.patch("/{user_id}", response_model=UserResponse)
+async def patch_user(
+        user_id: UserIdPath,
+        payload: UserPatch,
+        response: Response,
+        if_match: Annotated[str | None, Header()] = None,
+):
+    """
+    PATCH / users/{user_id}
+
+    Частичное обновление пользователя.
+    Можно передать любое подмножество полей.
+    If-Match — как в PUT (412, если версия изменилась).
+    """
+    data = payload.model_dump(exclude_unset=True)
+
+    if not data:
+        raise HTTPException(
+            status_code=400,
+            detail="No fields to update",
+        )
+
+    # Готовый вариант UPDATE под набор изменённых полей: asyncpg кэширует его по тексту запроса
+    versions = if_match_versions(if_match) if if_match is not None else None
+    statement, values = patch_statement(data, if_match=versions is not None)
+    params = (*values, user_id) if versions is None else (*values, user_id, versions)
+
+    async with get_async_db_connection() as conn:
+        row = await conn.fetchrow(statement.sql, *params)
+
+    invalidate_users(user_id)
+
+    if not row:
+        raise missing_user_error(if_match)
+
+    return user_result(dict(row), response)
+
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(user_id: UserIdPath, if_match: Annotated[str | None, Header()] = None):
+    """
+    DELETE / users/{user_id}
+
+    Удаляет пользователя.
+    Возвращает 204 при успехе.
+    If-Match — удалить, только если версия не изменилась (иначе 412).
+    """
+    versions = if_match_versions(if_match) if if_match is not None else None
+    if versions is None:
+        statement, params = DELETE_USER, (user_id,)
+    else:
+        statement, params = DELETE_USER_IF_MATCH, (user_id, versions)
+
+    async with get_async_db_connection() as conn:
+        deleted = await conn.fetchval(statement.sql, *params)
+
+    invalidate_users(user_id)
+
+    if not deleted:
+        raise missing_user_error(if_match)
@@ -3,7 +3,7 @@ Request-схемы API: тело входящих запросов (POST и т.
 Валидация через Pydantic (например EmailStr для email).
 """
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -48,6 +48,57 @@ class UserResponse(BaseModel):
     phone: str | None
     address: str | None
     birth_date: datetime | None
+    version: int
 
     class Config:
         from_attributes = True  # pydantic v2
+
+
+# users.id — SERIAL (int4). Больших id нет, а в PREPARE/asyncpg параметр $1 — int4, и такое значение
+# драйвер не передаст (ошибка → 500 вместо 404): id вне 1..MAX_USER_ID отклоняются валидацией (422)
+MAX_USER_ID = 2**31 - 1
+UserId = Annotated[int, Field(ge=1, le=MAX_USER_ID)]
+# Максимум элементов в одном batch-запросе (POST/DELETE /users/batch, GET /users?ids=...)
+MAX_BATCH_SIZE = 1000
+# Размер страницы GET /users по умолчанию и максимум для JSON-ответа
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class UserBatchCreate(BaseModel):
+    """Тело POST /users/batch — список пользователей для вставки одним INSERT."""
+    users: list[UserCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class UserBatchItemResult(BaseModel):
+    """Результат по одному элементу batch-создания: 201 + user или 409 + detail."""
+    index: int = Field(..., description="Позиция элемента в запросе")
+    status: int = Field(..., description="HTTP-статус элемента (201 или 409)")
+    user: UserResponse | None = None
+    detail: str | None = None
+
+
+class UserBatchCreateResponse(BaseModel):
+    """Ответ POST /users/batch"""
+    created: int
+    failed: int
+    items: list[UserBatchItemResult]
+
+
+class UserBatchDelete(BaseModel):
+    """Тело DELETE /users/batch — id пользователей для удаления одним DELETE."""
+    ids: list[UserId] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class UserBatchDeleteResponse(BaseModel):
+    """Ответ DELETE /users/batch"""
+    deleted: list[int]
+    not_found: list[int]
+
+
+class UserList(BaseModel):
+    """Ответ GET /users — страница пользователей и курсор следующей страницы"""
+    items: list[UserResponse]
+    next_cursor: int | None = Field(
+        None, description="Передать в ?after= для следующей страницы; null — страниц больше нет")
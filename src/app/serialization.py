@@ -0,0 +1,108 @@
+"""
+Быстрая сериализация ответов с пользователями (FAST_RESPONSES=true).
+
+По умолчанию FastAPI валидирует возвращённый dict по response_model (UserResponse,
+в том числе EmailStr через email-validator) и только потом сериализует — для простого
+чтения это большая часть CPU. Строки из нашей же БД уже прошли валидацию при записи,
+поэтому здесь они сериализуются сразу в JSON-байты сериализатором pydantic-core
+по TypedDict с теми же полями и типами, что UserResponse — без валидации.
+
+Вывод побайтно совпадает с обычным путём. Приведения, которые делала валидация, сделаны здесь:
+- DATE → datetime для birth_date ("1990-01-01T00:00:00");
+- нормализация email, как в EmailStr (домен в нижнем регистре, xn--... → Unicode): адреса,
+  записанные через API, уже нормализованы при записи и проверяются дёшево, остальные
+  (COPY, прямой SQL: Ivan@Example.COM) проходят через тот же validate_email.
+"""
+
+from datetime import datetime
+from typing import TypedDict
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic.networks import validate_email
+
+from src.config.settings import get_settings
+
+from .etag import user_etag
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class UserRow(TypedDict):
+    """Строка users в том виде, в каком её отдаёт API (поля и типы — как в UserResponse)."""
+
+    id: int
+    email: str
+    name: str | None
+    created_at: datetime
+    phone: str | None
+    address: str | None
+    birth_date: datetime | None
+    version: int
+
+
+class UserListBody(TypedDict):
+    """Тело GET /users — как UserList."""
+
+    items: list[UserRow]
+    next_cursor: int | None
+
+
+_user_adapter = TypeAdapter(UserRow)
+_user_list_adapter = TypeAdapter(UserListBody)
+
+
+def _response_email(email: str) -> str:
+    """email, как его вернул бы EmailStr: уже нормализованный ASCII-адрес — как есть."""
+    domain = email.rpartition("@")[2]
+    if email.isascii() and domain == domain.lower() and "xn--" not in domain:
+        return email
+    return validate_email(email)[1]
+
+
+def _as_response_row(row: dict) -> dict:
+    """
+    birth_date из БД — date; UserResponse объявляет datetime, валидация привела бы к полуночи.
+    email — с нормализацией EmailStr.
+    """
+    birth_date = row["birth_date"]
+    if birth_date is not None and not isinstance(birth_date, datetime):
+        row = {**row, "birth_date": datetime(birth_date.year, birth_date.month, birth_date.day)}
+    email = _response_email(row["email"])
+    if email != row["email"]:
+        row = {**row, "email": email}
+    return row
+
+
+def dump_user(row: dict) -> bytes:
+    """JSON пользователя — те же байты, что UserResponse.model_validate(row).model_dump_json()."""
+    return _user_adapter.dump_json(_as_response_row(row))
+
+
+def dump_user_list(rows: list[dict], next_cursor: int | None = None) -> bytes:
+    """JSON страницы списка — те же байты, что ответ с response_model=UserList."""
+    return _user_list_adapter.dump_json(
+        {"items": [_as_response_row(row) for row in rows], "next_cursor": next_cursor})
+
+
+def user_response(row: dict, status_code: int = 200, headers: dict | None = None) -> Response:
+    """Готовый ответ с пользователем (мимо response_model — без повторной валидации)."""
+    return Response(dump_user(row), status_code=status_code, headers=headers,
+                    media_type=JSON_MEDIA_TYPE)
+
+
+def user_list_response(rows: list[dict], next_cursor: int | None = None) -> Response:
+    """Готовый ответ GET /users."""
+    return Response(dump_user_list(rows, next_cursor), media_type=JSON_MEDIA_TYPE)
+
+
+def user_result(row: dict, response: Response, status_code: int = 200):
+    """
+    Результат хендлера с одним пользователем и заголовком ETag: при FAST_RESPONSES —
+    готовый Response, иначе row (его провалидирует и сериализует response_model).
+    """
+    etag = user_etag(row)
+    if get_settings().fast_responses:
+        return user_response(row, status_code=status_code, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return row
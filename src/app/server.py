@@ -0,0 +1,113 @@
+"""
+Продакшен-запуск API: несколько процессов-воркеров uvicorn.
+
+Один процесс uvicorn занимает одно ядро (GIL), поэтому по умолчанию воркеров столько же,
+сколько CPU. У каждого воркера свой пул подключений к БД и соединение LISTEN ленты изменений;
+DB_CONNECTION_BUDGET (по умолчанию 80 — меньше max_connections=100 PostgreSQL по умолчанию)
+ограничивает их сумму: пул воркера = min(DB_POOL_MAX_SIZE, бюджет // воркеры − 1)
+(размер передаётся воркерам через окружение), а число воркеров по CPU — не больше бюджет // 2.
+
+При SIGTERM/SIGINT воркер перестаёт принимать соединения, ждёт завершения текущих запросов
+не дольше SERVER_GRACEFUL_TIMEOUT и закрывает пул (lifespan в main.py).
+
+Запуск из корня проекта (параметры — из .env / SERVER_*, флаги их переопределяют):
+    python -m src.app.server
+    python -m src.app.server --workers 8 --port 3000 --db-connection-budget 80
+"""
+
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from src.config.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+APP = "src.app.main:app"
+# Соединений воркера вне пула: LISTEN ленты изменений GET /users/changes (src/app/changes.py)
+EXTRA_CONNECTIONS_PER_WORKER = 1
+
+
+def resolve_workers(workers: int) -> int:
+    """0 — по числу доступных процессу CPU."""
+    if workers > 0:
+        return workers
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Нет sched_getaffinity (macOS, Windows)
+        return os.cpu_count() or 1
+
+
+def pool_sizes(settings: Settings, workers: int) -> tuple[int, int]:
+    """
+    (min_size, max_size) пула одного воркера. Бюджет соединений — верхняя граница на весь сервер:
+    max_size = min(DB_POOL_MAX_SIZE, бюджет // воркеры − EXTRA_CONNECTIONS_PER_WORKER),
+    но не меньше 1; DB_CONNECTION_BUDGET=0 — DB_POOL_MAX_SIZE как есть.
+    """
+    max_size = settings.db_pool_max_size
+    if settings.db_connection_budget:
+        share = settings.db_connection_budget // workers - EXTRA_CONNECTIONS_PER_WORKER
+        if share < 1:
+            logger.warning(
+                "DB_CONNECTION_BUDGET=%d is too small for %d workers: "
+                "using 1 pooled connection per worker", settings.db_connection_budget, workers)
+        max_size = max(min(max_size, share), 1)
+    return min(settings.db_pool_min_size, max_size), max_size
+
+
+def run(settings: Settings) -> None:
+    """Запустить uvicorn с воркерами и параметрами из settings."""
+    workers = resolve_workers(settings.server_workers)
+    if not settings.server_workers and settings.db_connection_budget:
+        # Число воркеров по CPU — не больше, чем помещается в бюджет (соединение пула + LISTEN)
+        max_workers = settings.db_connection_budget // (1 + EXTRA_CONNECTIONS_PER_WORKER)
+        workers = min(workers, max(max_workers, 1))
+    min_size, max_size = pool_sizes(settings, workers)
+    # Воркеры — отдельные процессы и читают настройки сами: размеры пула передаём через env
+    os.environ["DB_POOL_MIN_SIZE"] = str(min_size)
+    os.environ["DB_POOL_MAX_SIZE"] = str(max_size)
+    logger.info("Starting %d worker(s), DB pool %d..%d per worker", workers, min_size, max_size)
+
+    uvicorn.run(
+        APP,
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_timeout,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=settings.server_access_log,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.app.server",
+        description="Run the API with multiple uvicorn worker processes.",
+    )
+    parser.add_argument("--host", dest="server_host")
+    parser.add_argument("--port", dest="server_port", type=int)
+    parser.add_argument("--workers", dest="server_workers", type=int,
+                        help="Worker processes (0 = CPU count)")
+    parser.add_argument("--backlog", dest="server_backlog", type=int)
+    parser.add_argument("--keepalive-timeout", dest="server_keepalive_timeout", type=float)
+    parser.add_argument("--graceful-timeout", dest="server_graceful_timeout", type=float)
+    parser.add_argument("--loop", dest="server_loop", choices=["auto", "asyncio", "uvloop"])
+    parser.add_argument("--http", dest="server_http", choices=["auto", "h11", "httptools"])
+    parser.add_argument("--access-log", dest="server_access_log", action="store_true", default=None)
+    parser.add_argument("--db-connection-budget", dest="db_connection_budget", type=int,
+                        help="Total DB connections across all workers")
+    args = parser.parse_args(argv)
+
+    overrides = {k: v for k, v in vars(args).items() if v is not None}
+    settings = get_settings().model_copy(update=overrides)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    run(settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Журнал медленных запросов (SLOW_QUERY_THRESHOLD, сек; 0 — выключен).
+
+Каждый запрос к БД замеряется (psycopg2 — TimedDictCursor, asyncpg — query logger);
+запросы дольше порога пишутся в лог и в кольцевой буфер на SLOW_QUERY_BUFFER_SIZE записей
+(GET /admin/slow-queries). Значения параметров не сохраняются — только их типы:
+в параметрах email и имена пользователей. SQL пачек execute_values (значения уже
+подставлены в текст) заменяется меткой запроса.
+
+Доля SLOW_QUERY_EXPLAIN_SAMPLE_RATE медленных запросов дополнительно получает план:
+- SELECT — EXPLAIN (ANALYZE, BUFFERS): запрос выполняется ещё раз;
+- запросы с изменениями — EXPLAIN без ANALYZE: повтор вставки/удаления недопустим.
+План снимается в фоне на отдельном соединении пула и не задерживает ответ на запрос:
+psycopg2 — в потоке журнала (не больше MAX_PENDING_EXPLAINS в очереди, лишние пропускаются),
+asyncpg — фоновой задачей. Значения параметров, подставленные в план (Filter, Index Cond...),
+заменяются на ? (_redact_plan), как и в журнале — в плане остаются только имена и типы.
+
+При выключенном журнале запросы не замеряются вовсе (если выключены и метрики):
+get_db_cursor выдаёт обычный RealDictCursor, query logger asyncpg не подключается.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+from src.config.settings import get_settings
+from src.db.statements import is_read_only, statement_label, unprepared_sql
+
+logger = logging.getLogger(__name__)
+
+_EXPLAIN_ANALYZE = "EXPLAIN (ANALYZE, BUFFERS) "
+_EXPLAIN = "EXPLAIN "
+MAX_PENDING_EXPLAINS = 16
+
+# Строковые константы плана: 'secret@example.com'::text, '{1,2}'::integer[]
+_PLAN_STRING = re.compile(r"'(?:[^']|'')*'")
+# Числа в условиях плана; $1 и идентификаторы с цифрами не трогаем
+_PLAN_NUMBER = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?(?![\w.])")
+# Строка-условие узла плана: «Filter: (...)», «Index Cond: (...)», «Hash Cond: (...)»
+_PLAN_CONDITION = re.compile(r"^(\s*[A-Z][\w -]*: )(\(.*)$")
+
+
+@dataclass
+class SlowQuery:
+    """Запись журнала: когда, какой запрос, сколько длился, типы параметров и план (если снят)."""
+
+    at: float
+    statement: str
+    duration_ms: float
+    sql: str
+    params: list[str]
+    plan: str | None = None
+
+
+def _redact(params) -> list[str]:
+    """Типы параметров вместо значений (dict — имена параметров и типы)."""
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return [f"{key}: {type(value).__name__}" for key, value in params.items()]
+    return [type(value).__name__ for value in params]
+
+
+def _explain_prefix(sql: str) -> str:
+    return _EXPLAIN_ANALYZE if is_read_only(sql) else _EXPLAIN
+
+
+def _redact_plan(lines) -> str:
+    """Текст плана без значений параметров: константы в условиях заменяются на ?."""
+    redacted = []
+    for line in lines:
+        line = _PLAN_STRING.sub("'?'", line)
+        match = _PLAN_CONDITION.match(line)
+        if match:
+            line = match.group(1) + _PLAN_NUMBER.sub("?", match.group(2))
+        redacted.append(line)
+    return "\n".join(redacted)
+
+
+class SlowQueryLog:
+    """Кольцевой буфер медленных запросов процесса и выборка запросов для EXPLAIN."""
+
+    def __init__(self, threshold: float, explain_sample_rate: float, size: int):
+        self.threshold = threshold
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque[SlowQuery] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: set[Future] = set()
+
+    def _record(self, sql: str | bytes, params, elapsed: float) -> SlowQuery:
+        label = statement_label(sql)
+        entry = SlowQuery(
+            at=time.time(),
+            statement=label,
+            duration_ms=round(elapsed * 1000, 3),
+            sql=sql if isinstance(sql, str) else label,
+            params=_redact(params),
+        )
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning("Slow query %s: %.1f ms: %s params=%s",
+                       label, entry.duration_ms, entry.sql, entry.params)
+        return entry
+
+    def _sampled(self, sql) -> bool:
+        # EXPLAIN не принимает PREPARE и несколько команд сразу (сброс соединения пулом asyncpg)
+        return (isinstance(sql, str) and not sql.startswith("PREPARE") and ";" not in sql
+                and self.explain_sample_rate > 0 and random.random() < self.explain_sample_rate)
+
+    def observe_psycopg2(self, cursor, sql, params, elapsed: float, failed: bool = False) -> None:
+        """Запрос курсора psycopg2 выполнен: записать, если он медленный, и при выборке снять план."""
+        if elapsed < self.threshold:
+            return
+        entry = self._record(sql, params, elapsed)
+        # Упавший запрос не повторяем; у named-курсора execute — только DECLARE
+        if not failed and cursor.name is None and self._sampled(sql):
+            self._submit_explain(entry, sql, params)
+
+    def _submit_explain(self, entry: SlowQuery, sql: str, params) -> None:
+        """Снять план в потоке журнала; поток запроса не ждёт."""
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING_EXPLAINS:
+                logger.warning("Too many pending slow query plans, skipping EXPLAIN")
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="slow-query-explain")
+            future = self._executor.submit(_explain_psycopg2, entry, sql, params)
+            self._pending.add(future)
+        future.add_done_callback(self._explain_done)
+
+    def _explain_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def observe_asyncpg(self, record) -> None:
+        """Query logger asyncpg: записать медленный запрос, план снимается фоновой задачей."""
+        if record.elapsed < self.threshold or record.query.startswith(_EXPLAIN):
+            return
+        entry = self._record(record.query, record.args, record.elapsed)
+        if record.exception is None and self._sampled(record.query):
+            task = asyncio.get_running_loop().create_task(
+                _explain_asyncpg(entry, record.query, record.args))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def entries(self) -> list[dict]:
+        """Записи буфера, новые первыми."""
+        with self._lock:
+            entries = list(self._entries)
+        return [asdict(entry) for entry in reversed(entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def wait_explains(self, timeout: float | None = None) -> None:
+        """Дождаться планов psycopg2, поставленных в очередь (тесты, остановка процесса)."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending, timeout)
+
+
+def _explain_psycopg2(entry: SlowQuery, sql: str, params) -> None:
+    """План запроса на отдельном соединении пула psycopg2 (откатывается при возврате в пул)."""
+    from .deps import get_db_connection
+
+    try:
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute(_explain_prefix(sql) + unprepared_sql(sql), params)
+            rows = cur.fetchall()
+    except Exception as exc:
+        logger.warning("Could not explain slow query: %s", exc)
+        return
+    entry.plan = _redact_plan(row[0] for row in rows)
+
+
+async def _explain_asyncpg(entry: SlowQuery, sql: str, args) -> None:
+    """План запроса на отдельном соединении пула asyncpg."""
+    from .async_deps import get_async_db_connection
+
+    try:
+        async with get_async_db_connection() as conn:
+            rows = await conn.fetch(_explain_prefix(sql) + sql, *args)
+    except Exception as exc:
+        logger.warning("Could not explain slow query: %s", exc)
+        return
+    entry.plan = _redact_plan(row[0] for row in rows)
+
+
+@lru_cache
+def get_slow_query_log() -> SlowQueryLog | None:
+    """Журнал медленных запросов процесса или None, если он выключен (SLOW_QUERY_THRESHOLD=0)."""
+    s = get_settings()
+    if not s.slow_query_threshold:
+        return None
+    return SlowQueryLog(s.slow_query_threshold, s.slow_query_explain_sample_rate, s.slow_query_buffer_size)
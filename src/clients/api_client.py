@@ -3,27 +3,80 @@
 Используется при запуске тестов против поднятого в Docker сервера (API + БД).
 """
 
+import random
+import time
+
 import requests
 
+# Ответы, после которых запрос имеет смысл повторить (сервер перегружен/перезапускается)
+RETRY_STATUSES = frozenset({502, 503, 504})
+# С этим заголовком POST /users можно повторять: сервер вернёт ответ первого запроса
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
 
 class BaseApiClient:
-    """Обёртка над requests: GET, POST, DELETE к API по base_url."""
+    """
+    Обёртка над requests: GET, POST, DELETE к API по base_url.
+    compression=False — просить ответы без сжатия (Accept-Encoding: identity); по умолчанию
+    requests запрашивает gzip/deflate (и zstd/br, если установлены) и распаковывает сам.
+    transport — адаптер requests для base_url вместо HTTP (asgi_transport.ASGIAdapter — запросы
+    в приложение в этом же процессе, без сервера).
+    """
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, compression: bool = True,
+                 transport: requests.adapters.BaseAdapter | None = None):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        if transport is not None:
+            self.session.mount(self.base_url, transport)
+        if not compression:
+            self.session.headers["Accept-Encoding"] = "identity"
 
     def _get(self, path: str, params: dict | None = None) -> requests.Response:
         return self.session.get(url=f"{self.base_url}{path}", params=params)
 
-    def _post(self, path: str, json: dict) -> requests.Response:
-        return self.session.post(url=f"{self.base_url}{path}", json=json)
+    def _get_stream(self, path: str, params: dict | None = None, headers: dict | None = None,
+                    timeout: float | None = None) -> requests.Response:
+        """
+        GET без буферизации тела (stream=True) — для потоковых ответов (NDJSON, SSE).
+        timeout — таймаут подключения и ожидания следующих данных, сек.
+        """
+        return self.session.get(url=f"{self.base_url}{path}", params=params, headers=headers,
+                                stream=True, timeout=timeout)
+
+    def _post(self, path: str, json: dict, headers: dict | None = None) -> requests.Response:
+        return self.session.post(url=f"{self.base_url}{path}", json=json, headers=headers)
+
+    def _post_with_retries(self, path: str, json: dict, headers: dict, retries: int,
+                           backoff: float = 0.1) -> requests.Response:
+        """
+        POST с повторами на сетевые ошибки/таймауты и 502/503/504: пауза — Retry-After
+        (в секундах) из ответа или backoff с full jitter.
+        Повторять POST безопасно только с Idempotency-Key в headers.
+        """
+        attempt = 0
+        while True:
+            delay = random.uniform(0, backoff * (2 ** attempt))
+            try:
+                response = self._post(path, json=json, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+            time.sleep(delay)
+            attempt += 1
 
-    def _delete(self, path: str) -> requests.Response:
-        return self.session.delete(url=f"{self.base_url}{path}")
+    def _delete(self, path: str, json: dict | None = None,
+                headers: dict | None = None) -> requests.Response:
+        return self.session.delete(url=f"{self.base_url}{path}", json=json, headers=headers)
 
-    def _put(self, path: str, json: dict) -> requests.Response:
-        return self.session.put(url=f"{self.base_url}{path}", json=json)
+    def _put(self, path: str, json: dict, headers: dict | None = None) -> requests.Response:
+        return self.session.put(url=f"{self.base_url}{path}", json=json, headers=headers)
 
-    def _patch(self, path: str, json: dict) -> requests.Response:
-        return self.session.patch(url=f"{self.base_url}{path}", json=json)
+    def _patch(self, path: str, json: dict, headers: dict | None = None) -> requests.Response:
+        return self.session.patch(url=f"{self.base_url}{path}", json=json, headers=headers)
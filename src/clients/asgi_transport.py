@@ -0,0 +1,240 @@
+"""
+Транспорт requests без сети: запросы BaseApiClient уходят прямо в ASGI-приложение
+(src.app.main:app) в этом же процессе (API_TRANSPORT=asgi или pytest --api-transport=asgi).
+
+Нет сокета, uvicorn и разбора HTTP — тесты идут без поднятого сервера (БД по-прежнему нужна)
+и весь путь запроса (клиент → роутер → БД) профилируется в одном процессе:
+    python -m cProfile -o tests.prof -m pytest tests/ --api-transport=asgi
+
+Приложение работает в отдельном потоке со своим event loop (anyio BlockingPortal).
+Lifespan (пул БД) стартует при первом запросе или на входе в `with ASGIAdapter()`
+и останавливается в close() (его вызывает Session.close()).
+Тело ответа отдаётся requests по мере отправки приложением, как по HTTP:
+stream=True, NDJSON и Server-Sent Events не ждут конца ответа. timeout — ожидание
+заголовков и каждого следующего куска тела; закрытие ответа — http.disconnect для приложения.
+Ответ — обычный requests.Response (тело как есть, со сжатием, распаковывает requests).
+"""
+
+import io
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import ExitStack
+from urllib.parse import unquote, urlsplit
+
+import anyio
+import anyio.from_thread
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPHeaderDict, HTTPResponse
+
+_END = object()  # Конец тела ответа в очереди кусков
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _read_timeout(timeout) -> float | None:
+    """timeout requests: число или (connect, read) — подключения нет, важно только read."""
+    return timeout[1] if isinstance(timeout, tuple) else timeout
+
+
+def _scope(request: requests.PreparedRequest, state: dict) -> dict:
+    url = urlsplit(request.url)
+    headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+               for name, value in request.headers.items()]
+    if "host" not in request.headers:
+        headers.append((b"host", url.netloc.encode("ascii")))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": request.method,
+        "scheme": url.scheme,
+        "path": unquote(url.path),
+        "raw_path": url.path.encode("ascii"),
+        "query_string": url.query.encode("ascii"),
+        "root_path": "",
+        "headers": headers,
+        "client": ("asgi-transport", 0),
+        "server": (url.hostname, url.port or _DEFAULT_PORTS.get(url.scheme, 80)),
+        "state": dict(state),
+    }
+
+
+class _ResponseBody(io.RawIOBase):
+    """Тело ответа для urllib3: куски из очереди, которую наполняет приложение."""
+
+    def __init__(self, chunks: queue.Queue, read_timeout: float | None, disconnect):
+        super().__init__()
+        self._chunks = chunks
+        self._read_timeout = read_timeout
+        self._disconnect = disconnect
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> bool:
+        """Дождаться следующего куска тела; False — тело кончилось."""
+        while not self._buffer and not self._eof:
+            try:
+                chunk = self._chunks.get(timeout=self._read_timeout)
+            except queue.Empty:
+                # Как таймаут сокета: urllib3 превратит его в ReadTimeoutError
+                raise TimeoutError("Read timed out") from None
+            if isinstance(chunk, BaseException):
+                # Приложение упало посреди тела — как оборванное соединение
+                raise ConnectionResetError(f"ASGI app failed: {chunk!r}") from chunk
+            if chunk is _END:
+                self._eof = True
+            else:
+                self._buffer = chunk
+        return bool(self._buffer)
+
+    def readinto(self, buffer) -> int:
+        data = self.read1(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read1(self, size: int = -1) -> bytes:
+        """Не больше size байт из текущего куска: не ждёт следующих, если что-то уже есть."""
+        if not self._fill():
+            return b""
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self) -> None:
+        if not self.closed:
+            self._disconnect()
+        super().close()
+
+
+class _ASGIResponse(HTTPResponse):
+    """Ответ urllib3, который без размера куска (iter_content(None)) отдаёт куски приложения."""
+
+    def stream(self, amt: int | None = 2**16, decode_content: bool | None = None):
+        if amt is not None:
+            yield from super().stream(amt, decode_content)
+            return
+        # Как chunked-ответ по HTTP: кусок — как только приложение его отправило
+        while data := self.read1(decode_content=decode_content):
+            yield data
+
+
+class ASGIAdapter(HTTPAdapter):
+    """Адаптер requests (Session.mount), отправляющий запросы в ASGI-приложение."""
+
+    def __init__(self, app=None):
+        super().__init__()
+        self._app = app
+        self._lock = threading.Lock()
+        self._stack: ExitStack | None = None
+        self._portal: anyio.from_thread.BlockingPortal | None = None
+        self._state: dict = {}
+        self._requests: set[Future] = set()  # Запросы, которые приложение ещё выполняет
+
+    def __enter__(self) -> "ASGIAdapter":
+        self._start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _start(self) -> anyio.from_thread.BlockingPortal:
+        """Поток event loop и lifespan приложения — при первом запросе."""
+        with self._lock:
+            if self._portal is None:
+                if self._app is None:
+                    from src.app.main import app
+
+                    self._app = app
+                # Ошибка старта закрывает уже запущенное (ExitStack) и уходит вызывающему
+                with ExitStack() as stack:
+                    portal = stack.enter_context(anyio.from_thread.start_blocking_portal())
+                    state = stack.enter_context(portal.wrap_async_context_manager(
+                        self._app.router.lifespan_context(self._app)))
+                    self._stack = stack.pop_all()
+                self._portal, self._state = portal, state or {}
+            return self._portal
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        portal = self._start()
+        read_timeout = _read_timeout(timeout)
+        chunks: queue.Queue = queue.Queue()
+        disconnect = portal.call(anyio.Event)
+        body = request.body or b""
+        future = portal.start_task_soon(
+            self._call, _scope(request, self._state),
+            body.encode() if isinstance(body, str) else body, chunks, disconnect)
+        self._requests.add(future)
+        future.add_done_callback(self._requests.discard)
+        # Ошибка приложения — в очередь: до заголовков это 500, посреди тела — обрыв
+        future.add_done_callback(
+            lambda done: chunks.put(_END if done.cancelled() or done.exception() is None
+                                    else done.exception()))
+
+        def close() -> None:
+            try:
+                portal.call(disconnect.set)
+            except RuntimeError:
+                pass  # Адаптер уже закрыт, event loop остановлен
+
+        try:
+            start = chunks.get(timeout=read_timeout)
+        except queue.Empty:
+            close()
+            raise requests.exceptions.ReadTimeout(
+                f"ASGI app did not respond in {read_timeout} s", request=request) from None
+        if not isinstance(start, tuple):
+            chunks.put(_END)
+            start = (500, [])  # Ошибка приложения — ответ 500, как от сервера, а не исключение
+        status, headers = start
+        raw = _ASGIResponse(
+            body=_ResponseBody(chunks, read_timeout, close),
+            headers=HTTPHeaderDict(
+                [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers]),
+            status=status,
+            preload_content=False,
+            request_method=request.method,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+    async def _call(self, scope: dict, body: bytes, chunks: queue.Queue,
+                    disconnect: anyio.Event) -> None:
+        """Выполнить запрос в приложении: заголовки и куски тела — в очередь chunks."""
+        request_sent = False
+
+        async def receive() -> dict:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            if disconnect.is_set():
+                return  # Клиент закрыл ответ — дальнейшие куски никому не нужны
+            if message["type"] == "http.response.start":
+                chunks.put((message["status"], message.get("headers", [])))
+            elif message["type"] == "http.response.body":
+                if message.get("body"):
+                    chunks.put(message["body"])
+                if not message.get("more_body", False):
+                    chunks.put(_END)
+
+        await self._app(scope, receive, send)
+
+    def close(self) -> None:
+        """Остановить приложение: незавершённые запросы (незакрытые потоки) отменяются."""
+        with self._lock:
+            stack, self._stack, self._portal = self._stack, None, None
+        if stack is not None:
+            for future in list(self._requests):
+                future.cancel()
+            stack.close()
+        super().close()
@@ -0,0 +1,134 @@
+"""
+Асинхронный базовый HTTP-клиент к API (httpx.AsyncClient).
+Один клиент держит пул keep-alive соединений: сотни конкурентных запросов
+(asyncio.gather) идут через несколько сокетов, а не соединение на запрос.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Значения по умолчанию: таймаут запроса (сек), размер пула, повторы и база backoff (сек)
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.1
+
+# Ответы, после которых запрос имеет смысл повторить (сервер перегружен/перезапускается)
+RETRY_STATUSES = frozenset({502, 503, 504})
+# Методы, которые безопасно повторять при любой ошибке: повтор не создаст дубль.
+# POST повторяется только если запрос не ушёл на сервер (ошибка соединения)
+# или у него есть Idempotency-Key (сервер вернёт на повтор исходный ответ).
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"})
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Задержка из заголовка Retry-After (секунды или HTTP-дата), если он есть."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncBaseApiClient:
+    """
+    Обёртка над httpx.AsyncClient: GET, POST, PUT, PATCH, DELETE к API по base_url.
+    max_connections — потолок одновременных соединений (остальные запросы ждут в очереди пула),
+    max_keepalive_connections/keepalive_expiry — сколько простаивающих соединений и как долго держать.
+    compression=False — просить ответы без сжатия (Accept-Encoding: identity).
+    Использовать как async context manager или закрыть явно через aclose().
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            timeout: float = DEFAULT_TIMEOUT,
+            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+            retries: int = DEFAULT_RETRIES,
+            retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+            compression: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            headers=None if compression else {"Accept-Encoding": "identity"},
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def _backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка с full jitter: случайно в [0, base * 2^attempt]."""
+        return random.uniform(0, self.retry_backoff * (2 ** attempt))
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Запрос с повторами: сетевые ошибки и 502/503/504 повторяются до retries раз
+        с backoff (или по Retry-After). timeout=... в kwargs — таймаут этого запроса.
+        """
+        idempotent = (method in IDEMPOTENT_METHODS
+                      or IDEMPOTENCY_KEY_HEADER in (kwargs.get("headers") or {}))
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                retryable = idempotent or isinstance(exc, httpx.ConnectError)
+                if not retryable or attempt >= self.retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if (response.status_code not in RETRY_STATUSES
+                        or not idempotent or attempt >= self.retries):
+                    return response
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _get(self, path: str, params: dict | None = None, **kwargs) -> httpx.Response:
+        return await self._request("GET", path, params=params, **kwargs)
+
+    async def _post(self, path: str, json: dict, **kwargs) -> httpx.Response:
+        return await self._request("POST", path, json=json, **kwargs)
+
+    async def _delete(self, path: str, json: dict | None = None, **kwargs) -> httpx.Response:
+        # httpx.delete() не принимает тело, поэтому через общий request
+        return await self._request("DELETE", path, json=json, **kwargs)
+
+    async def _put(self, path: str, json: dict, **kwargs) -> httpx.Response:
+        return await self._request("PUT", path, json=json, **kwargs)
+
+    async def _patch(self, path: str, json: dict, **kwargs) -> httpx.Response:
+        return await self._request("PATCH", path, json=json, **kwargs)
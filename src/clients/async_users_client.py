@@ -0,0 +1,97 @@
+"""
+Асинхронный HTTP-клиент к эндпоинтам /users — те же методы, что у UsersClient, но корутины.
+Для конкурентных сценариев и массовой подготовки данных:
+
+    async with AsyncUsersClient(base_url) as client:
+        responses = await client.create_users(payloads, concurrency=100)
+"""
+
+import asyncio
+from urllib.parse import quote
+
+import httpx
+
+from .async_api_client import IDEMPOTENCY_KEY_HEADER, AsyncBaseApiClient
+from .users_client import _if_match, new_idempotency_key
+
+
+def _with_headers(kwargs: dict, headers: dict | None) -> dict:
+    """kwargs запроса: headers поверх заголовков, переданных вызывающим в kwargs["headers"]."""
+    if headers:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), **headers}
+    return kwargs
+
+
+class AsyncUsersClient(AsyncBaseApiClient):
+    """
+    GET/POST/PUT/PATCH/DELETE /users + batch. Дополнительные kwargs методов уходят в httpx
+    (например, timeout=2.0 — таймаут конкретного запроса).
+    """
+
+    async def create_user(self, payload: dict, idempotency_key: str | None = None,
+                          **kwargs) -> httpx.Response:
+        """
+        POST /users — создание пользователя. payload: { email, name?, phone?, address?, birth_date? }.
+        При retries > 0 запрос уходит с Idempotency-Key (сгенерированным, если не передан),
+        поэтому повторяется и после таймаута/502–504: повтор вернёт исходный 201.
+        """
+        if self.retries and idempotency_key is None:
+            idempotency_key = new_idempotency_key()
+        if idempotency_key is not None:
+            _with_headers(kwargs, {IDEMPOTENCY_KEY_HEADER: idempotency_key})
+        return await self._post("/users", json=payload, **kwargs)
+
+    async def get_user(self, user_id: int, **kwargs) -> httpx.Response:
+        """GET /users/{user_id} — получить пользователя по id."""
+        return await self._get(f"/users/{user_id}", **kwargs)
+
+    async def get_user_by_email(self, email: str, **kwargs) -> httpx.Response:
+        """GET /users/by-email/{email} — получить пользователя по email (без учёта регистра)."""
+        return await self._get(f"/users/by-email/{quote(email, safe='@')}", **kwargs)
+
+    async def get_users_by_emails(self, emails: list[str], **kwargs) -> httpx.Response:
+        """GET /users/by-email?emails=... — получить пользователей по списку email."""
+        return await self._get("/users/by-email", params={"emails": emails}, **kwargs)
+
+    async def update_user(self, user_id: int, payload: dict, if_match: str | None = None,
+                          **kwargs) -> httpx.Response:
+        """PUT /users/{user_id} — полное обновление. if_match — ETag: 412, если версия изменилась."""
+        return await self._put(f"/users/{user_id}", json=payload,
+                               **_with_headers(kwargs, _if_match(if_match)))
+
+    async def partial_update_user(self, user_id: int, payload: dict, if_match: str | None = None,
+                                  **kwargs) -> httpx.Response:
+        """PATCH /users/{user_id} — частичное обновление. if_match — ETag (412 при конфликте)."""
+        return await self._patch(f"/users/{user_id}", json=payload,
+                                 **_with_headers(kwargs, _if_match(if_match)))
+
+    async def delete_user(self, user_id: int, if_match: str | None = None,
+                          **kwargs) -> httpx.Response:
+        """DELETE /users/{user_id} — удалить пользователя по id. if_match — ETag (412 при конфликте)."""
+        return await self._delete(f"/users/{user_id}",
+                                  **_with_headers(kwargs, _if_match(if_match)))
+
+    async def create_users_batch(self, payloads: list[dict], **kwargs) -> httpx.Response:
+        """POST /users/batch — создание многих пользователей одним запросом (статус по каждому в items)."""
+        return await self._post("/users/batch", json={"users": payloads}, **kwargs)
+
+    async def get_users(self, ids: list[int], **kwargs) -> httpx.Response:
+        """GET /users?ids=... — получить пользователей по списку id."""
+        return await self._get("/users", params={"ids": ids}, **kwargs)
+
+    async def delete_users_batch(self, ids: list[int], **kwargs) -> httpx.Response:
+        """DELETE /users/batch — удалить пользователей по списку id одним запросом."""
+        return await self._delete("/users/batch", json={"ids": ids}, **kwargs)
+
+    async def create_users(self, payloads: list[dict], concurrency: int = 50) -> list[httpx.Response]:
+        """
+        Конкурентно выполнить POST /users для каждого payload (не больше concurrency запросов
+        одновременно). Ответы — в порядке payloads.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create(payload: dict) -> httpx.Response:
+            async with semaphore:
+                return await self.create_user(payload)
+
+        return await asyncio.gather(*(create(p) for p in payloads))
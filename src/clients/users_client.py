@@ -2,28 +2,151 @@
 HTTP-клиент к эндпоинтам /users. Для тестов против поднятого в Docker API.
 """
 
-from .api_client import BaseApiClient
+import json
+import time
+import uuid
+from collections.abc import Iterator
+from urllib.parse import quote
+
+import requests
+
+from .api_client import IDEMPOTENCY_KEY_HEADER, RETRY_STATUSES, BaseApiClient
+
+
+def new_idempotency_key() -> str:
+    """Новый ключ для заголовка Idempotency-Key."""
+    return str(uuid.uuid4())
+
+
+def _if_match(etag: str | None) -> dict | None:
+    return {"If-Match": etag} if etag is not None else None
+
+
+def _parse_events(lines: Iterator[str]) -> Iterator[dict]:
+    """Разбор text/event-stream: JSON из полей data каждого события; комментарии и id пропускаются."""
+    data = []
+    for line in lines:
+        if not line:
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
 
 
 class UsersClient(BaseApiClient):
-    """GET /users/{id}, POST /users, PUT /users/{id}, PATCH /users/{id}, DELETE /users/{id}."""
+    """
+    GET /users/{id}, POST /users, PUT /users/{id}, PATCH /users/{id}, DELETE /users/{id} + batch
+    и лента изменений GET /users/changes.
+    """
 
-    def create_user(self, payload: dict):
-        """POST /users — создание пользователя. payload: { email, name?, phone?, address?, birth_date? }."""
-        return self._post("/users", json=payload)
+    def create_user(self, payload: dict, retries: int = 0, idempotency_key: str | None = None):
+        """
+        POST /users — создание пользователя. payload: { email, name?, phone?, address?, birth_date? }.
+        retries > 0 — повторять при сетевых ошибках и 502/503/504 с одним Idempotency-Key
+        (сгенерированным, если не передан): повтор вернёт исходный 201, а не 409.
+        """
+        if retries and idempotency_key is None:
+            idempotency_key = new_idempotency_key()
+        if idempotency_key is None:
+            return self._post("/users", json=payload)
+        headers = {IDEMPOTENCY_KEY_HEADER: idempotency_key}
+        return self._post_with_retries("/users", json=payload, headers=headers, retries=retries)
 
     def get_user(self, user_id: int):
         """GET /users/{user_id} — получить пользователя по id."""
         return self._get(f"/users/{user_id}")
 
-    def update_user(self, user_id: int, payload: dict):
-        """PUT /users/{user_id} — полное обновление пользователя."""
-        return self._put(f"/users/{user_id}", json=payload)
+    def get_user_by_email(self, email: str):
+        """GET /users/by-email/{email} — получить пользователя по email (без учёта регистра)."""
+        return self._get(f"/users/by-email/{quote(email, safe='@')}")
+
+    def get_users_by_emails(self, emails: list[str]):
+        """GET /users/by-email?emails=... — получить пользователей по списку email."""
+        return self._get("/users/by-email", params={"emails": emails})
+
+    def update_user(self, user_id: int, payload: dict, if_match: str | None = None):
+        """PUT /users/{user_id} — полное обновление. if_match — ETag: 412, если версия изменилась."""
+        return self._put(f"/users/{user_id}", json=payload, headers=_if_match(if_match))
+
+    def partial_update_user(self, user_id: int, payload: dict, if_match: str | None = None):
+        """PATCH /users/{user_id} — частичное обновление. if_match — ETag (412 при конфликте)."""
+        return self._patch(f"/users/{user_id}", json=payload, headers=_if_match(if_match))
+
+    def delete_user(self, user_id: int, if_match: str | None = None):
+        """DELETE /users/{user_id} — удалить пользователя по id. if_match — ETag (412 при конфликте)."""
+        return self._delete(f"/users/{user_id}", headers=_if_match(if_match))
+
+    def create_users_batch(self, payloads: list[dict]):
+        """POST /users/batch — создание многих пользователей одним запросом (статус по каждому в items)."""
+        return self._post("/users/batch", json={"users": payloads})
+
+    def get_users(self, ids: list[int]):
+        """GET /users?ids=... — получить пользователей по списку id."""
+        return self._get("/users", params={"ids": ids})
+
+    def delete_users_batch(self, ids: list[int]):
+        """DELETE /users/batch — удалить пользователей по списку id одним запросом."""
+        return self._delete("/users/batch", json={"ids": ids})
+
+    def list_users(self, limit: int | None = None, after: int | None = None, **filters):
+        """
+        GET /users — одна страница списка.
+        filters: email_prefix, created_from, created_to. Ответ: { items, next_cursor }.
+        """
+        params = {"limit": limit, "after": after, **filters}
+        return self._get("/users", params={k: v for k, v in params.items() if v is not None})
+
+    def iter_users(self, page_size: int = 100, **filters) -> Iterator[dict]:
+        """
+        Лениво обойти весь список GET /users: следующая страница запрашивается
+        по next_cursor только когда закончилась текущая.
+        """
+        after = None
+        while True:
+            response = self.list_users(limit=page_size, after=after, **filters)
+            response.raise_for_status()
+            page = response.json()
+            yield from page["items"]
+            after = page["next_cursor"]
+            if after is None:
+                return
 
-    def partial_update_user(self, user_id: int, payload: dict):
-        """PATCH /users/{user_id} — частичное обновление пользователя."""
-        return self._patch(f"/users/{user_id}", json=payload)
+    def export_users(self, **filters) -> Iterator[dict]:
+        """GET /users?format=ndjson — потоковая выгрузка: тело читается построчно, не целиком."""
+        params = {"format": "ndjson", **{k: v for k, v in filters.items() if v is not None}}
+        with self._get_stream("/users", params=params) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
 
-    def delete_user(self, user_id: int):
-        """DELETE /users/{user_id} — удалить пользователя по id."""
-        return self._delete(f"/users/{user_id}")
+    def iter_changes(self, after: int | None = None, reconnect: bool = True,
+                     read_timeout: float = 60.0, retry_delay: float = 1.0) -> Iterator[dict]:
+        """
+        GET /users/changes — изменения пользователей по мере появления (Server-Sent Events):
+        { id, op (insert/update/delete), user_id, version, changed_at }.
+        after — id последнего обработанного события: сначала придут пропущенные (None — только новые).
+        reconnect — при обрыве, тишине дольше read_timeout (больше USER_CHANGES_KEEPALIVE),
+        закрытии потока сервером или 502/503/504 переподключаться через retry_delay
+        с Last-Event-ID. Доставка «хотя бы один раз»: повторы отбрасывайте по id.
+        """
+        last_id = after
+        while True:
+            headers = {"Last-Event-ID": str(last_id)} if last_id is not None else None
+            try:
+                with self._get_stream("/users/changes", headers=headers,
+                                      timeout=read_timeout) as response:
+                    if not (reconnect and response.status_code in RETRY_STATUSES):
+                        response.raise_for_status()
+                        # chunk_size=None — по кускам, как их отправил сервер, без ожидания 512 байт
+                        lines = response.iter_lines(chunk_size=None, decode_unicode=True)
+                        for change in _parse_events(lines):
+                            last_id = max(last_id or 0, change["id"])
+                            yield change
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if not reconnect:
+                    raise
+            if not reconnect:
+                return
+            time.sleep(retry_delay)
@@ -4,6 +4,8 @@
 """
 
 from functools import lru_cache
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,12 +27,133 @@ class Settings(BaseSettings):
         default="http://localhost:3000",
         description="Base URL API для тестов",
     )
+    # Как тесты обращаются к API: http — по сети к API_BASE_URL, asgi — в приложение в том же
+    # процессе без сервера (src/clients/asgi_transport.py); pytest --api-transport переопределяет
+    api_transport: Literal["http", "asgi"] = Field(
+        default="http", description="Транспорт клиента тестов: http или asgi")
+    # Продакшен-запуск (python -m src.app.server): воркеры uvicorn и параметры сокета/HTTP
+    server_host: str = Field(default="127.0.0.1", description="Адрес, который слушает сервер")
+    server_port: int = Field(default=3000, ge=1, le=65535, description="Порт сервера")
+    server_workers: int = Field(
+        default=0, ge=0, description="Число процессов-воркеров (0 — по числу CPU)")
+    server_backlog: int = Field(default=2048, ge=1, description="Очередь входящих соединений (listen)")
+    server_keepalive_timeout: float = Field(
+        default=5.0, ge=0, description="Сколько держать простаивающее keep-alive соединение, сек")
+    server_graceful_timeout: float = Field(
+        default=30.0, ge=0, description="Сколько ждать завершения запросов при остановке, сек")
+    server_loop: Literal["auto", "asyncio", "uvloop"] = Field(
+        default="auto", description="Event loop воркеров (auto — uvloop, если установлен)")
+    server_http: Literal["auto", "h11", "httptools"] = Field(
+        default="auto", description="HTTP-парсер (auto — httptools, если установлен)")
+    server_access_log: bool = Field(default=False, description="Писать access log uvicorn")
+    # Общий лимит соединений к PostgreSQL на все воркеры: размер пула воркера = бюджет / воркеры.
+    # 0 — у каждого воркера свой пул DB_POOL_MAX_SIZE (итого воркеры × DB_POOL_MAX_SIZE)
+    db_connection_budget: int = Field(
+        default=80, ge=0,
+        description="Соединений к БД на весь сервер, ниже max_connections PostgreSQL (0 — без лимита)")
     # Параметры подключения к PostgreSQL (для приложения и для тестовой очистки данных)
     db_host: str = Field(default="localhost", description="PostgreSQL host")
     db_port: int = Field(default=5432, ge=1, le=65535, description="PostgreSQL port")
     db_name: str = Field(default="api", description="PostgreSQL database name")
     db_user: str = Field(default="api_user", description="PostgreSQL user")
     db_password: str = Field(default="api_pass", description="PostgreSQL password")
+    # Драйвер БД для роутера /users: psycopg2 — синхронные хендлеры в threadpool,
+    # asyncpg — асинхронные хендлеры в event loop (src/app/routers/users_async.py)
+    db_driver: Literal["psycopg2", "asyncpg"] = Field(
+        default="psycopg2", description="Драйвер PostgreSQL приложения")
+    # Хранилище пользователей (src/app/repository.py): postgres или memory — в памяти процесса,
+    # без БД (замер накладных расходов фреймворка, тесты без PostgreSQL); всегда sync-роутер
+    user_repository: Literal["postgres", "memory"] = Field(
+        default="postgres", description="Хранилище пользователей: postgres или memory")
+    # Пул подключений приложения (src/app/pool.py или пул asyncpg): один пул на процесс
+    db_pool_min_size: int = Field(default=1, ge=0, description="Соединений, открываемых на старте")
+    db_pool_max_size: int = Field(default=10, ge=1, description="Максимум соединений в пуле")
+    db_pool_timeout: float = Field(
+        default=5.0, gt=0, description="Сколько ждать свободное соединение, сек")
+    db_pool_max_lifetime: float = Field(
+        default=1800.0, ge=0, description="Время жизни соединения, сек (0 — без ограничения)")
+    db_pool_check_on_checkout: bool = Field(
+        default=True, description="Проверять соединение (SELECT 1) при выдаче из пула")
+    db_pool_check_idle_after: float = Field(
+        default=30.0, ge=0,
+        description="Проверять только соединения, простоявшие в пуле дольше, сек (0 — каждую выдачу)")
+    # statement_timeout соединений приложения: запрос дольше — отмена и 503 (src/app/errors.py)
+    db_statement_timeout: float = Field(
+        default=0.0, ge=0, description="Таймаут одного SQL-запроса, сек (0 — без ограничения)")
+    # PREPARE/EXECUTE для запросов из src/db/statements.py (выключить за pgbouncer в transaction mode)
+    db_prepared_statements: bool = Field(
+        default=True, description="Использовать серверные prepared statements (psycopg2)")
+    # NDJSON-выгрузка GET /users: сколько строк забирать с серверного курсора за раз
+    users_export_fetch_size: int = Field(
+        default=2000, ge=1, description="Строк за один fetch серверного курсора")
+    # Read-through кэш GET /users/{id} (src/app/cache.py). Кэш — на процесс: при нескольких
+    # воркерах изменения, сделанные через другой воркер, видны не позже чем через TTL
+    user_cache_enabled: bool = Field(default=False, description="Включить кэш пользователей")
+    user_cache_max_size: int = Field(default=10000, ge=1, description="Максимум записей (LRU)")
+    user_cache_ttl: float = Field(default=30.0, gt=0, description="Время жизни записи, сек")
+    user_cache_backend: str = Field(
+        default="memory", description="'memory' или 'package.module:Class' (CacheBackend)")
+    # Сброс нагрузки (src/app/limiter.py): не больше CONCURRENCY_LIMIT запросов в обработке на процесс,
+    # до CONCURRENCY_QUEUE_SIZE ждут слот не дольше CONCURRENCY_QUEUE_TIMEOUT, остальным — сразу 503
+    concurrency_limit: int = Field(
+        default=0, ge=0, description="Запросов в обработке на процесс (0 — без ограничения)")
+    concurrency_queue_size: int = Field(
+        default=100, ge=0, description="Сколько запросов может ждать свободный слот")
+    concurrency_queue_timeout: float = Field(
+        default=1.0, ge=0, description="Сколько запрос ждёт слот до 503, сек")
+    # Retry-After в ответах 503 (перегрузка: лимит запросов, пул, statement_timeout, БД недоступна)
+    overload_retry_after: int = Field(default=1, ge=0, description="Retry-After для 503, сек")
+    # Idempotency-Key в POST /users (src/app/idempotency.py): сколько хранить ключ и ответ на него
+    idempotency_key_ttl: float = Field(
+        default=86400.0, gt=0, description="Время жизни ключа идемпотентности, сек")
+    # Group commit для POST /users (src/app/group_commit.py): параллельные создания собираются
+    # в пачку до GROUP_COMMIT_MAX_BATCH запросов или GROUP_COMMIT_MAX_WAIT и вставляются одной транзакцией
+    group_commit_enabled: bool = Field(
+        default=False, description="Объединять параллельные POST /users в одну транзакцию")
+    group_commit_max_batch: int = Field(
+        default=100, ge=1, le=1000, description="Максимум запросов в одной пачке")
+    group_commit_max_wait: float = Field(
+        default=0.002, ge=0, description="Сколько первый запрос пачки ждёт остальных, сек")
+    # Ответы с пользователями сериализуются напрямую из строк БД, без повторной валидации
+    # по response_model (src/app/serialization.py); JSON побайтно тот же
+    fast_responses: bool = Field(
+        default=False, description="Быстрая сериализация ответов /users без валидации")
+    # Сжатие ответов по Accept-Encoding (src/app/compression.py): кодеки в порядке предпочтения
+    # (недоступные в окружении пропускаются), порог размера и уровни сжатия
+    compression_enabled: bool = Field(default=True, description="Сжимать ответы (gzip/zstd/br)")
+    compression_minimum_size: int = Field(
+        default=1024, ge=0, description="Не сжимать ответы меньше этого размера, байт")
+    compression_encodings: str = Field(
+        default="zstd,br,gzip", description="Кодеки через запятую, в порядке предпочтения")
+    compression_gzip_level: int = Field(default=5, ge=1, le=9, description="Уровень gzip")
+    compression_zstd_level: int = Field(default=3, ge=1, le=22, description="Уровень zstd")
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11, description="Качество brotli")
+    # Метрики (src/app/metrics.py): GET /metrics в формате Prometheus и заголовок Server-Timing
+    metrics_enabled: bool = Field(default=False, description="Собирать метрики и отдавать /metrics")
+    # Служебные эндпоинты (src/app/admin_auth.py): /admin подключается только при ADMIN_ENABLED;
+    # с ADMIN_TOKEN /admin и /metrics требуют Authorization: Bearer <token>
+    admin_enabled: bool = Field(
+        default=False, description="Подключить /admin (пул, кэш, медленные запросы)")
+    admin_token: str = Field(
+        default="", description="Bearer-токен для /admin и /metrics (пусто — без проверки)")
+    server_timing_enabled: bool = Field(
+        default=False, description="Добавлять в ответы Server-Timing (app и db, мс) для отладки")
+    # Лента изменений GET /users/changes (src/app/changes.py): LISTEN/NOTIFY → Server-Sent Events
+    user_changes_queue_size: int = Field(
+        default=1000, ge=1,
+        description="Событий в очереди подписчика; переполнение закрывает поток (клиент продолжит по id)")
+    user_changes_keepalive: float = Field(
+        default=15.0, gt=0, description="Интервал комментария-keepalive в потоке SSE, сек")
+    user_changes_retention: float = Field(
+        default=7 * 24 * 3600, ge=0,
+        description="Сколько хранить события для возобновления, сек (0 — не удалять)")
+    # Журнал медленных запросов (src/app/slow_queries.py): GET /admin/slow-queries
+    slow_query_threshold: float = Field(
+        default=0.0, ge=0, description="Запросы к БД дольше, сек, пишутся в журнал (0 — выключен)")
+    slow_query_explain_sample_rate: float = Field(
+        default=0.0, ge=0, le=1, description="Доля медленных запросов, для которых снимается EXPLAIN")
+    slow_query_buffer_size: int = Field(
+        default=100, ge=1, description="Сколько последних медленных запросов хранить")
 
 
 @lru_cache
@@ -40,10 +163,23 @@ def get_settings() -> Settings:
 
 
 # Алиасы для обратной совместимости: from config.settings import API_BASE_URL, DB_HOST, ...
-_settings = get_settings()
-API_BASE_URL = _settings.api_base_url
-DB_HOST = _settings.db_host
-DB_PORT = _settings.db_port
-DB_NAME = _settings.db_name
-DB_USER = _settings.db_user
-DB_PASSWORD = _settings.db_password
+# Вычисляются при первом обращении (module __getattr__), а не при импорте модуля:
+# импорт не читает .env и окружение, Settings() создаётся один раз в get_settings().
+_ALIASES = {
+    "API_BASE_URL": "api_base_url",
+    "DB_HOST": "db_host",
+    "DB_PORT": "db_port",
+    "DB_NAME": "db_name",
+    "DB_USER": "db_user",
+    "DB_PASSWORD": "db_password",
+}
+
+
+def __getattr__(name: str):
+    if name in _ALIASES:
+        return getattr(get_settings(), _ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_ALIASES])
@@ -1,34 +1,117 @@
 """
-Прямые SQL-запросы к таблице users.
+Прямые SQL-запросы к таблице users (тексты запросов — в statements.py).
 Используются в тестах для проверки данных в БД и для cleanup (удаление после теста).
 """
 
+from contextlib import contextmanager
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from typing import Optional
 
+from .statements import (
+    DELETE_USER,
+    DELETE_USERS_BY_EMAIL_LIKE,
+    GET_USER_BY_EMAIL,
+    GET_USER_BY_ID,
+    GET_USERS_BY_EMAILS,
+    Statement,
+    escape_like,
+    execute,
+)
+
+
+def plan_indexes(plan: dict) -> set[str]:
+    """Имена индексов, которые использует план (EXPLAIN (FORMAT JSON), узел «Plan» и потомки)."""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        names |= plan_indexes(child)
+    return names
+
 
 class UsersQueries:
     """Обёртка над psycopg2: выборка и удаление по id. Курсор RealDictCursor — строки как dict."""
 
-    def __init__(self, connection):
-        """connection — уже открытое psycopg2-подключение (из фикстуры db_connection)."""
+    def __init__(self, connection, autocommit: bool = True):
+        """
+        connection — уже открытое psycopg2-подключение (из фикстуры db_connection).
+        autocommit=False — не коммитить после изменений (внутри savepoint(), изменения откатятся).
+        """
         self.connection = connection
+        self.autocommit = autocommit
+
+    def _commit(self) -> None:
+        if self.autocommit:
+            self.connection.commit()
 
     def get_user_by_id(self, user_id: int) -> Optional[dict]:
         """Выбрать одну запись из users по id. Возвращает dict или None."""
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(
-                "SELECT id, email, name, created_at, phone, address, birth_date FROM users WHERE id = %s;",
-                (user_id,),
-            )
+            execute(cursor, GET_USER_BY_ID, (user_id,))
+            return cursor.fetchone()
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        """Пользователь по email без учёта регистра (точное совпадение — первым) или None."""
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            execute(cursor, GET_USER_BY_EMAIL, (email,))
             return cursor.fetchone()
 
+    def get_users_by_emails(self, emails: list[str]) -> list[dict]:
+        """Пользователи по списку email без учёта регистра, по возрастанию id."""
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            execute(cursor, GET_USERS_BY_EMAILS, (emails,))
+            return cursor.fetchall()
+
+    def explain(self, statement: Statement, params=(), analyze: bool = False) -> dict:
+        """
+        План запроса: корневой узел EXPLAIN (FORMAT JSON). Для проверок вида
+        «запрос идёт по индексу»: "users_email_lower_idx" in plan_indexes(plan).
+        analyze=True выполняет запрос (EXPLAIN ANALYZE) — для изменяющих запросов внутри savepoint().
+        """
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN ({options}) {statement.pyformat_sql}", params)
+            return cursor.fetchone()[0][0]["Plan"]
+
     def delete_user_by_id(self, user_id: int) -> None:
         """Удалить запись из users по id. Commit делается здесь (автокоммит не используем)."""
         with self.connection.cursor() as cursor:
-            cursor.execute(
-                "DELETE FROM users WHERE id = %s;",
-                (user_id,),
-            )
-            self.connection.commit()
+            execute(cursor, DELETE_USER, (user_id,))
+            self._commit()
+
+    def delete_users_by_email_prefix(self, prefix: str) -> int:
+        """
+        Удалить всех пользователей, чей email начинается с prefix, одним DELETE
+        (по индексу users_email_pattern_idx). Возвращает число удалённых строк.
+        В ленту изменений (user_changes, NOTIFY) удаление не попадает.
+        """
+        if not prefix:
+            raise ValueError("Empty email prefix would delete all users")
+        with self.connection.cursor() as cursor:
+            # Только на этот DELETE: без commit (savepoint) транзакция продолжается
+            cursor.execute("SET LOCAL app.skip_user_changes = on")
+            execute(cursor, DELETE_USERS_BY_EMAIL_LIKE, (escape_like(prefix) + "%",))
+            deleted = cursor.rowcount
+            cursor.execute("SET LOCAL app.skip_user_changes = off")
+            self._commit()
+        return deleted
+
+    @contextmanager
+    def savepoint(self, name: str = "test_isolation"):
+        """
+        Изоляция через SAVEPOINT: всё, что сделано этим подключением внутри блока,
+        откатывается на выходе. Возвращает UsersQueries без commit на том же подключении.
+        Изменения, сделанные через API, идут через соединения приложения и так не откатываются.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield UsersQueries(self.connection, autocommit=False)
+        finally:
+            if self.connection.closed == 0:
+                try:
+                    with self.connection.cursor() as cursor:
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                        cursor.execute(f"RELEASE SAVEPOINT {name}")
+                except psycopg2.Error:
+                    self.connection.rollback()
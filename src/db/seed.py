@@ -0,0 +1,192 @@
+"""
+Массовое наполнение таблицы users через COPY FROM STDIN — для замеров планов и латентности
+на реалистичном объёме (миллионы строк за минуты, а не построчно через API).
+
+Источник строк — BulkUserGenerator (data/user_factory.py) или файл CSV (с заголовком) / NDJSON.
+Загрузка идёт порциями по --chunk-size строк: каждая порция — свой COPY и commit,
+в памяти держится только текущая порция. С --drop-indexes вторичные индексы
+(кроме PK и UNIQUE) удаляются перед загрузкой и строятся заново после неё.
+Загруженные строки в ленту изменений (user_changes, NOTIFY) не попадают: сессия ставит
+app.skip_user_changes = on, и триггер users_notify_change их пропускает.
+
+Запуск из корня проекта (параметры БД — из .env; для --drop-indexes нужен владелец таблицы):
+    python -m src.db.seed --count 10000000 --drop-indexes
+    python -m src.db.seed --file users.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+import psycopg2
+
+from data.user_factory import USER_DATA_COLUMNS, BulkUserGenerator
+from src.config.settings import get_settings
+
+COPY_SQL = f"COPY users ({', '.join(USER_DATA_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+# Вторичные индексы users: всё, что не обслуживает ограничение (PK, UNIQUE email)
+SECONDARY_INDEXES_SQL = """
+    SELECT i.relname, pg_get_indexdef(i.oid)
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = 'users'::regclass
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+    ORDER BY i.relname
+"""
+
+
+def _connect():
+    s = get_settings()
+    return psycopg2.connect(
+        host=s.db_host, port=s.db_port, dbname=s.db_name, user=s.db_user, password=s.db_password)
+
+
+def read_file_rows(path: Path) -> Iterator[tuple]:
+    """Строки из файла в порядке USER_DATA_COLUMNS: .ndjson/.jsonl — JSON-объекты, иначе CSV с заголовком."""
+    with path.open(encoding="utf-8", newline="") as f:
+        if path.suffix in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    user = json.loads(line)
+                    yield tuple(user.get(column) for column in USER_DATA_COLUMNS)
+        else:
+            for user in csv.DictReader(f):
+                yield tuple(user.get(column) or None for column in USER_DATA_COLUMNS)
+
+
+def iter_chunks(rows: Iterator[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def copy_chunk(cursor, rows: list[tuple]) -> None:
+    """Одна порция: CSV в памяти → COPY FROM STDIN."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(COPY_SQL, buffer)
+
+
+def drop_secondary_indexes(conn) -> list[tuple[str, str]]:
+    """Удалить вторичные индексы users. Возвращает (имя, CREATE INDEX ...) для восстановления."""
+    with conn.cursor() as cur:
+        cur.execute(SECONDARY_INDEXES_SQL)
+        indexes = cur.fetchall()
+        for name, _ in indexes:
+            cur.execute(f'DROP INDEX IF EXISTS "{name}"')
+    conn.commit()
+    return indexes
+
+
+def create_indexes(conn, indexes: list[tuple[str, str]], maintenance_work_mem: str) -> None:
+    """Построить индексы заново (после загрузки — один проход по таблице вместо вставок по строке)."""
+    with conn.cursor() as cur:
+        cur.execute("SET maintenance_work_mem = %s", (maintenance_work_mem,))
+        for name, definition in indexes:
+            started = time.perf_counter()
+            cur.execute(definition)
+            conn.commit()
+            _log(f"index {name} rebuilt in {time.perf_counter() - started:.1f} s")
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _progress(done: int, total: int | None, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0.0
+    if total:
+        eta = (total - done) / rate if rate else 0.0
+        line = f"{done:,}/{total:,} rows ({done / total:.0%}), {rate:,.0f} rows/s, ETA {eta:.0f} s"
+    else:
+        line = f"{done:,} rows, {rate:,.0f} rows/s"
+    print(f"\r{line}", end="", file=sys.stderr, flush=True)
+
+
+def seed(
+        rows: Iterator[tuple],
+        total: int | None = None,
+        chunk_size: int = 50000,
+        drop_indexes: bool = False,
+        maintenance_work_mem: str = "512MB",
+) -> int:
+    """Загрузить строки в users порциями через COPY. Возвращает число загруженных строк."""
+    conn = _connect()
+    try:
+        with conn.cursor() as cur:
+            # Потеря последних коммитов при падении сервера для сидинга не страшна
+            cur.execute("SET synchronous_commit = off")
+            # Триггер ленты изменений пропускает строки сидинга (WHEN в 006_create_user_changes.sql)
+            cur.execute("SET app.skip_user_changes = on")
+        indexes = drop_secondary_indexes(conn) if drop_indexes else []
+        if indexes:
+            _log(f"dropped indexes: {', '.join(name for name, _ in indexes)}")
+
+        done = 0
+        started = time.perf_counter()
+        try:
+            with conn.cursor() as cur:
+                for chunk in iter_chunks(rows, chunk_size):
+                    copy_chunk(cur, chunk)
+                    conn.commit()
+                    done += len(chunk)
+                    _progress(done, total, started)
+        finally:
+            conn.rollback()  # Порция, на которой упал COPY
+            if done:
+                print(file=sys.stderr)
+            if indexes:
+                create_indexes(conn, indexes, maintenance_work_mem)
+
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE users")  # Свежая статистика для планировщика
+        conn.commit()
+        _log(f"loaded {done:,} rows in {time.perf_counter() - started:.1f} s")
+        return done
+    finally:
+        conn.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.db.seed",
+        description="Bulk-load users via COPY FROM STDIN (generated rows or a CSV/NDJSON file).",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--count", type=int, help="Generate this many users (BulkUserGenerator)")
+    source.add_argument("--file", type=Path, help="Load users from CSV (with header) or .ndjson")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per COPY/commit")
+    parser.add_argument("--drop-indexes", action="store_true",
+                        help="Drop secondary indexes before the load and rebuild them after")
+    parser.add_argument("--maintenance-work-mem", default="512MB",
+                        help="maintenance_work_mem for index rebuild")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (with --count)")
+    parser.add_argument("--email-prefix", default="seed_", help="Generated emails: <prefix><n>@...")
+    parser.add_argument("--start", type=int, default=1,
+                        help="Number of the first generated email (to append to an earlier load)")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        rows, total = read_file_rows(args.file), None
+    else:
+        generator = BulkUserGenerator(
+            seed=args.seed, email_prefix=args.email_prefix, batch_size=args.chunk_size)
+        rows, total = generator.iter_rows(args.count, start=args.start), args.count
+
+    try:
+        seed(rows, total, args.chunk_size, args.drop_indexes, args.maintenance_work_mem)
+    except psycopg2.Error as exc:
+        _log(f"seed failed: {exc}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
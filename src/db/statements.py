@@ -0,0 +1,357 @@
+"""
+Единый слой SQL для таблицы users (и idempotency_keys, user_changes): все запросы приложения и тестов объявлены здесь.
+
+Каждый запрос — Statement с именем и текстом в нотации $1..$n:
+- psycopg2 (execute()): на каждом соединении один раз PREPARE <name> AS <sql>,
+  дальше EXECUTE <name>(...) — Postgres не парсит и не планирует запрос заново;
+- asyncpg: текст передаётся как есть, драйвер сам кэширует prepared statements по тексту.
+PATCH не собирает SQL на лету: для каждого набора изменённых полей заранее есть свой Statement.
+Каждый UPDATE увеличивает version; варианты *_IF_MATCH дополнительно проверяют version
+в том же запросе (оптимистичная блокировка: If-Match без чтения перед записью).
+Исключения — запросы переменной формы (batch-вставка, список с фильтрами): обычный execute.
+"""
+
+import re
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import combinations
+from typing import Callable
+
+from src.config.settings import get_settings
+
+# Колонки ответа (UserResponse) — в этом порядке во всех SELECT/RETURNING
+USER_COLUMNS = "id, email, name, created_at, phone, address, birth_date, version"
+# Колонки, которые пишет API (POST/PUT/PATCH), в каноническом порядке
+USER_WRITABLE_FIELDS = ("email", "name", "phone", "address", "birth_date")
+
+
+@dataclass(frozen=True)
+class Statement:
+    """Именованный SQL-запрос с параметрами $1..$n (по порядку)."""
+
+    name: str
+    sql: str
+    param_count: int = field(init=False)
+    pyformat_sql: str = field(init=False)  # Тот же текст с %s — для execute без PREPARE
+    execute_sql: str = field(init=False)  # EXECUTE <name> (%s, ...) для psycopg2
+
+    def __post_init__(self):
+        param_count = len(set(re.findall(r"\$(\d+)", self.sql)))
+        placeholders = ", ".join(["%s"] * param_count)
+        object.__setattr__(self, "param_count", param_count)
+        object.__setattr__(self, "pyformat_sql", re.sub(r"\$\d+", "%s", self.sql))
+        object.__setattr__(
+            self, "execute_sql",
+            f"EXECUTE {self.name} ({placeholders})" if param_count else f"EXECUTE {self.name}")
+
+
+GET_USER_BY_ID = Statement(
+    "users_get_by_id",
+    f"SELECT {USER_COLUMNS} FROM users WHERE id = $1",
+)
+GET_USERS_BY_IDS = Statement(
+    "users_get_by_ids",
+    f"SELECT {USER_COLUMNS} FROM users WHERE id = ANY($1::int[]) ORDER BY id",
+)
+# Поиск по email без учёта регистра — по индексу users_email_lower_idx (lower(email)).
+# Адресов, различающихся только регистром, может быть несколько: точное совпадение — первым.
+# $1 — через подзапрос q, а не дважды: в pyformat_sql каждое $n — отдельный %s.
+GET_USER_BY_EMAIL = Statement(
+    "users_get_by_email",
+    f"SELECT {', '.join(f'u.{c}' for c in USER_COLUMNS.split(', '))} "
+    "FROM (SELECT $1::varchar AS email) AS q JOIN users AS u ON lower(u.email) = lower(q.email) "
+    "ORDER BY u.email = q.email DESC, u.id LIMIT 1",
+)
+# lower() от массива считается один раз (InitPlan), дальше = ANY(...) по тому же индексу
+GET_USERS_BY_EMAILS = Statement(
+    "users_get_by_emails",
+    f"SELECT {USER_COLUMNS} FROM users "
+    "WHERE lower(email) = ANY(ARRAY(SELECT lower(e) FROM unnest($1::varchar[]) AS e)) ORDER BY id",
+)
+INSERT_USER = Statement(
+    "users_insert",
+    "INSERT INTO users (email, name, phone, address, birth_date) "
+    f"VALUES ($1, $2, $3, $4, $5) RETURNING {USER_COLUMNS}",
+)
+UPDATE_USER = Statement(
+    "users_update",
+    "UPDATE users SET email = $1, name = $2, phone = $3, address = $4, birth_date = $5, "
+    f"version = version + 1 WHERE id = $6 RETURNING {USER_COLUMNS}",
+)
+# $7 — допустимые версии из If-Match: строка не совпала → UPDATE не вернёт строк (412)
+UPDATE_USER_IF_MATCH = Statement(
+    "users_update_if_match",
+    "UPDATE users SET email = $1, name = $2, phone = $3, address = $4, birth_date = $5, "
+    f"version = version + 1 WHERE id = $6 AND version = ANY($7::int[]) RETURNING {USER_COLUMNS}",
+)
+DELETE_USER = Statement(
+    "users_delete",
+    "DELETE FROM users WHERE id = $1 RETURNING id",
+)
+DELETE_USER_IF_MATCH = Statement(
+    "users_delete_if_match",
+    "DELETE FROM users WHERE id = $1 AND version = ANY($2::int[]) RETURNING id",
+)
+DELETE_USERS_BY_IDS = Statement(
+    "users_delete_by_ids",
+    "DELETE FROM users WHERE id = ANY($1::int[]) RETURNING id",
+)
+# Очистка тестовых данных: $1 — шаблон LIKE (экранированный префикс + '%')
+DELETE_USERS_BY_EMAIL_LIKE = Statement(
+    "users_delete_by_email_like",
+    "DELETE FROM users WHERE email LIKE $1",
+)
+# Idempotency-Key для POST /users (src/app/idempotency.py). Ключ занимается INSERT-ом;
+# живой чужой ключ → конфликт без UPDATE (0 строк), истёкший — перезанимается.
+# $3 — TTL ключа в секундах.
+CLAIM_IDEMPOTENCY_KEY = Statement(
+    "idempotency_claim",
+    "INSERT INTO idempotency_keys (key, fingerprint, expires_at) "
+    "VALUES ($1, $2, now() + make_interval(secs => $3)) "
+    "ON CONFLICT (key) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, status_code = NULL, "
+    "response_body = NULL, etag = NULL, created_at = now(), expires_at = EXCLUDED.expires_at "
+    "WHERE idempotency_keys.expires_at <= now() RETURNING key",
+)
+SAVE_IDEMPOTENT_RESPONSE = Statement(
+    "idempotency_save",
+    "UPDATE idempotency_keys SET status_code = $2, response_body = $3, etag = $4 WHERE key = $1",
+)
+GET_IDEMPOTENT_RESPONSE = Statement(
+    "idempotency_get",
+    "SELECT fingerprint, status_code, response_body, etag FROM idempotency_keys WHERE key = $1",
+)
+# Удалить не больше $1 истёкших ключей (понемногу на каждый запрос с ключом — без фоновых задач)
+PURGE_IDEMPOTENCY_KEYS = Statement(
+    "idempotency_purge",
+    "DELETE FROM idempotency_keys WHERE key IN ("
+    "SELECT key FROM idempotency_keys WHERE expires_at <= now() "
+    "ORDER BY expires_at LIMIT $1 FOR UPDATE SKIP LOCKED)",
+)
+# Лента изменений (GET /users/changes): догоняющее чтение после Last-Event-ID страницами
+# и удаление старых событий. payload — тот же JSON, что триггер отправляет в NOTIFY.
+GET_USER_CHANGES_AFTER = Statement(
+    "user_changes_after",
+    "SELECT c.id, row_to_json(c)::text AS payload FROM user_changes AS c "
+    "WHERE c.id > $1 ORDER BY c.id LIMIT $2",
+)
+PURGE_USER_CHANGES = Statement(
+    "user_changes_purge",
+    "DELETE FROM user_changes WHERE changed_at < now() - make_interval(secs => $1)",
+)
+# Batch-вставка: psycopg2 — execute_values (VALUES %s), asyncpg — unnest по массивам колонок.
+# Размер batch переменный, поэтому эти запросы не PREPARE-ятся.
+INSERT_USERS_VALUES_SQL = (
+    "INSERT INTO users (email, name, phone, address, birth_date) VALUES %s "
+    f"ON CONFLICT (email) DO NOTHING RETURNING {USER_COLUMNS}"
+)
+INSERT_USERS_UNNEST_SQL = (
+    "INSERT INTO users (email, name, phone, address, birth_date) "
+    "SELECT * FROM unnest("
+    "$1::varchar[], $2::varchar[], $3::varchar[], $4::varchar[], $5::date[]) "
+    f"ON CONFLICT (email) DO NOTHING RETURNING {USER_COLUMNS}"
+)
+
+
+def _build_patch_statements(if_match: bool) -> dict[tuple[str, ...], Statement]:
+    """
+    Все 31 вариант PATCH: ключ — изменённые поля в каноническом порядке USER_WRITABLE_FIELDS.
+    if_match — варианты с проверкой версии (последний параметр — int[] версий из If-Match).
+    """
+    variants = {}
+    for size in range(1, len(USER_WRITABLE_FIELDS) + 1):
+        for fields in combinations(USER_WRITABLE_FIELDS, size):
+            mask = sum(1 << USER_WRITABLE_FIELDS.index(f) for f in fields)
+            assignments = ", ".join(f"{f} = ${i}" for i, f in enumerate(fields, start=1))
+            id_param = len(fields) + 1
+            where = f"id = ${id_param}"
+            if if_match:
+                where += f" AND version = ANY(${id_param + 1}::int[])"
+            variants[fields] = Statement(
+                f"users_patch_{mask}_if_match" if if_match else f"users_patch_{mask}",
+                f"UPDATE users SET {assignments}, version = version + 1 WHERE {where} "
+                f"RETURNING {USER_COLUMNS}",
+            )
+    return variants
+
+
+PATCH_USER_STATEMENTS = _build_patch_statements(if_match=False)
+PATCH_USER_IF_MATCH_STATEMENTS = _build_patch_statements(if_match=True)
+
+
+def patch_statement(data: dict, if_match: bool = False) -> tuple[Statement, list]:
+    """
+    Statement и параметры для PATCH по dict изменённых полей (model_dump(exclude_unset=True)).
+    Оставшиеся параметры (id, затем при if_match — версии) добавляет вызывающий код.
+    """
+    fields = tuple(f for f in USER_WRITABLE_FIELDS if f in data)
+    unknown = set(data) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown user fields: {sorted(unknown)}")
+    variants = PATCH_USER_IF_MATCH_STATEMENTS if if_match else PATCH_USER_STATEMENTS
+    return variants[fields], [data[f] for f in fields]
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """
+    created_at — TIMESTAMP без зоны, время в UTC (timezone БД): время с зоной
+    (2024-01-01T00:00:00Z, ...+03:00) переводится в UTC и теряет зону. asyncpg не сравнивает
+    aware datetime с TIMESTAMP, а psycopg2 сравнивал бы в timezone сессии.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class UserListFilters:
+    """
+    Параметры выборки: курсор и фильтры из query-параметров GET /users.
+    created_from/created_to приводятся к naive UTC (naive_utc) — одинаково для psycopg2,
+    asyncpg и хранилища в памяти.
+    """
+
+    after: int | None = None
+    email_prefix: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "created_from", naive_utc(self.created_from))
+        object.__setattr__(self, "created_to", naive_utc(self.created_to))
+
+
+def psycopg2_placeholder(_n: int) -> str:
+    return "%s"
+
+
+def asyncpg_placeholder(n: int) -> str:
+    return f"${n}"
+
+
+def escape_like(value: str) -> str:
+    """Экранировать спецсимволы LIKE (\\, %, _), чтобы префикс искался буквально."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_list_query(
+        filters: UserListFilters,
+        limit: int | None,
+        placeholder: Callable[[int], str],
+) -> tuple[str, list]:
+    """
+    Собрать SELECT для GET /users: фильтры, ORDER BY id (keyset-пагинация) и LIMIT.
+    Набор условий переменный, поэтому запрос не PREPARE-ится.
+
+    placeholder(n) — плейсхолдер n-го параметра (с 1): "%s" для psycopg2, "$n" для asyncpg.
+    Условия подобраны под индексы: PK (id), users_email_pattern_idx, users_created_at_id_idx.
+    """
+    conditions = []
+    params: list = []
+
+    def add(condition: str, value) -> None:
+        params.append(value)
+        conditions.append(condition.format(placeholder(len(params))))
+
+    if filters.after is not None:
+        add("id > {}", filters.after)
+    if filters.email_prefix:
+        add("email LIKE {}", escape_like(filters.email_prefix) + "%")
+    if filters.created_from is not None:
+        add("created_at >= {}", filters.created_from)
+    if filters.created_to is not None:
+        add("created_at < {}", filters.created_to)
+
+    sql = f"SELECT {USER_COLUMNS} FROM users"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY id"
+    if limit is not None:
+        params.append(limit)
+        sql += f" LIMIT {placeholder(len(params))}"
+    return sql, params
+
+
+# Текст запроса → имя Statement: по нему метрики (src/app/metrics.py) подписывают время запросов.
+# Ключи — все формы текста: $n (asyncpg), %s (psycopg2 без PREPARE), EXECUTE (psycopg2).
+_STATEMENTS = (
+    GET_USER_BY_ID, GET_USERS_BY_IDS, GET_USER_BY_EMAIL, GET_USERS_BY_EMAILS, INSERT_USER,
+    UPDATE_USER, UPDATE_USER_IF_MATCH, DELETE_USER, DELETE_USER_IF_MATCH, DELETE_USERS_BY_IDS,
+    DELETE_USERS_BY_EMAIL_LIKE,
+    CLAIM_IDEMPOTENCY_KEY, SAVE_IDEMPOTENT_RESPONSE, GET_IDEMPOTENT_RESPONSE,
+    PURGE_IDEMPOTENCY_KEYS, GET_USER_CHANGES_AFTER, PURGE_USER_CHANGES,
+    *PATCH_USER_STATEMENTS.values(), *PATCH_USER_IF_MATCH_STATEMENTS.values(),
+)
+_STATEMENT_NAMES = {
+    sql: statement.name
+    for statement in _STATEMENTS
+    for sql in (statement.sql, statement.pyformat_sql, statement.execute_sql)
+}
+# Тексты SELECT-statement-ов во всех формах: их можно повторить под EXPLAIN ANALYZE
+_READ_ONLY_SQL = frozenset(
+    sql
+    for statement in _STATEMENTS if statement.sql.startswith("SELECT")
+    for sql in (statement.sql, statement.pyformat_sql, statement.execute_sql)
+)
+
+# EXECUTE <name>(...) → текст запроса с %s: подготовлен он только на своём соединении
+_PYFORMAT_SQL = {statement.execute_sql: statement.pyformat_sql for statement in _STATEMENTS}
+
+
+def statement_label(sql: str | bytes) -> str:
+    """
+    Короткая метка запроса: имя Statement, 'prepare' для PREPARE
+    или первое слово SQL для остальных (select, insert, ...).
+    bytes — запрос, уже собранный psycopg2 (execute_values): смотрим только начало.
+    """
+    if isinstance(sql, bytes):
+        sql = sql[:32].decode("ascii", "ignore")
+    else:
+        name = _STATEMENT_NAMES.get(sql)
+        if name is not None:
+            return name
+    words = sql.split(None, 1)
+    if not words:
+        return "empty"
+    return "prepare" if words[0] == "PREPARE" else words[0].rstrip(";").lower()
+
+
+def is_read_only(sql: str | bytes) -> bool:
+    """
+    Запрос только читает (SELECT, в том числе EXECUTE подготовленного SELECT): его можно
+    выполнить ещё раз под EXPLAIN ANALYZE без побочных эффектов.
+    """
+    if isinstance(sql, bytes):
+        return False  # execute_values — multi-row INSERT
+    return sql in _READ_ONLY_SQL or sql.lstrip()[:6].upper() == "SELECT"
+
+
+def unprepared_sql(sql: str) -> str:
+    """Запрос без EXECUTE подготовленного Statement — для выполнения на другом соединении."""
+    return _PYFORMAT_SQL.get(sql, sql)
+
+
+# Имена уже подготовленных на соединении statement-ов. Соединения живут в пуле,
+# поэтому PREPARE выполняется один раз на соединение, а не на запрос.
+_prepared: "weakref.WeakKeyDictionary[object, set[str]]" = weakref.WeakKeyDictionary()
+
+
+def execute(cur, statement: Statement, params=()) -> None:
+    """
+    Выполнить Statement на psycopg2-курсоре: EXECUTE подготовленного запроса
+    (PREPARE при первом использовании на соединении) или обычный execute,
+    если DB_PREPARED_STATEMENTS=false (например, за pgbouncer в transaction-режиме).
+    """
+    if len(params) != statement.param_count:
+        raise ValueError(
+            f"{statement.name} expects {statement.param_count} params, got {len(params)}")
+    if not get_settings().db_prepared_statements:
+        cur.execute(statement.pyformat_sql, params)
+        return
+
+    conn = cur.connection
+    prepared = _prepared.setdefault(conn, set())
+    if statement.name not in prepared:
+        cur.execute(f"PREPARE {statement.name} AS {statement.sql}")
+        prepared.add(statement.name)
+    cur.execute(statement.execute_sql, params)
@@ -0,0 +1,64 @@
+"""
+Точка входа нагрузочного прогона.
+
+Запуск из корня проекта (API и PostgreSQL должны быть подняты):
+    python -m src.loadtest --duration 30 --workers 16 --mix get=80,patch=15,create_delete=5
+    python -m src.loadtest --rps 500 --workers 64 --json loadtest.json
+
+По умолчанию base URL — API_BASE_URL из .env.
+"""
+
+import argparse
+import json
+import sys
+
+from src.config.settings import get_settings
+
+from .report import format_report
+from .runner import OPERATIONS, LoadTest, LoadTestConfig, parse_mix
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest",
+        description="Load test for the /users API: CRUD mix, latency percentiles per endpoint.",
+    )
+    parser.add_argument("--base-url", default=None, help="API URL (default: API_BASE_URL)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="Concurrent workers (closed loop) / max in-flight (open loop)")
+    parser.add_argument("--rps", type=float, default=None,
+                        help="Target requests/sec: enables open loop mode")
+    parser.add_argument("--mix", default="get=80,patch=15,create_delete=5",
+                        help=f"Operation weights, operations: {', '.join(OPERATIONS)}")
+    parser.add_argument("--seed-users", type=int, default=200,
+                        help="Users created before the run for GET/PATCH/PUT")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for the operation mix")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Write the JSON report to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        base_url=args.base_url or get_settings().api_base_url,
+        mix=parse_mix(args.mix),
+        duration=args.duration,
+        workers=args.workers,
+        rps=args.rps,
+        seed_users=args.seed_users,
+        seed=args.seed,
+    )
+    report = LoadTest(config).run()
+
+    if args.json_path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report))
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Отчёт нагрузочного прогона: перцентили латентности, throughput и доля ошибок по эндпоинтам.
+"""
+
+import math
+from dataclasses import asdict
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль q (0..100) по уже отсортированному списку (nearest-rank)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        # Латентность в миллисекундах
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def build_report(config, elapsed: float, latencies: dict, errors: dict) -> dict:
+    """Собрать JSON-совместимый отчёт: конфиг прогона, итог и разбивка по эндпоинтам."""
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "config": {**asdict(config), "mode": "open" if config.rps else "closed"},
+        "elapsed_s": round(elapsed, 3),
+        "total": _summary(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {
+            endpoint: _summary(values, errors.get(endpoint, 0), elapsed)
+            for endpoint, values in sorted(latencies.items())
+        },
+    }
+
+
+def format_report(report: dict) -> str:
+    """Текстовая сводка отчёта — таблица по эндпоинтам."""
+    config = report["config"]
+    mix = ", ".join(f"{op}={weight:.0%}" for op, weight in config["mix"].items())
+    mode = f"open loop, target {config['rps']} rps" if config["rps"] else "closed loop"
+    lines = [
+        f"Load test against {config['base_url']}: {mode}, {config['workers']} workers, "
+        f"{report['elapsed_s']}s",
+        f"Mix: {mix}",
+        "",
+        f"{'endpoint':<22}{'count':>8}{'rps':>10}{'err%':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for endpoint, s in rows:
+        lines.append(
+            f"{endpoint:<22}{s['count']:>8}{s['throughput_rps']:>10.1f}"
+            f"{s['error_rate'] * 100:>8.2f}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+            f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
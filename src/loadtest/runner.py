@@ -0,0 +1,212 @@
+"""
+Нагрузочный прогон API через UsersClient: смесь CRUD-операций, замер латентности по эндпоинтам.
+
+Два режима:
+- closed loop — N воркеров, каждый шлёт следующий запрос сразу после ответа на предыдущий;
+- open loop — запросы стартуют по расписанию с заданным RPS независимо от ответов
+  (латентность считается от запланированного момента старта, поэтому очередь
+  на стороне клиента, если сервер не успевает, тоже попадает в перцентили).
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from data.user_factory import UserFactory
+from src.clients.users_client import UsersClient
+
+from .report import build_report
+
+# Операции смеси и метки эндпоинтов в отчёте
+OPERATIONS = ("get", "patch", "put", "create_delete")
+ENDPOINT_GET = "GET /users/{id}"
+ENDPOINT_PATCH = "PATCH /users/{id}"
+ENDPOINT_PUT = "PUT /users/{id}"
+ENDPOINT_POST = "POST /users"
+ENDPOINT_DELETE = "DELETE /users/{id}"
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """'get=80,patch=15,create_delete=5' → {'get': 0.8, 'patch': 0.15, 'create_delete': 0.05}."""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {OPERATIONS}")
+        weights[name] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must sum to a positive number")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+@dataclass
+class LoadTestConfig:
+    base_url: str
+    mix: dict[str, float]
+    duration: float = 30.0
+    workers: int = 16
+    rps: float | None = None  # None — closed loop, иначе open loop с этим RPS
+    seed_users: int = 200
+    seed: int | None = None
+
+
+@dataclass
+class _Samples:
+    """Сырые замеры одного потока: латентности (сек) и ошибки по эндпоинтам."""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def merge(self, other: "_Samples") -> None:
+        for endpoint, values in other.latencies.items():
+            self.latencies[endpoint].extend(values)
+        for endpoint, count in other.errors.items():
+            self.errors[endpoint] += count
+
+
+class LoadTest:
+    """Подготовка данных, прогон смеси операций и сбор отчёта."""
+
+    def __init__(self, config: LoadTestConfig):
+        self.config = config
+        self.factory = UserFactory()
+        self.run_id = uuid.uuid4().hex[:8]
+        self.user_ids: list[int] = []
+        self._email_counter = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._samples: list[_Samples] = []
+        self._rng = random.Random(config.seed)  # Источник seed-ов для RNG потоков
+        ops, weights = zip(*config.mix.items())
+        self._ops, self._weights = list(ops), list(weights)
+
+    # --- данные ---
+
+    def _payload(self) -> dict:
+        """Данные пользователя из UserFactory с гарантированно уникальным email."""
+        with self._lock:
+            self._email_counter += 1
+            n = self._email_counter
+        return self.factory.generate_single_user_data(
+            email=f"loadtest_{self.run_id}_{n}@example.com")
+
+    def setup(self) -> None:
+        """Создать пул пользователей для GET/PATCH/PUT одним batch-запросом на каждые 1000."""
+        client = UsersClient(self.config.base_url)
+        remaining = self.config.seed_users
+        while remaining > 0:
+            size = min(remaining, 1000)
+            response = client.create_users_batch([self._payload() for _ in range(size)])
+            response.raise_for_status()
+            self.user_ids.extend(
+                item["user"]["id"] for item in response.json()["items"] if item["user"])
+            remaining -= size
+        if not self.user_ids and {"get", "patch", "put"} & set(self._ops):
+            raise RuntimeError("Could not seed users for the load test")
+
+    def teardown(self) -> None:
+        """Удалить созданных в setup пользователей."""
+        client = UsersClient(self.config.base_url)
+        for i in range(0, len(self.user_ids), 1000):
+            client.delete_users_batch(self.user_ids[i:i + 1000])
+
+    # --- выполнение операций ---
+
+    def _worker_state(self) -> tuple[UsersClient, _Samples, random.Random]:
+        """Клиент (своя requests.Session), замеры и RNG — на поток."""
+        state = getattr(self._local, "state", None)
+        if state is None:
+            with self._lock:
+                state = (UsersClient(self.config.base_url), _Samples(),
+                         random.Random(self._rng.random()))
+                self._samples.append(state[1])
+            self._local.state = state
+        return state
+
+    @staticmethod
+    def _call(samples: _Samples, endpoint: str, expected: int, started: float, request):
+        try:
+            response = request()
+        except Exception:
+            response = None
+        samples.latencies[endpoint].append(time.perf_counter() - started)
+        if response is None or response.status_code != expected:
+            samples.errors[endpoint] += 1
+        return response
+
+    def _run_one(self, scheduled: float | None = None) -> None:
+        """Одна операция смеси. scheduled — запланированное время старта (open loop)."""
+        client, samples, rnd = self._worker_state()
+        op = rnd.choices(self._ops, self._weights)[0]
+        started = scheduled if scheduled is not None else time.perf_counter()
+
+        if op == "get":
+            user_id = rnd.choice(self.user_ids)
+            self._call(samples, ENDPOINT_GET, 200, started, lambda: client.get_user(user_id))
+        elif op == "patch":
+            user_id = rnd.choice(self.user_ids)
+            payload = {"name": self.factory.fake.first_name()}
+            self._call(samples, ENDPOINT_PATCH, 200, started,
+                       lambda: client.partial_update_user(user_id, payload))
+        elif op == "put":
+            user_id = rnd.choice(self.user_ids)
+            payload = self._payload()
+            self._call(samples, ENDPOINT_PUT, 200, started,
+                       lambda: client.update_user(user_id, payload))
+        else:
+            payload = self._payload()
+            response = self._call(samples, ENDPOINT_POST, 201, started,
+                                  lambda: client.create_user(payload))
+            if response is not None and response.status_code == 201:
+                user_id = response.json()["id"]
+                self._call(samples, ENDPOINT_DELETE, 204, time.perf_counter(),
+                           lambda: client.delete_user(user_id))
+
+    def _run_closed_loop(self, deadline: float) -> None:
+        def worker():
+            while time.perf_counter() < deadline:
+                self._run_one()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.config.workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _run_open_loop(self, started: float, deadline: float) -> None:
+        interval = 1.0 / self.config.rps
+        with ThreadPoolExecutor(max_workers=self.config.workers) as executor:
+            n = 0
+            while True:
+                scheduled = started + n * interval
+                if scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._run_one, scheduled)
+                n += 1
+
+    def run(self) -> dict:
+        """Полный прогон: setup → нагрузка → teardown. Возвращает отчёт (см. report.build_report)."""
+        self.setup()
+        try:
+            started = time.perf_counter()
+            deadline = started + self.config.duration
+            if self.config.rps:
+                self._run_open_loop(started, deadline)
+            else:
+                self._run_closed_loop(deadline)
+            elapsed = time.perf_counter() - started
+        finally:
+            self.teardown()
+
+        merged = _Samples()
+        for samples in self._samples:
+            merged.merge(samples)
+        return build_report(self.config, elapsed, merged.latencies, merged.errors)
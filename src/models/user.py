@@ -25,3 +25,5 @@ class UserResponse(BaseModel):
         None, max_length=255, description="Address, nullable")
     birth_date: datetime | None = Field(
         None, description="Birth date, nullable")
+    version: int = Field(
+        ..., ge=1, description="Row version, +1 on every update (ETag / If-Match)")
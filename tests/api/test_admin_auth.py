@@ -0,0 +1,61 @@
+"""
+Служебные эндпоинты (/admin, /metrics): по умолчанию не подключены, а с ADMIN_TOKEN
+отвечают только на Authorization: Bearer <ADMIN_TOKEN>.
+"""
+
+import pytest
+from fastapi import FastAPI
+
+from app.routers import admin, metrics
+from clients.api_client import BaseApiClient
+from clients.asgi_transport import ASGIAdapter
+from config.settings import Settings
+
+TOKEN = "s3cret-admin-token"
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.include_router(metrics.router)
+    client = BaseApiClient("http://testserver", transport=ASGIAdapter(app))
+    yield client
+    client.session.close()
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    from src.config.settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "admin_token", TOKEN)
+
+
+def test_admin_and_metrics_are_off_by_default():
+    fields = Settings.model_fields
+    assert fields["admin_enabled"].default is False
+    assert fields["metrics_enabled"].default is False
+    assert fields["admin_token"].default == ""
+
+
+@pytest.mark.parametrize("path", ["/admin/cache", "/metrics"])
+def test_without_admin_token_setting_no_auth_is_needed(client, path):
+    assert client._get(path).status_code == 200
+
+
+@pytest.mark.parametrize("method, path", [
+    ("GET", "/admin/cache"), ("DELETE", "/admin/cache"), ("GET", "/admin/slow-queries"),
+    ("DELETE", "/admin/slow-queries"), ("GET", "/metrics"),
+])
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong-token", TOKEN, f"Basic {TOKEN}"])
+def test_admin_token_is_required(client, admin_token, method, path, authorization):
+    headers = {"Authorization": authorization} if authorization else {}
+    response = client.session.request(method, client.base_url + path, headers=headers)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+@pytest.mark.parametrize("path", ["/admin/cache", "/metrics"])
+def test_admin_token_grants_access(client, admin_token, path):
+    response = client.session.get(client.base_url + path, headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 200
@@ -0,0 +1,82 @@
+"""
+Транспорт ASGI (src/clients/asgi_transport.py): lifespan стартует лениво,
+потоковый ответ читается по кускам, не дожидаясь конца тела.
+"""
+
+import threading
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+import requests
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from clients.api_client import BaseApiClient
+from clients.asgi_transport import ASGIAdapter
+
+BASE_URL = "http://testserver"
+
+
+def _app(events: list[str], release: threading.Event) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(_app):
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            yield b"first\n"
+            # Второй кусок — только после того, как клиент прочитал первый
+            await anyio.to_thread.run_sync(release.wait, 5)
+            yield b"second\n"
+
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    @app.get("/hang")
+    async def hang():
+        await anyio.sleep(60)
+
+    return app
+
+
+@pytest.fixture
+def asgi():
+    events: list[str] = []
+    release = threading.Event()
+    adapter = ASGIAdapter(_app(events, release))
+    client = BaseApiClient(BASE_URL, transport=adapter)
+    yield client, events, release
+    client.session.close()
+
+
+def test_lifespan_starts_on_first_request_and_stops_on_close(asgi):
+    client, events, _ = asgi
+    assert events == []
+    assert client._get("/ping").json() == {"ok": True}
+    assert events == ["startup"]
+    client.session.close()
+    assert events == ["startup", "shutdown"]
+
+
+def test_stream_is_read_chunk_by_chunk(asgi):
+    client, _, release = asgi
+    with client._get_stream("/stream", timeout=5) as response:
+        lines = response.iter_lines(chunk_size=None)
+        assert next(lines) == b"first"
+        release.set()
+        assert next(lines) == b"second"
+
+
+def test_read_timeout(asgi):
+    client, _, _ = asgi
+    with pytest.raises(requests.Timeout):
+        client._get_stream("/hang", timeout=0.2)
@@ -0,0 +1,53 @@
+"""
+AsyncUsersClient (src/clients/async_users_client.py): заголовки вызывающего (headers=)
+объединяются с If-Match и Idempotency-Key, а не конфликтуют с ними.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from clients.async_users_client import AsyncUsersClient
+
+BASE_URL = "http://testserver"
+ETAG = '"3"'
+
+
+@pytest.fixture
+def sent_headers():
+    """Клиент, запросы которого не уходят в сеть, и заголовки последнего запроса."""
+    sent: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers)
+        return httpx.Response(200, json={})
+
+    client = AsyncUsersClient(BASE_URL, retries=0)
+    client.client = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+    yield client, sent
+    asyncio.run(client.aclose())
+
+
+@pytest.mark.parametrize("call", [
+    lambda client, **kw: client.update_user(1, {"email": "a@example.com"}, **kw),
+    lambda client, **kw: client.partial_update_user(1, {"name": "A"}, **kw),
+    lambda client, **kw: client.delete_user(1, **kw),
+], ids=["put", "patch", "delete"])
+def test_if_match_merges_with_caller_headers(sent_headers, call):
+    client, sent = sent_headers
+
+    asyncio.run(call(client, if_match=ETAG, headers={"X-Request-ID": "req-1"}))
+    asyncio.run(call(client, headers={"X-Request-ID": "req-2"}))
+
+    assert sent[0]["If-Match"] == ETAG and sent[0]["X-Request-ID"] == "req-1"
+    assert "If-Match" not in sent[1] and sent[1]["X-Request-ID"] == "req-2"
+
+
+def test_idempotency_key_merges_with_caller_headers(sent_headers):
+    client, sent = sent_headers
+
+    asyncio.run(client.create_user({"email": "a@example.com"}, idempotency_key="key-1",
+                                   headers={"X-Request-ID": "req-1"}))
+
+    assert sent[0]["Idempotency-Key"] == "key-1" and sent[0]["X-Request-ID"] == "req-1"
@@ -0,0 +1,70 @@
+"""
+Сжатие ответов (src/app/compression.py): у сжатого ответа свой ETag с суффиксом кодека,
+Accept-Encoding дописывается в уже заданный Vary, а не вторым заголовком.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.compression import CompressionMiddleware
+from app.etag import etag_matches, if_match_versions
+from clients.api_client import BaseApiClient
+from clients.asgi_transport import ASGIAdapter
+
+BODY = {"name": "x" * 2048}  # Больше COMPRESSION_MINIMUM_SIZE
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/user")
+    async def user():
+        return JSONResponse(BODY, headers={"ETag": '"3"', "Vary": "Origin"})
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"name": "x"}, headers={"ETag": '"3"'})
+
+    @app.get("/varies")
+    async def varies():
+        return JSONResponse(BODY, headers={"Vary": "accept-encoding, Origin"})
+
+    app.add_middleware(CompressionMiddleware)
+    return app
+
+
+@pytest.fixture(scope="module")
+def client():
+    client = BaseApiClient("http://testserver", transport=ASGIAdapter(_app()))
+    client.session.headers["Accept-Encoding"] = "gzip"
+    yield client
+    client.session.close()
+
+
+def test_compressed_response_has_coding_etag_and_one_vary(client):
+    response = client._get("/user")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == BODY
+    assert response.headers["ETag"] == '"3-gzip"'
+    assert response.raw.headers.getlist("Vary") == ["Origin, Accept-Encoding"]
+
+
+def test_existing_accept_encoding_in_vary_is_not_repeated(client):
+    response = client._get("/varies")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.raw.headers.getlist("Vary") == ["accept-encoding, Origin"]
+
+
+def test_uncompressed_response_keeps_identity_etag(client):
+    response = client._get("/small")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"3"'
+
+
+def test_conditional_headers_compare_version_without_coding():
+    assert if_match_versions('"3-gzip", "4-zstd", "5"') == [3, 4, 5]
+    assert if_match_versions('"3-deflate", W/"3-gzip"') == []
+    assert etag_matches('"3-gzip"', '"3"')
+    assert etag_matches('W/"3-br"', '"3-gzip"')
+    assert not etag_matches('"4-gzip"', '"3"')
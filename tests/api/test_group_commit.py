@@ -0,0 +1,103 @@
+"""
+Group commit POST /users (GROUP_COMMIT_ENABLED, оба роутера): параллельные создания
+вставляются одной пачкой, результат раскладывается по запросам — 201 или 409 каждому
+своё, общая ошибка вставки — всем.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+MAX_WAIT = 2.0  # Пачки в тестах закрываются заполнением, а не по таймауту
+
+
+class _Inserts:
+    """Вставки пачек: payloads каждой пачки; error — исключение вместо вставки."""
+
+    def __init__(self):
+        self.batches: list[list] = []
+        self.error: Exception | None = None
+
+    def wrap_sync(self, insert_users):
+        def insert(payloads):
+            self.batches.append(list(payloads))
+            if self.error is not None:
+                raise self.error
+            return insert_users(payloads)
+
+        return insert
+
+    def wrap_async(self, insert_users):
+        async def insert(payloads):
+            self.batches.append(list(payloads))
+            if self.error is not None:
+                raise self.error
+            return await insert_users(payloads)
+
+        return insert
+
+
+@pytest.fixture
+def group_commit(driver_client, monkeypatch):
+    """Включить group commit (GROUP_COMMIT_MAX_BATCH задаёт тест) и записывать вставки пачек."""
+    from app.routers import users, users_async
+    from src.config.settings import get_settings
+
+    def enable(max_batch: int) -> _Inserts:
+        settings = get_settings()
+        monkeypatch.setattr(settings, "group_commit_enabled", True)
+        monkeypatch.setattr(settings, "group_commit_max_batch", max_batch)
+        monkeypatch.setattr(settings, "group_commit_max_wait", MAX_WAIT)
+        inserts = _Inserts()
+        for router, wrap in ((users, inserts.wrap_sync), (users_async, inserts.wrap_async)):
+            router._group_committer.cache_clear()
+            committer = router._group_committer()
+            committer._insert_users = wrap(committer._insert_users)
+        return inserts
+
+    yield enable
+    users._group_committer.cache_clear()
+    users_async._group_committer.cache_clear()
+
+
+def _create_concurrently(client, payloads: list[dict]) -> list:
+    with ThreadPoolExecutor(len(payloads)) as pool:
+        return list(pool.map(client.create_user, payloads))
+
+
+def test_duplicate_email_in_batch_gets_409_others_201(driver_client, group_commit, test_data):
+    inserts = group_commit(max_batch=8)
+    duplicate = test_data.user_payload()
+    payloads = [test_data.user_payload() for _ in range(5)] + [duplicate] * 3
+
+    responses = _create_concurrently(driver_client, payloads)
+
+    assert [len(batch) for batch in inserts.batches] == [8]
+    assert Counter(r.status_code for r in responses) == {201: 6, 409: 2}
+    for payload, response in zip(payloads[:5], responses[:5]):
+        assert response.json()["email"] == payload["email"]
+    created = [r.json()["id"] for r in responses if r.status_code == 201]
+    assert len(set(created)) == 6
+
+
+def test_full_batch_hands_off_to_a_new_batch(driver_client, group_commit, test_data):
+    inserts = group_commit(max_batch=4)
+    payloads = [test_data.user_payload() for _ in range(8)]
+
+    responses = _create_concurrently(driver_client, payloads)
+
+    assert sorted(len(batch) for batch in inserts.batches) == [4, 4]
+    assert [r.status_code for r in responses] == [201] * 8
+    assert [r.json()["email"] for r in responses] == [p["email"] for p in payloads]
+
+
+def test_batch_error_reaches_every_waiter(driver_client, group_commit, test_data):
+    inserts = group_commit(max_batch=4)
+    inserts.error = ConnectionRefusedError("database is down")  # errors.py → 503
+
+    responses = _create_concurrently(driver_client, [test_data.user_payload() for _ in range(4)])
+
+    assert [len(batch) for batch in inserts.batches] == [4]
+    assert [r.status_code for r in responses] == [503] * 4
+    assert all("Retry-After" in r.headers for r in responses)
@@ -0,0 +1,66 @@
+"""
+Idempotency-Key на POST /users (оба роутера): повтор с тем же ключом возвращает исходный 201,
+тот же ключ с другим телом — 422, клиент сам ставит ключ и повторяет запрос с ним.
+"""
+
+import requests
+
+from clients.api_client import IDEMPOTENCY_KEY_HEADER
+from clients.users_client import UsersClient, new_idempotency_key
+
+
+class _LostFirstResponse(requests.adapters.BaseAdapter):
+    """Первый ответ теряется (502 балансировщика) уже после того, как приложение создало пользователя."""
+
+    def __init__(self, adapter: requests.adapters.BaseAdapter):
+        super().__init__()
+        self.adapter = adapter
+        self.keys: list[str | None] = []
+
+    def send(self, request, **kwargs):
+        self.keys.append(request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        response = self.adapter.send(request, **kwargs)
+        if len(self.keys) == 1:
+            response.status_code = 502
+        return response
+
+    def close(self) -> None:
+        pass  # Общий адаптер закрывает driver_client
+
+
+def test_repeated_key_replays_original_201(driver_client, test_data):
+    payload = test_data.user_payload()
+    key = new_idempotency_key()
+
+    first = driver_client.create_user(payload, idempotency_key=key)
+    replay = driver_client.create_user(payload, idempotency_key=key)
+
+    assert first.status_code == replay.status_code == 201
+    assert replay.json() == first.json()
+    assert replay.headers["ETag"] == first.headers["ETag"]
+    assert replay.headers.get("Idempotent-Replayed") == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    # Второго пользователя нет: без ключа тот же email — 409
+    assert driver_client.create_user(payload).status_code == 409
+
+
+def test_key_reused_with_different_body_is_422(driver_client, test_data):
+    key = new_idempotency_key()
+    assert driver_client.create_user(test_data.user_payload(), idempotency_key=key).status_code == 201
+
+    response = driver_client.create_user(test_data.user_payload(), idempotency_key=key)
+    assert response.status_code == 422
+
+
+def test_client_retries_with_the_same_generated_key(driver_client, test_data):
+    lossy = _LostFirstResponse(driver_client.session.get_adapter(driver_client.base_url))
+    client = UsersClient(driver_client.base_url, transport=lossy)
+    payload = test_data.user_payload()
+
+    response = client.create_user(payload, retries=2)
+
+    assert response.status_code == 201
+    assert response.headers.get("Idempotent-Replayed") == "true"
+    assert len(lossy.keys) == 2
+    assert lossy.keys[0] is not None and lossy.keys[0] == lossy.keys[1]
+    assert driver_client.get_user(response.json()["id"]).json()["email"] == payload["email"]
@@ -0,0 +1,76 @@
+"""
+Оптимистичная блокировка PUT/PATCH/DELETE /users/{id} (оба роутера): ETag — версия строки,
+каждое изменение увеличивает её, If-Match со старым ETag — 412 без изменений в БД.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def user(driver_client, test_data) -> dict:
+    response = driver_client.create_user(test_data.user_payload())
+    assert response.status_code == 201
+    return {**response.json(), "etag": response.headers["ETag"]}
+
+
+def test_created_user_has_version_1(driver_client, user):
+    assert user["version"] == 1
+    assert user["etag"] == '"1"'
+    assert driver_client.get_user(user["id"]).headers["ETag"] == '"1"'
+
+
+def test_patch_with_current_etag_bumps_version(driver_client, user):
+    response = driver_client.partial_update_user(user["id"], {"name": "First"}, if_match=user["etag"])
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+
+    response = driver_client.partial_update_user(user["id"], {"name": "Second"}, if_match='"2"')
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+    assert driver_client.get_user(user["id"]).headers["ETag"] == '"3"'
+
+
+def test_patch_with_stale_etag_is_412(driver_client, user):
+    assert driver_client.partial_update_user(user["id"], {"name": "First"}).status_code == 200
+
+    response = driver_client.partial_update_user(user["id"], {"name": "Lost"}, if_match=user["etag"])
+    assert response.status_code == 412
+    current = driver_client.get_user(user["id"]).json()
+    assert (current["name"], current["version"]) == ("First", 2)
+
+
+def test_put_with_stale_and_current_etag(driver_client, user):
+    payload = {"email": user["email"], "name": "Put", "phone": None, "address": None,
+               "birth_date": None}
+    assert driver_client.partial_update_user(user["id"], {"name": "Other"}).status_code == 200
+
+    assert driver_client.update_user(user["id"], payload, if_match=user["etag"]).status_code == 412
+    response = driver_client.update_user(user["id"], payload, if_match='"2"')
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["version"]) == ("Put", 3)
+    assert response.headers["ETag"] == '"3"'
+
+
+def test_delete_with_stale_and_current_etag(driver_client, user):
+    assert driver_client.partial_update_user(user["id"], {"name": "Other"}).status_code == 200
+
+    assert driver_client.delete_user(user["id"], if_match=user["etag"]).status_code == 412
+    assert driver_client.get_user(user["id"]).status_code == 200
+    assert driver_client.delete_user(user["id"], if_match='"2"').status_code == 204
+    assert driver_client.get_user(user["id"]).status_code == 404
+
+
+def test_if_match_on_missing_user_is_412(driver_client, user):
+    assert driver_client.delete_user(user["id"]).status_code == 204
+    assert driver_client.partial_update_user(user["id"], {"name": "X"}, if_match='"1"').status_code == 412
+
+
+def test_compressed_response_etag_matches_its_version(driver_client, user):
+    # Сжатый ответ несёт ETag "<version>-gzip" (compression.py): клиент возвращает его как есть
+    response = driver_client.partial_update_user(user["id"], {"name": "First"}, if_match='"1-gzip"')
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+    assert driver_client.delete_user(user["id"], if_match='"1-gzip"').status_code == 412
+    assert driver_client.delete_user(user["id"], if_match='"2-br"').status_code == 204
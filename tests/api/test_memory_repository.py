@@ -0,0 +1,29 @@
+"""
+Хранилище пользователей в памяти (USER_REPOSITORY=memory): ключи Idempotency-Key
+удаляются по истечении, а не копятся до конца жизни процесса.
+"""
+
+from app.repository import MemoryUserRepository
+from app.schemas import UserCreate
+
+FINGERPRINT = b"fingerprint"
+
+
+def _create(repository: MemoryUserRepository, n: int, ttl: float):
+    return repository.create_idempotent(
+        UserCreate(email=f"idem{n}@example.com"), f"key-{n}", FINGERPRINT, ttl)
+
+
+def test_live_key_replays_the_original_record():
+    repository = MemoryUserRepository()
+    record, replayed = _create(repository, 1, ttl=60)
+    assert not replayed
+    assert _create(repository, 1, ttl=60) == (record, True)
+
+
+def test_expired_keys_are_purged_on_new_claims():
+    repository = MemoryUserRepository()
+    for n in range(50):
+        _create(repository, n, ttl=0)
+    # Каждый новый ключ удаляет истёкшие: остаётся только последний
+    assert list(repository._idempotency) == ["key-49"]
@@ -0,0 +1,52 @@
+"""
+Пространства имён тестовых email (data/namespaces.py): уникальность email воркера
+и cleanup одним DELETE по префиксу — только своих пользователей.
+"""
+
+import pytest
+
+from data.namespaces import UserDataManager, make_namespace
+from db.statements import INSERT_USER, execute
+
+
+def _insert(queries, email: str) -> None:
+    with queries.connection.cursor() as cursor:
+        execute(cursor, INSERT_USER, (email, None, None, None, None))
+
+
+def test_make_namespace_from_run_and_worker():
+    assert make_namespace("0123456789abcdef", "gw3") == "t0123456789_gw3_"
+
+
+def test_make_namespace_without_xdist(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    namespace = make_namespace()
+    assert namespace.startswith("t") and namespace.endswith("_main_")
+    assert make_namespace() != namespace
+
+
+def test_emails_are_unique_and_owned():
+    manager = UserDataManager(namespace="tns_gw0_")
+    emails = [manager.email() for _ in range(3)] + [p["email"] for p in manager.user_payloads(2)]
+    assert len(set(emails)) == len(emails)
+    assert all(manager.owns(email) for email in emails)
+    assert not manager.owns("tns_gw1_1_user@example.com")
+
+
+def test_cleanup_deletes_only_own_namespace(isolated_users_queries):
+    # '_' в префиксе — спецсимвол LIKE: без экранирования cleanup удалил бы и чужой email
+    manager = UserDataManager(namespace="tns_gw0_")
+    own = manager.email()
+    foreign = "tnsXgw0Y1_user@example.com"
+    _insert(isolated_users_queries, own)
+    _insert(isolated_users_queries, foreign)
+
+    assert manager.cleanup(isolated_users_queries) == 1
+    assert isolated_users_queries.get_user_by_email(own) is None
+    assert isolated_users_queries.get_user_by_email(foreign) is not None
+
+
+def test_cleanup_rejects_empty_prefix(isolated_users_queries):
+    with pytest.raises(ValueError):
+        isolated_users_queries.delete_users_by_email_prefix("")
@@ -0,0 +1,47 @@
+"""
+Журнал медленных запросов (src/app/slow_queries.py): план снимается в фоне на соединении
+пула, а в журнал и план не попадают значения параметров.
+"""
+
+import pytest
+
+from app.deps import close_pool
+from app.slow_queries import SlowQueryLog, _redact_plan
+from db.statements import GET_USER_BY_EMAIL
+
+SECRET_EMAIL = "secret.person@example.com"
+
+
+@pytest.fixture
+def slow_query_log(db_connection):
+    """Журнал, куда попадает каждый запрос, и план — для каждого."""
+    yield SlowQueryLog(threshold=0.0, explain_sample_rate=1.0, size=10)
+    close_pool()
+
+
+def test_sampled_entry_has_no_parameter_values(slow_query_log, db_connection):
+    with db_connection.cursor() as cursor:
+        slow_query_log.observe_psycopg2(
+            cursor, GET_USER_BY_EMAIL.execute_sql, (SECRET_EMAIL,), elapsed=1.0)
+    slow_query_log.wait_explains(timeout=10)
+
+    [entry] = slow_query_log.entries()
+    assert entry["statement"] == GET_USER_BY_EMAIL.name
+    assert entry["params"] == ["str"]
+    assert entry["plan"] and "lower((email)::text)" in entry["plan"]
+    assert "secret" not in str(entry)
+
+
+def test_redact_plan_replaces_literals_in_conditions():
+    plan = [
+        "Seq Scan on users  (cost=0.00..1.56 rows=1 width=617)",
+        "  Filter: ((id > 5) AND (id = ANY ('{1,2}'::integer[])) "
+        "AND (lower((email)::text) = 'o''neil@example.com'::text) AND (id <> $1))",
+        "  Rows Removed by Filter: 25",
+    ]
+    assert _redact_plan(plan).splitlines() == [
+        "Seq Scan on users  (cost=0.00..1.56 rows=1 width=617)",
+        "  Filter: ((id > ?) AND (id = ANY ('?'::integer[])) "
+        "AND (lower((email)::text) = '?'::text) AND (id <> $1))",
+        "  Rows Removed by Filter: 25",
+    ]
@@ -0,0 +1,32 @@
+"""
+Поиск по email без учёта регистра (GET /users/by-email): запросы идут по индексу
+users_email_lower_idx (lower(email)), а не полным проходом по users.
+"""
+
+import pytest
+
+from db.queries import plan_indexes
+from db.statements import GET_USER_BY_EMAIL, GET_USERS_BY_EMAILS
+
+EMAIL_LOWER_INDEX = "users_email_lower_idx"
+
+
+@pytest.fixture
+def queries(isolated_users_queries):
+    """
+    UsersQueries без Seq Scan: на маленькой тестовой таблице планировщик выбрал бы полный проход
+    и при рабочем индексе. SET LOCAL откатывается вместе с SAVEPOINT фикстуры.
+    """
+    with isolated_users_queries.connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return isolated_users_queries
+
+
+def test_get_user_by_email_uses_lower_index(queries):
+    plan = queries.explain(GET_USER_BY_EMAIL, ("X@Example.com",))
+    assert EMAIL_LOWER_INDEX in plan_indexes(plan)
+
+
+def test_get_users_by_emails_uses_lower_index(queries):
+    plan = queries.explain(GET_USERS_BY_EMAILS, (["X@Example.com", "y@example.COM"],))
+    assert EMAIL_LOWER_INDEX in plan_indexes(plan)
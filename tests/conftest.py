@@ -1,23 +1,45 @@
 """
 Общие фикстуры pytest.
 Тесты дергают API по HTTP (Docker: postgres + app). API_BASE_URL и БД — из .env в корне.
+--api-transport=asgi (или API_TRANSPORT=asgi) — запросы в приложение в процессе pytest,
+без поднятого сервера (нужна только БД, а с USER_REPOSITORY=memory — и она не нужна).
+
+Тяжёлые модули (requests, psycopg2, Faker, pydantic-settings) импортируются внутри фикстур:
+conftest грузится в каждом процессе pytest-xdist, включая управляющий, который тесты
+не выполняет, — импорт по месту использования сокращает старт каждого воркера.
+Время импорта: python -m benchmarks.bench_import_time.
 """
 
+from __future__ import annotations
 
 from collections.abc import Generator
+from typing import TYPE_CHECKING
 
 import pytest
-import psycopg2
 
-from clients.users_client import UsersClient
-from config.settings import Settings, get_settings
-from db.queries import UsersQueries
-from models.user import UserResponse
-from data.user_factory import get_single_user
+if TYPE_CHECKING:
+    import psycopg2.extensions
+
+    from clients.users_client import UsersClient
+    from config.settings import Settings
+    from data.namespaces import UserDataManager
+    from db.queries import UsersQueries
+    from models.user import UserResponse
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--api-transport",
+        choices=["http", "asgi"],
+        default=None,
+        help="http — API по сети (API_BASE_URL), asgi — приложение в процессе pytest без сервера",
+    )
 
 
 @pytest.fixture(scope="session")
 def settings() -> Settings:
+    from config.settings import get_settings
+
     return get_settings()
 
 
@@ -31,15 +53,79 @@ def base_url(settings: Settings) -> str:
 
 
 @pytest.fixture(scope="session")
-def api_client(base_url: str) -> UsersClient:
-    """HTTP-клиент к API. Сервер должен быть поднят (docker compose up)."""
-    return UsersClient(base_url)
+def api_transport(request: pytest.FixtureRequest, settings: Settings) -> str:
+    return request.config.getoption("--api-transport") or settings.api_transport
 
 
 @pytest.fixture(scope="session")
-def db_connection() -> Generator[psycopg2.extensions.connection, None, None]:
+def api_client(base_url: str, api_transport: str) -> Generator[UsersClient, None, None]:
+    """
+    HTTP-клиент к API. Для http сервер должен быть поднят (docker compose up);
+    для asgi приложение запускается в процессе pytest (lifespan — один раз за сессию).
+    """
+    from clients.users_client import UsersClient
+
+    transport = None
+    if api_transport == "asgi":
+        from clients.asgi_transport import ASGIAdapter
+
+        transport = ASGIAdapter()
+    client = UsersClient(base_url, transport=transport)
+    yield client
+    client.session.close()
+
+
+def _users_app(driver: str):
+    """Приложение только с роутером /users для DB_DRIVER=driver и обработчиками ошибок БД."""
+    from contextlib import asynccontextmanager
+
+    from fastapi import FastAPI
+
+    from app.async_deps import close_async_pool, open_async_pool
+    from app.deps import close_pool
+    from app.errors import register_error_handlers
+    from app.routers import users, users_async
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        if driver == "asyncpg":
+            await open_async_pool()
+            yield
+            await close_async_pool()
+        else:
+            yield
+            close_pool()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(users_async.router if driver == "asyncpg" else users.router)
+    register_error_handlers(app)
+    return app
+
+
+@pytest.fixture(scope="session", params=["psycopg2", "asyncpg"])
+def driver_client(
+        request: pytest.FixtureRequest, settings: Settings,
+) -> Generator[UsersClient, None, None]:
+    """
+    UsersClient к роутеру /users каждого DB_DRIVER (sync на psycopg2 и asyncpg) в процессе
+    pytest, через транспорт ASGI: тест с этой фикстурой проверяет оба роутера за один прогон.
+    """
+    if request.param == "asyncpg" and settings.user_repository == "memory":
+        pytest.skip("asyncpg router requires USER_REPOSITORY=postgres")
+    from clients.asgi_transport import ASGIAdapter
+    from clients.users_client import UsersClient
+
+    client = UsersClient("http://testserver", transport=ASGIAdapter(_users_app(request.param)))
+    yield client
+    client.session.close()
+
+
+@pytest.fixture(scope="session")
+def db_connection(settings: Settings) -> Generator[psycopg2.extensions.connection, None, None]:
     """Подключение к PostgreSQL (для cleanup и тестов, смотрящих в БД)."""
-    s = get_settings()
+    import psycopg2
+
+    s = settings
     try:
         with psycopg2.connect(
                 host=s.db_host,
@@ -55,19 +141,53 @@ def db_connection() -> Generator[psycopg2.extensions.connection, None, None]:
 
 @pytest.fixture(scope="function")
 def users_queries(db_connection: psycopg2.extensions.connection) -> UsersQueries:
+    from db.queries import UsersQueries
+
     return UsersQueries(db_connection)
 
 
+@pytest.fixture(scope="function")
+def isolated_users_queries(
+        db_connection: psycopg2.extensions.connection,
+) -> Generator[UsersQueries, None, None]:
+    """UsersQueries внутри SAVEPOINT: всё, что тест сделал напрямую в БД, откатывается после него."""
+    from db.queries import UsersQueries
+
+    with UsersQueries(db_connection).savepoint() as queries:
+        yield queries
+
+
+@pytest.fixture(scope="session")
+def test_data(
+        request: pytest.FixtureRequest, settings: Settings,
+) -> Generator[UserDataManager, None, None]:
+    """
+    Тестовые данные воркера: email в своём пространстве имён (t<run>_<gwN>_...),
+    поэтому воркеры pytest-xdist не конфликтуют. В конце сессии все пользователи
+    воркера удаляются одним DELETE по префиксу. С USER_REPOSITORY=memory пользователи
+    живут в памяти приложения и исчезают вместе с ним: подключение к БД не нужно.
+    """
+    from data.namespaces import UserDataManager
+
+    memory = settings.user_repository == "memory"
+    db_connection = None if memory else request.getfixturevalue("db_connection")
+    manager = UserDataManager()
+    yield manager
+    if db_connection is not None:
+        from db.queries import UsersQueries
+
+        manager.cleanup(UsersQueries(db_connection))
+
+
 @pytest.fixture(scope="function")
 def created_user(
         api_client: UsersClient,
-        users_queries: UsersQueries,
-) -> Generator[UserResponse, None, None]:
-    """Создаёт пользователя через API, после теста удаляет через БД."""
-    # Генерируем данные пользователя с помощью фабрики
-    payload = get_single_user()
-    # Убедимся, что email уникален, добавив временную метку
-    payload["email"] = f"test_{abs(hash(str(id(payload)))) % 10000}@example.com"
+        test_data: UserDataManager,
+) -> UserResponse:
+    """Создаёт пользователя через API (удаляется вместе с остальными данными воркера в конце сессии)."""
+    from models.user import UserResponse
+
+    payload = test_data.user_payload()
     response = api_client.create_user(payload)
     response.raise_for_status()
     data = response.json()
@@ -76,5 +196,4 @@ def created_user(
     user = UserResponse(**data)
     if not user.id:
         pytest.fail("User id is missing in create_user response")
-    yield user
-    users_queries.delete_user_by_id(user.id)
+    return user